@@ -1,12 +1,25 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import datetime
-import matplotlib.pyplot as plt
+import functools
 import os
 
+from hug.charts import draw_bars, render
+from hug.estimate import collapse_probability
+from hug.i18n import LANGUAGES
+from hug.journal import StoreJournal
+from hug.seeding import session_rng
+from hug.simulation import COLLAPSE_THRESHOLD, entry_params, simulate
+from hug.storage import SqliteMoodStore, import_csv
+from hug.trace import span, start as start_trace
+from hug.ui import mood_table, paged_notes, reset_pages, support_modes
+from hug.writer import WriteBehind
+
 #st.set_page_config(page_title="Moodrift + HUG", layout="wide")
 
+# Timing spans (?debug=1 for the sidebar panel, HUG_TRACE=file.jsonl for a trace)
+start_trace()
+
 ## File persistence
 #DATA_FILE = "mood_log.csv"
 
@@ -31,110 +44,49 @@ DATA_FILE = f"mood_log_{user_id}.csv"
 # File based on user ID
 DATA_FILE = f"mood_log_{user_id}.csv"
 
+# Shared mood database for all users
+@st.cache_resource
+def get_store():
+    return SqliteMoodStore(os.environ.get("HUG_DB", "hug.db"))
+
+# Writes go through one per-process background writer so Submit doesn't wait on the disk
+@st.cache_resource
+def get_writer():
+    return WriteBehind(get_store())
+
+store = get_store()
+writer = get_writer()
+
 # Initialize session state
-if "log" not in st.session_state:
+if "log_imported" not in st.session_state:
+    # Move a legacy per-user CSV into the database the first time we see it
     if os.path.exists(DATA_FILE):
         try:
-            df_log = pd.read_csv(DATA_FILE)
-            if not df_log.empty and "Date" in df_log.columns:
-                df_log["Date"] = pd.to_datetime(df_log["Date"]).dt.date
-                st.session_state.log = df_log.to_dict("records")
-            else:
-                st.session_state.log = []
+            import_csv(store, DATA_FILE, user_id)
         except Exception as e:
             st.warning(f"Failed to load your data: {e}")
-            st.session_state.log = []
-    else:
-        st.session_state.log = []
-
-if "letters" not in st.session_state:
-    st.session_state.letters = []
-if "anchors" not in st.session_state:
-    st.session_state.anchors = []
-if "crisis_mode" not in st.session_state:
-    st.session_state.crisis_mode = False
-if "bully_mode" not in st.session_state:
-    st.session_state.bully_mode = False
-    st.session_state.anchors = []
+    st.session_state.log_imported = True
 
-# Language toggle
-lang = st.sidebar.radio("🌐 Language / Bahasa", ["English", "Bahasa Indonesia"])
+# Read back this user's own queued writes (usually already stored by the next rerun)
+try:
+    writer.wait(user_id)
+except Exception as e:
+    st.session_state.pop("deleted_last", None)
+    st.warning(f"Failed to save your last entry: {e}")
+if st.query_params.get("debug") == "1":
+    st.sidebar.caption(f"Write queue depth: {writer.depth}")
 
-# Crisis Mode & Bullying SOS
-st.sidebar.markdown("## 🆘 Support Modes")
-if st.sidebar.button("🆘 Crisis Mode" if lang == "English" else "🆘 Mode Krisis"):
-    st.session_state.crisis_mode = True
-    st.session_state.bully_mode = False
-if st.sidebar.button("🚩 I'm being bullied" if lang == "English" else "🚩 Saya sedang dibully"):
-    st.session_state.crisis_mode = False
-    st.session_state.bully_mode = True
-if st.sidebar.button("↩️ Exit Support Mode" if lang == "English" else "↩️ Keluar dari Mode Dukungan"):
-    st.session_state.crisis_mode = False
-    st.session_state.bully_mode = False
-
-# Crisis Mode
-if st.session_state.crisis_mode:
-    st.title("🆘 Crisis Mode Activated" if lang == "English" else "🆘 Mode Krisis Aktif")
-    st.markdown("You're not alone. Let's take this one small step at a time." if lang == "English" else "Kamu tidak sendiri. Mari kita ambil langkah kecil bersama-sama.")
-
-    with st.expander("📦 Emergency Grounding Toolkit" if lang == "English" else "📦 Alat Darurat untuk Menenangkan Diri"):
-        st.markdown("""
-- Take a breath: Inhale for 4 seconds, hold for 4, exhale for 6.
-- Name 3 things you see, 2 you hear, 1 you feel.
-- Grab a glass of water or walk to a window.
-        """ if lang == "English" else """
-- Tarik napas: Tarik napas 4 detik, tahan 4 detik, hembuskan 6 detik.
-- Sebutkan 3 hal yang kamu lihat, 2 yang kamu dengar, 1 yang kamu rasakan.
-- Minum air putih atau lihat keluar jendela.
-        """)
-
-    with st.expander("💬 Talk to HUG" if lang == "English" else "💬 Bicara dengan HUG"):
-        with st.form(key="crisis_chat"):
-            user_input = st.text_area("What’s happening for you right now?" if lang == "English" else "Apa yang sedang kamu rasakan saat ini?")
-            submitted = st.form_submit_button("Send" if lang == "English" else "Kirim")
-
-        if submitted and user_input:
-            st.markdown(f"🫂 You said: *{user_input}*" if lang == "English" else f"🫂 Kamu bilang: *{user_input}*")
-
-            if any(word in user_input.lower() for word in ["hopeless", "give up", "suicidal", "kill", "end it"]):
-                st.warning("💔 That sounds really heavy. Please consider calling a crisis line or reaching out to someone you trust. You don’t have to go through this alone." if lang == "English" else "💔 Itu terdengar sangat berat. Pertimbangkan untuk menghubungi layanan krisis atau seseorang yang kamu percaya. Kamu tidak harus menghadapinya sendiri.")
-            elif any(word in user_input.lower() for word in ["anxious", "nervous", "panic"]):
-                st.info("🫁 Try a grounding technique: 5 deep breaths, or list 3 things you can see, hear, and touch." if lang == "English" else "🫁 Coba teknik menenangkan: 5 kali napas dalam, atau sebutkan 3 hal yang kamu lihat, dengar, dan rasakan.")
-            elif any(word in user_input.lower() for word in ["sad", "cry", "alone", "hurt"]):
-                st.info("💙 It’s okay to feel what you’re feeling. You’re not alone, and this feeling won’t last forever." if lang == "English" else "💙 Tidak apa-apa merasakan apa yang kamu rasakan. Kamu tidak sendiri, dan perasaan ini tidak akan berlangsung selamanya.")
-            else:
-                st.success("✅ Thank you for sharing. Sometimes just expressing it helps a little." if lang == "English" else "✅ Terima kasih sudah berbagi. Terkadang hanya mengungkapkan saja sudah cukup membantu.")
-
-    with st.expander("📞 Helpful Resources" if lang == "English" else "📞 Sumber Bantuan"):
-        st.markdown("""
-- **Befrienders Worldwide**: [https://www.befrienders.org](https://www.befrienders.org)  
-- **Indonesia (Samaritans)**: Call 021-500-454  
-- **UK (Samaritans)**: Call 116 123  
-- **Text a friend** you trust and just say: "Hey, can we talk?"
-        """ if lang == "English" else """
-- **Befrienders Indonesia**: [https://www.befrienders.or.id](https://www.befrienders.or.id)  
-- **Indonesia (Samaritans)**: Hubungi 021-500-454  
-- **UK (Samaritans)**: Hubungi 116 123  
-- **Kirim pesan ke teman** yang kamu percaya dan katakan: "Hai, boleh kita ngobrol?"
-        """)
+# Letters and anchors are stored per user next to the mood log
+journal = StoreJournal(store, user_id)
 
-    st.stop()
-
-# Bullying Support Mode
-if st.session_state.bully_mode:
-    st.title("💬 Bullying Support Bot" if lang == "English" else "💬 Bot Dukungan untuk Perundungan")
-    st.markdown("That’s hard. Let’s talk it through – anonymously and safely." if lang == "English" else "Itu berat. Mari kita bicarakan secara anonim dan aman.")
+# Language toggle
+lang = st.sidebar.radio("🌐 Language / Bahasa", LANGUAGES)
 
-    with st.form(key="bully_chat"):
-        bullying_input = st.text_area("What’s been going on?" if lang == "English" else "Apa yang sedang terjadi padamu?")
-        bully_submit = st.form_submit_button("Send" if lang == "English" else "Kirim")
+# Crisis Mode & Bullying SOS
+support_modes(lang)
 
-    if bully_submit and bullying_input:
-        st.markdown(f"🫂 You said: *{bullying_input}*" if lang == "English" else f"🫂 Kamu bilang: *{bullying_input}*")
-        st.markdown("🫂 Thank you for sharing. No one deserves that. You're not overreacting." if lang == "English" else "🫂 Terima kasih sudah berbagi. Tidak ada yang pantas diperlakukan seperti itu. Kamu tidak berlebihan.")
-        st.markdown("You might try keeping a small log of what happens and when, and talk to someone you trust. I'm here for more support anytime." if lang == "English" else "Kamu bisa mencoba mencatat kejadian dan waktunya, lalu bicara dengan orang yang kamu percaya. Aku di sini kalau kamu butuh dukungan.")
-
-    st.stop()
+# Mood Report chart ranges, in days (None = full history)
+REPORT_WINDOWS = {"Last 30 days": 30, "Last 90 days": 90, "Last year": 365, "All time": None}
 
 # Sidebar navigation
 page = st.sidebar.radio("Moodrift Navigation", ["Log Mood", "Mood Report", "Letter to Self", "Reality Anchors", "Mood Simulation"])
@@ -143,120 +95,130 @@ page = st.sidebar.radio("Moodrift Navigation", ["Log Mood", "Mood Report", "Lett
 
 
 
-# ---------- 1. LOG MOOD ----------
-if page == "Log Mood":
-    st.title("1. Log Mood")
-    with st.form("log_form"):
-        time_of_day = st.selectbox("Time", ["Morning", "Afternoon", "Night"])
-        mood = st.slider("Mood (0=very low, 10=very high)", 0, 10, 5)
-        energy = st.slider("Energy (0=exhausted, 10=energized)", 0, 10, 5)
-        sleep = st.slider("Sleep Quality (0=terrible, 10=great)", 0, 10, 5)
-        irritability = st.slider("Irritability (0=calm, 10=very irritable)", 0, 10, 0)
-        confidence = st.slider("Confidence (0=none, 10=super high)", 0, 10, 5)
-        impulsivity = st.slider("Impulsivity (0=very cautious, 10=very impulsive)", 0, 10, 5)
-        notes = st.text_area("What happened today? How did it feel?")
-        submit = st.form_submit_button("Submit")
-
-    if submit:
-        entry = {
-            "Date": datetime.date.today(),
-            "Time": time_of_day,
-            "Mood": mood,
-            "Energy": energy,
-            "Sleep": sleep,
-            "Irritability": irritability,
-            "Confidence": confidence,
-            "Impulsivity": impulsivity,
-            "Notes": notes
-        }
-        st.session_state.log.append(entry)
-        pd.DataFrame(st.session_state.log).to_csv(DATA_FILE, index=False)
-        st.success("Mood logged.")
-
-# ---------- 2. MOOD REPORT ----------
-elif page == "Mood Report":
-    st.title("2. Mood Report")
-    if not st.session_state.log:
-        st.info("No mood data yet.")
-    else:
-        df = pd.DataFrame(st.session_state.log)
-
-        st.dataframe(df.tail(10))
-
-        if st.button("Delete Last Entry") and len(df) > 0:
-            st.session_state.log.pop()
-            pd.DataFrame(st.session_state.log).to_csv(DATA_FILE, index=False)
+with span(f"page:{page}"):
+    # ---------- 1. LOG MOOD ----------
+    if page == "Log Mood":
+        st.title("1. Log Mood")
+        with st.form("log_form"):
+            time_of_day = st.selectbox("Time", ["Morning", "Afternoon", "Night"])
+            mood = st.slider("Mood (0=very low, 10=very high)", 0, 10, 5)
+            energy = st.slider("Energy (0=exhausted, 10=energized)", 0, 10, 5)
+            sleep = st.slider("Sleep Quality (0=terrible, 10=great)", 0, 10, 5)
+            irritability = st.slider("Irritability (0=calm, 10=very irritable)", 0, 10, 0)
+            confidence = st.slider("Confidence (0=none, 10=super high)", 0, 10, 5)
+            impulsivity = st.slider("Impulsivity (0=very cautious, 10=very impulsive)", 0, 10, 5)
+            notes = st.text_area("What happened today? How did it feel?")
+            submit = st.form_submit_button("Submit")
+
+        if submit:
+            entry = {
+                "Date": datetime.date.today(),
+                "Time": time_of_day,
+                "Mood": mood,
+                "Energy": energy,
+                "Sleep": sleep,
+                "Irritability": irritability,
+                "Confidence": confidence,
+                "Impulsivity": impulsivity,
+                "Notes": notes
+            }
+            writer.append(user_id, entry)
+            st.success("Mood logged.")
+
+    # ---------- 2. MOOD REPORT ----------
+    elif page == "Mood Report":
+        st.title("2. Mood Report")
+        # Set by Delete Last Entry; by now the wait above has stored the delete
+        if st.session_state.pop("deleted_last", False):
             st.success("Last entry deleted.")
-            st.rerun()
-
-        if "Date" in df.columns:
-            df["Date"] = pd.to_datetime(df["Date"])
-            st.line_chart(df.set_index("Date")[["Mood", "Energy", "Sleep"]].rolling(3).mean())
-
-        if set(["Confidence", "Impulsivity", "Irritability"]).issubset(df.columns):
-            fig, ax = plt.subplots()
-            df[["Confidence", "Impulsivity", "Irritability"]].tail(7).plot(kind="bar", ax=ax)
-            st.pyplot(fig)
-
-
-# ---------- 3. LETTER TO SELF ----------
-elif page == "Letter to Self":
-    st.title("3. Letter to Self")
-    with st.form("letter_form"):
-        letter = st.text_area("Write a message to your future self.")
-        if st.form_submit_button("Save Letter"):
-            st.session_state.letters.append((datetime.datetime.now(), letter))
-            st.success("Letter saved.")
-    for t, txt in st.session_state.letters[::-1]:
-        with st.expander(f"Letter from {t.strftime('%Y-%m-%d %H:%M')}"):
-            st.write(txt)
-
-# ---------- 4. REALITY ANCHORS ----------
-elif page == "Reality Anchors":
-    st.title("4. Reality Anchors")
-    with st.form("anchor_form"):
-        anchor = st.text_area("Write 2–3 self-check truths.")
-        if st.form_submit_button("Save Anchors"):
-            st.session_state.anchors.append((datetime.datetime.now(), anchor))
-            st.success("Anchor saved.")
-    for t, a in st.session_state.anchors[::-1]:
-        st.markdown(f"**{t.date()}** – {a}")
-
-# ---------- 5. MOOD SIMULATION ----------
-elif page == "Mood Simulation":
-    st.title("5. Mood Simulation – Jump Diffusion Model")
-    if not st.session_state.log:
-        st.warning("Log at least one mood entry.")
-    else:
-        last = st.session_state.log[-1]
-        use_stoch_vol = st.checkbox("Enable Stochastic Volatility", value=True)
-
-        # Parameters
-        mu = 0.1
-        sigma_base = 1 + (last["Impulsivity"] + last["Irritability"]) / 10
-        lambda_jump = 0.1
-        jump_mean = -5 if last["Mood"] < 4 else 3
-        jump_std = 2
-        T = 50
-        M = last["Mood"] * 10
-        vol = sigma_base
-        mood_path = []
-        vol_path = []
-
-        for _ in range(T):
-            mean_revert = mu * (60 - M)
-            dW = np.random.normal()
-            jumps = np.sum(np.random.normal(jump_mean, jump_std, np.random.poisson(lambda_jump)))
+        if not store.count(user_id):
+            st.info("No mood data yet.")
+        else:
+            import pandas as pd
+
+            # Filtered, sorted and paged in SQL; only the visible rows are read
+            mood_table(functools.partial(store.query, user_id), store.note, lang=lang)
+
+            if st.button("Delete Last Entry"):
+                writer.delete_last(user_id)
+                st.session_state.deleted_last = True
+                st.rerun()
+
+            window = st.selectbox("Show", list(REPORT_WINDOWS), index=1)
+            start = datetime.date.today() - datetime.timedelta(days=REPORT_WINDOWS[window]) if REPORT_WINDOWS[window] else datetime.date.min
+            # Resolution follows the range: entry rolling means, else daily / weekly / monthly means, capped in points
+            trend, level = store.trend(user_id, start)
+            if not trend.empty:
+                st.line_chart(trend)
+                if level != "entry":
+                    st.caption(f"{level.capitalize()} averages, {len(trend)} points")
+
+            # Rows imported from older CSVs may have these blank or NULL: plot only the columns with numbers
+            recent = pd.DataFrame(store.tail(user_id, 7, columns=["Confidence", "Impulsivity", "Irritability"]))
+            recent = recent.apply(pd.to_numeric, errors="coerce").dropna(axis=1, how="all")
+            if not recent.columns.empty:
+                st.image(render(draw_bars, recent))
+
+
+    # ---------- 3. LETTER TO SELF ----------
+    elif page == "Letter to Self":
+        st.title("3. Letter to Self")
+        with st.form("letter_form"):
+            letter = st.text_area("Write a message to your future self.")
+            if st.form_submit_button("Save Letter"):
+                journal.add("letter", letter)
+                reset_pages("letter")
+                st.success("Letter saved.")
+
+        def show_letter(note):
+            # The letter itself is only fetched once its expander is opened
+            with st.expander(f"Letter from {note.created.strftime('%Y-%m-%d %H:%M')}", key=f"letter_{note.id}", on_change="rerun") as box:
+                if box.open:
+                    st.write(journal.body(note.id))
+
+        paged_notes(journal, "letter", show_letter, lang=lang)
+
+    # ---------- 4. REALITY ANCHORS ----------
+    elif page == "Reality Anchors":
+        st.title("4. Reality Anchors")
+        with st.form("anchor_form"):
+            anchor = st.text_area("Write 2–3 self-check truths.")
+            if st.form_submit_button("Save Anchors"):
+                journal.add("anchor", anchor)
+                reset_pages("anchor")
+                st.success("Anchor saved.")
+        paged_notes(journal, "anchor", lambda note: st.markdown(f"**{note.created.date()}** – {note.body}"), bodies=True, lang=lang)
+
+    # ---------- 5. MOOD SIMULATION ----------
+    elif page == "Mood Simulation":
+        st.title("5. Mood Simulation – Jump Diffusion Model")
+        last = store.last(user_id, columns=["Mood", "Irritability", "Impulsivity"])
+        if last is None:
+            st.warning("Log at least one mood entry.")
+        else:
+            use_stoch_vol = st.checkbox("Enable Stochastic Volatility", value=True)
+
+            params = entry_params(last, stoch_vol=use_stoch_vol)
+            # Fitted to the whole Mood history from incrementally kept statistics; the constants until there's enough of it
+            calibration = store.calibration(user_id)
+            calibrated = calibration.simulate_params(scale=10)
+            if calibrated:
+                params.update(calibrated)
+            ens = simulate(**params, rng=session_rng("simulation"))
+            low, median, high = ens.quantiles()
+            risk = collapse_probability(**params, rng=session_rng("risk"))
+            risk_low, risk_high = risk.ci
+
+            st.metric("Collapse risk", f"{risk.value:.0%}", help=f"95% interval {risk_low:.0%}–{risk_high:.0%} for dipping below {COLLAPSE_THRESHOLD}, from {risk.n_paths} simulated paths")
+            st.line_chart({"Sample path": ens.mood[0], "Median": median, "5%": low, "95%": high})
+            if calibrated:
+                st.caption(
+                    f"Calibrated on {calibration.transitions} mood changes: recovery {calibrated['mu']:.2f}/step toward {calibrated['baseline']:.0f}, "
+                    f"volatility {calibrated['sigma']:.1f}, {calibrated['jump_rate']:.2f} jumps/step of {calibrated['jump_mean']:+.0f} ± {calibrated['jump_std']:.0f}"
+                )
+            if use_stoch_vol:
+                st.line_chart(np.median(ens.vol, axis=0))
+
+            st.latex(r'dM_t = \mu(M^* - M_t)dt + \sigma_t dW_t + J_t dN_t')
             if use_stoch_vol:
-                vol = max(vol + 0.3 * (sigma_base - vol) + 0.2 * np.random.normal(), 0.1)
-            M = np.clip(M + mean_revert + vol * dW + jumps, 0, 100)
-            mood_path.append(M)
-            vol_path.append(vol)
-
-        st.line_chart(mood_path)
-        if use_stoch_vol:
-            st.line_chart(vol_path)
-
-        st.latex(r'dM_t = \mu(M^* - M_t)dt + \sigma_t dW_t + J_t dN_t')
-        if use_stoch_vol:
-            st.latex(r'd\sigma_t = \kappa(\theta - \sigma_t)dt + \eta dZ_t')
+                st.latex(r'd\sigma_t = \kappa(\theta - \sigma_t)dt + \eta dZ_t')
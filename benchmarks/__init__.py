@@ -0,0 +1 @@
+"""Reproducible benchmarks for the HUG apps; run with ``python -m benchmarks``."""
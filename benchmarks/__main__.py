@@ -0,0 +1,232 @@
+"""Benchmark runner.
+
+    python -m benchmarks                       # everything, results in bench_results.json
+    python -m benchmarks --quick sim storage   # small sizes, two sections
+    python -m benchmarks --compare baseline.json --threshold 0.25
+
+Three sections:
+
+* ``sim``: each app's original single-path loop (``benchmarks.legacy``)
+  against its ``hug.simulation.simulate`` replacement, across path counts,
+  horizons and with/without stochastic volatility.
+* ``storage``: the old pandas full-rewrite CSV save/load against the
+  append-only CSV store and the SQLite store at 10 to 1M entries.
+* ``pages``: full script reruns per page through Streamlit's AppTest.
+
+Every benchmark records min/median wall time over its repeats. With
+``--compare`` the run fails (exit 1) when any benchmark's min time is more
+than ``--threshold`` slower than in the baseline file.
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks import legacy
+from hug.storage import FIELDS, CsvMoodStore, SqliteMoodStore
+from hug.writer import WriteBehind
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SECTIONS = ["sim", "storage", "pages"]
+PATHS = [1, 100, 2000]
+HORIZONS = [50, 500]
+SIZES = [10, 1_000, 100_000, 1_000_000]
+# Legacy loops are pure Python; skip configurations above this many steps
+LEGACY_STEPS = 1_000_000
+# Ignore ratios on benchmarks faster than this; they are mostly timer noise
+NOISE_FLOOR = 1e-4
+
+
+def measure(fn, repeat=5, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "repeat": repeat}
+
+
+def bench_sim(quick):
+    paths = PATHS[:2] if quick else PATHS
+    horizons = HORIZONS[:1] if quick else HORIZONS
+    budget = LEGACY_STEPS // 50 if quick else LEGACY_STEPS
+    for app, (loop, vectorized, has_sv) in legacy.KERNELS.items():
+        for n in paths:
+            for T in horizons:
+                for sv in (False, True) if has_sv else (False,):
+                    tag = f"paths={n},T={T},sv={int(sv)}"
+                    yield f"sim/{app}/vectorized/{tag}", measure(lambda: vectorized(n, T, sv))
+                    if n * T <= budget:
+                        repeat = 5 if n * T <= 10_000 else 2
+                        yield f"sim/{app}/legacy/{tag}", measure(lambda: legacy.loop_ensemble(loop, n, T, sv), repeat)
+
+
+def _entries(n, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 11, (n, 6))
+    times = ["Morning", "Afternoon", "Night"]
+    start = datetime.date(2020, 1, 1)
+    return [
+        dict(Date=start + datetime.timedelta(days=i // 3), Time=times[i % 3], Mood=int(v[0]), Energy=int(v[1]),
+             Sleep=int(v[2]), Irritability=int(v[3]), Confidence=int(v[4]), Impulsivity=int(v[5]), Notes=f"note {i}")
+        for i, v in enumerate(values)
+    ]
+
+
+def _write_csv(path, entries):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, FIELDS)
+        writer.writeheader()
+        writer.writerows(entries)
+
+
+def bench_storage(quick, workdir):
+    entry = _entries(1, seed=1)[0]
+    for n in SIZES[:2] if quick else SIZES:
+        entries = _entries(n)
+        repeat = 5 if n <= 100_000 else 2
+        path = os.path.join(workdir, f"mood_log_{n}.csv")
+
+        # Before: every submit rewrote the whole file, every session start re-read it
+        yield f"storage/legacy/save/n={n}", measure(lambda: legacy.legacy_csv_save(entries, path), repeat)
+        yield f"storage/legacy/load/n={n}", measure(lambda: legacy.legacy_csv_load(path), repeat)
+
+        _write_csv(path, entries)
+        store = CsvMoodStore(path)
+        yield f"storage/csv/load/n={n}", measure(store.load, repeat)
+        yield f"storage/csv/append/n={n}", measure(lambda: store.append(entry), repeat, setup=lambda: _write_csv(path, entries))
+
+        db = SqliteMoodStore(os.path.join(workdir, f"hug_{n}.db"))
+        db.extend("bench", entries)
+        yield f"storage/sqlite/append/n={n}", measure(lambda: db.append("bench", entry), repeat, setup=lambda: db.delete_last("bench"))
+        # What Submit waits for with the write-behind queue: the enqueue, not the commit
+        writer = WriteBehind(db)
+        yield f"storage/sqlite/write-behind/append/n={n}", measure(lambda: writer.append("bench", entry), repeat, setup=writer.wait)
+        writer.close()
+        yield f"storage/sqlite/tail/n={n}", measure(lambda: db.tail("bench", 10), repeat)
+        yield f"storage/sqlite/columns/n={n}", measure(lambda: db.columns("bench"), repeat)
+        yield f"storage/sqlite/rolling/n={n}", measure(lambda: db.rolling_frame("bench"), repeat)
+        yield f"storage/sqlite/trend/n={n}", measure(lambda: db.trend("bench"), repeat)
+
+
+def _log_entries(at, k=2):
+    at.sidebar.radio[-1].set_value("Log Mood").run()
+    for _ in range(k):
+        next(b for b in at.button if b.label == "Submit").click().run()
+
+
+def _click_last(at):
+    at.button[-1].click().run()
+
+
+PAGES = ["Log Mood", "Mood Report", "Letter to Self", "Reality Anchors", "Mood Simulation"]
+# app file -> (prepare the session, pages to rerun; None = the single-page app after clicking simulate)
+APPS = {
+    "Hug_mood_v3_full.py": (lambda at: (at.text_input[0].set_value("bench").run(), _log_entries(at)), PAGES),
+    "Hug_mood_tracker_v2.py": (_log_entries, PAGES),
+    "mood_tracker.py": (_log_entries, PAGES),
+    "hug_crisis_bot_app.py": (_click_last, None),
+    "hug_personal_bilingual.py": (_click_last, None),
+    "hug_demo_billingual_app.py": (_click_last, None),
+}
+
+
+def bench_pages(quick, workdir):
+    from streamlit.testing.v1 import AppTest
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    os.environ.setdefault("HUG_DB", os.path.join(workdir, "pages.db"))
+    try:
+        for app, (prepare, pages) in APPS.items():
+            at = AppTest.from_file(os.path.join(ROOT, app), default_timeout=120)
+            at.run()
+            prepare(at)
+            for page in pages or [None]:
+                if page:
+                    at.sidebar.radio[-1].set_value(page).run()
+                # Single-page apps: a plain rerun, then a rerun that clicks simulate
+                reruns = {page: at.run} if page else {"main": at.run, "simulate": lambda: _click_last(at)}
+                for label, rerun in reruns.items():
+                    name = f"pages/{app[:-3]}/{label}"
+                    yield name, measure(rerun, 3 if quick else 10)
+                    if at.exception:
+                        raise RuntimeError(f"{name}: {at.exception[0].value}")
+    finally:
+        os.chdir(cwd)
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, new in results.items():
+        old = baseline.get(name)
+        if old is None or old["min"] < NOISE_FLOOR:
+            continue
+        ratio = new["min"] / old["min"]
+        if ratio > 1 + threshold:
+            regressions.append((name, old["min"], new["min"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="HUG benchmark suite.")
+    parser.add_argument("sections", nargs="*", help=f"sections to run, from {', '.join(SECTIONS)} (default: all)")
+    parser.add_argument("--quick", action="store_true", help="small sizes only, for a fast smoke run")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="results JSON to check against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    unknown = set(args.sections) - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown section(s): {', '.join(sorted(unknown))}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        runners = {"sim": lambda: bench_sim(args.quick), "storage": lambda: bench_storage(args.quick, workdir),
+                   "pages": lambda: bench_pages(args.quick, workdir)}
+        for section in args.sections or SECTIONS:
+            for name, stats in runners[section]():
+                results[name] = stats
+                print(f"{name:60s} {stats['min'] * 1e3:10.2f} ms", file=sys.stderr)
+
+    import streamlit
+
+    report = {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "streamlit": streamlit.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, old, new, ratio in regressions:
+            print(f"REGRESSION {name}: {old * 1e3:.2f} ms -> {new * 1e3:.2f} ms ({ratio:.2f}x)", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
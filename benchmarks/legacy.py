@@ -0,0 +1,163 @@
+"""The per-app jump-diffusion loops as they were written before hug.simulation.
+
+Each ``*_loop`` function simulates one path with scalar ``np.random`` draws,
+exactly like the original page code; ``KERNELS`` pairs it with the
+``simulate`` call that replaced it, using the same parameters.
+"""
+
+import numpy as np
+
+from hug.simulation import BASELINE, simulate
+
+
+def v2_loop(T, stoch_vol, mu=0.01, sigma_base=2.0, lambda_jump=0.05, jump_mean=-5, jump_std=3):
+    M, vol, path = 60, sigma_base, []
+    for t in range(T):
+        mean_rev = mu * (60 - M)
+        dW = np.random.normal(0, 1)
+        dN = np.random.poisson(lambda_jump)
+        J = np.random.normal(jump_mean, jump_std) if dN > 0 else 0
+        if stoch_vol:
+            dZ = np.random.normal()
+            vol = max(vol + 1.0 * (sigma_base - vol) + 0.3 * dZ, 0.1)
+        M = np.clip(M + mean_rev + vol * dW + J, 0, 100)
+        path.append(M)
+    return path
+
+
+def v2_vectorized(n_paths, T, stoch_vol, mu=0.01, sigma_base=2.0, lambda_jump=0.05, jump_mean=-5, jump_std=3):
+    return simulate(
+        BASELINE, T, n_paths, mu=mu, baseline=BASELINE, sigma=sigma_base,
+        stoch_vol=stoch_vol, kappa=1.0, eta=0.3,
+        jump_prob=-np.expm1(-lambda_jump), jump_mean=jump_mean, jump_std=jump_std, rng=42,
+    )
+
+
+def v3_loop(T, stoch_vol, mood=4, sigma_base=1.8, lambda_jump=0.1, jump_mean=3, jump_std=2):
+    M, vol, path = mood * 10, sigma_base, []
+    for _ in range(T):
+        mean_revert = 0.1 * (60 - M)
+        dW = np.random.normal()
+        jumps = np.sum(np.random.normal(jump_mean, jump_std, np.random.poisson(lambda_jump)))
+        if stoch_vol:
+            vol = max(vol + 0.3 * (sigma_base - vol) + 0.2 * np.random.normal(), 0.1)
+        M = np.clip(M + mean_revert + vol * dW + jumps, 0, 100)
+        path.append(M)
+    return path
+
+
+def v3_vectorized(n_paths, T, stoch_vol, mood=4, sigma_base=1.8, lambda_jump=0.1, jump_mean=3, jump_std=2):
+    return simulate(
+        mood * 10, T, n_paths, mu=0.1, baseline=BASELINE, sigma=sigma_base,
+        stoch_vol=stoch_vol, kappa=0.3, eta=0.2,
+        jump_rate=lambda_jump, jump_mean=jump_mean, jump_std=jump_std, rng=42,
+    )
+
+
+def crisis_loop(T, stoch_vol, mood0=50, mu=0.05, sigma_base=2.0, mu_J=-5, sigma_J=3, lambda_jump=0.1):
+    mood, vol = [mood0], sigma_base
+    for _ in range(T):
+        current_mood = mood[-1]
+        mean_reversion = mu * (60 - current_mood)
+        if stoch_vol:
+            vol = max(vol + 1.5 * (sigma_base - vol) + 0.3 * np.random.normal(), 0.1)
+            sigma_t = vol
+        else:
+            sigma_t = sigma_base * (1 + (1 - current_mood / 100))
+        dW = np.random.normal()
+        num_jumps = np.random.poisson(lambda_jump)
+        jumps = np.random.normal(loc=mu_J, scale=sigma_J, size=num_jumps).sum() if num_jumps > 0 else 0
+        mood.append(np.clip(current_mood + mean_reversion + sigma_t * dW + jumps, 0, 100))
+    return mood
+
+
+def crisis_vectorized(n_paths, T, stoch_vol, mood0=50, mu=0.05, sigma_base=2.0, mu_J=-5, sigma_J=3, lambda_jump=0.1):
+    return simulate(
+        mood0, T, n_paths, mu=mu, baseline=60, sigma=sigma_base,
+        stoch_vol=stoch_vol, kappa=1.5, eta=0.3, mood_scaled_vol=not stoch_vol,
+        jump_rate=lambda_jump, jump_mean=mu_J, jump_std=sigma_J, rng=42,
+    )
+
+
+def demo_loop(T, stoch_vol, mood0=50, mu=0.5, theta=5, kappa=0.3, eta=1.0, sigma_J=5, p_jump=0.05):
+    # The demo app always runs stochastic volatility
+    mood, vol = [mood0], [theta]
+    for t in range(T):
+        sigma_t = max(0.1, vol[-1] + kappa * (theta - vol[-1]) + eta * np.random.normal())
+        dW = np.random.normal()
+        if np.random.rand() < p_jump:
+            jump = np.random.normal(np.random.choice([-15, 10], p=[0.7, 0.3]), sigma_J)
+        else:
+            jump = 0
+        vol.append(sigma_t)
+        mood.append(max(0, min(100, mood[-1] + mu + sigma_t * dW + jump)))
+    return mood
+
+
+def demo_vectorized(n_paths, T, stoch_vol, mood0=50, mu=0.5, theta=5, kappa=0.3, eta=1.0, sigma_J=5, p_jump=0.05):
+    return simulate(
+        mood0, T, n_paths, mu=mu, sigma=theta,
+        stoch_vol=True, kappa=kappa, theta=theta, eta=eta,
+        jump_prob=p_jump, jump_mean=[-15, 10], jump_probs=[0.7, 0.3], jump_std=sigma_J, rng=42,
+    )
+
+
+def personal_loop(T, stoch_vol, mood0=50, mu=0.0, sigma=2.0, mu_J=-6, sigma_J=5, p_jump=0.06):
+    mood = [mood0]
+    for t in range(T):
+        dW = np.random.normal()
+        jump = np.random.normal(mu_J, sigma_J) if np.random.rand() < p_jump else 0
+        mood.append(max(0, min(100, mood[-1] + mu + sigma * dW + jump)))
+    return mood
+
+
+def personal_vectorized(n_paths, T, stoch_vol, mood0=50, mu=0.0, sigma=2.0, mu_J=-6, sigma_J=5, p_jump=0.06):
+    return simulate(mood0, T, n_paths, mu=mu, sigma=sigma, jump_prob=p_jump, jump_mean=mu_J, jump_std=sigma_J, rng=42)
+
+
+def tracker_loop(T, stoch_vol, mu=0.04, sigma=0.2, lambda_jump=0.3, jump_mean=0.8, jump_std=0.4, dt=0.01):
+    # T counts steps of size dt here, like the original N = T / dt
+    mood_path = np.zeros(T + 1)
+    for t in range(1, T + 1):
+        dW = np.random.normal(0, np.sqrt(dt))
+        dN = np.random.poisson(lambda_jump * dt)
+        J = np.random.normal(jump_mean, jump_std) if dN > 0 else 0
+        mood_path[t] = mood_path[t - 1] + mu * dt + sigma * dW + J
+    return mood_path
+
+
+def tracker_vectorized(n_paths, T, stoch_vol, mu=0.04, sigma=0.2, lambda_jump=0.3, jump_mean=0.8, jump_std=0.4, dt=0.01):
+    return simulate(
+        0, T, n_paths, mu=mu, sigma=sigma, dt=dt,
+        jump_prob=-np.expm1(-lambda_jump * dt), jump_mean=jump_mean, jump_std=jump_std, clip=None, rng=42,
+    )
+
+
+# app -> (single-path loop, vectorized replacement, has a stochastic-volatility switch)
+KERNELS = {
+    "v2": (v2_loop, v2_vectorized, True),
+    "v3": (v3_loop, v3_vectorized, True),
+    "crisis": (crisis_loop, crisis_vectorized, True),
+    "demo": (demo_loop, demo_vectorized, False),
+    "personal": (personal_loop, personal_vectorized, False),
+    "tracker": (tracker_loop, tracker_vectorized, False),
+}
+
+
+def loop_ensemble(loop, n_paths, T, stoch_vol, seed=42):
+    np.random.seed(seed)
+    return [loop(T, stoch_vol) for _ in range(n_paths)]
+
+
+def legacy_csv_save(log, path):
+    import pandas as pd
+
+    pd.DataFrame(log).to_csv(path, index=False)
+
+
+def legacy_csv_load(path):
+    import pandas as pd
+
+    df_log = pd.read_csv(path)
+    df_log["Date"] = pd.to_datetime(df_log["Date"]).dt.date
+    return df_log.to_dict("records")
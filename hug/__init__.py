@@ -0,0 +1,19 @@
+"""HUG core: simulation kernels, storage, triage and UI text behind the Streamlit apps.
+
+Submodules are imported on first attribute access, so ``import hug`` is
+cheap and pages only pay for what they use. ``simulation``, ``moodlog``
+and ``cache`` need nothing beyond NumPy; pandas and matplotlib are only
+imported inside the functions that hand data to them.
+"""
+
+import importlib
+
+__all__ = ["api", "batch", "cache", "charts", "downsample", "estimate", "i18n", "journal", "moodlog", "pde", "qmc", "rare", "seeding", "service", "simulation", "storage", "table", "trace", "triage", "ui", "writer"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        module = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
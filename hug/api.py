@@ -0,0 +1,192 @@
+"""Headless JSON API over the triage and the simulators.
+
+Standard library only; no Streamlit script runs per request:
+
+    python -m hug.api --port 8000 --workers 16
+
+    POST /triage             {"text": "...", "lang": "English"}
+                             -> {"tier": "crisis" | "anxiety" | "sadness" | null, "reply": "..."}
+    POST /simulate/crisis    {"recovery": 5, "instability": 5, "impact": 5, "jumpiness": 3,
+                              "bullying": "No", "mood0": 50, "stoch_vol": false}
+    POST /simulate/personal  same, without "stoch_vol"
+                             -> {"risk": ..., "time": [...], "low": [...], "median": [...], "high": [...], ...}
+    GET  /health             -> {"ok": true}
+
+Missing simulator fields take the apps' slider defaults. Connections are
+HTTP/1.1 keep-alive and are served from a fixed thread pool: a connection
+holds a worker until it closes or idles for ``KEEPALIVE`` seconds, so
+``--workers`` bounds concurrent connections. Simulations go through
+``hug.service``: table lookups when tables are built, else the cached
+fixed-seed runs the apps use.
+"""
+
+import argparse
+import json
+import math
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from .i18n import LANGUAGES
+from .service import crisis_summary, personal_summary, support_reply
+from .simulation import STRESS
+
+WORKERS = 16
+KEEPALIVE = 5
+MAX_BODY = 64 * 1024
+SLIDER_DEFAULTS = {"recovery": 5, "instability": 5, "impact": 5, "jumpiness": 3}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _int(body, name, low, high, default):
+    value = body.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+        raise BadRequest(f"{name} must be an integer from {low} to {high}")
+    return value
+
+
+def _sliders(body):
+    sliders = [_int(body, name, 0, 10, default) for name, default in SLIDER_DEFAULTS.items()]
+    bullying = body.get("bullying", "No")
+    if bullying not in STRESS:
+        raise BadRequest(f"bullying must be one of {', '.join(STRESS)}")
+    return (*sliders, bullying, _int(body, "mood0", 0, 100, 50))
+
+
+def _jsonable(sim):
+    out = {}
+    for key, value in sim.items():
+        if hasattr(value, "tolist"):
+            value = value.tolist()
+        if isinstance(value, float) and not math.isfinite(value):
+            value = None
+        out[key] = value
+    return out
+
+
+def triage_endpoint(body):
+    text = body.get("text")
+    if not isinstance(text, str):
+        raise BadRequest("text must be a string")
+    lang = body.get("lang", LANGUAGES[0])
+    if lang not in LANGUAGES:
+        raise BadRequest(f"lang must be one of {', '.join(LANGUAGES)}")
+    tier, reply = support_reply(text, lang)
+    return {"tier": tier, "reply": reply}
+
+
+def crisis_endpoint(body):
+    stoch_vol = body.get("stoch_vol", False)
+    if not isinstance(stoch_vol, bool):
+        raise BadRequest("stoch_vol must be true or false")
+    return _jsonable(crisis_summary(*_sliders(body), stoch_vol))
+
+
+def personal_endpoint(body):
+    return _jsonable(personal_summary(*_sliders(body)))
+
+
+ROUTES = {"/triage": triage_endpoint, "/simulate/crisis": crisis_endpoint, "/simulate/personal": personal_endpoint}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = KEEPALIVE
+    # Headers and body go out as separate writes; without this, Nagle + delayed ACKs add ~40 ms per request
+    disable_nagle_algorithm = True
+
+    def _send(self, status, payload):
+        data = json.dumps(payload, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"ok": True})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = self.headers.get("Content-Length") or "0"
+        # isdigit() alone accepts digits int() rejects, such as "²"
+        if not (length.isascii() and length.isdigit()):
+            # A body of unknown size can't be skipped, so the connection can't be reused
+            self.close_connection = True
+            return self._send(400, {"error": "Content-Length must be a non-negative integer"})
+        length = int(length)
+        if length > MAX_BODY:
+            self.close_connection = True
+            return self._send(413, {"error": f"body over {MAX_BODY} bytes"})
+        raw = self.rfile.read(length)  # read even for unknown paths, so the connection stays usable
+        endpoint = ROUTES.get(self.path)
+        if endpoint is None:
+            return self._send(404, {"error": "not found"})
+        try:
+            body = json.loads(raw or b"{}")
+            if not isinstance(body, dict):
+                raise BadRequest("body must be a JSON object")
+            self._send(200, endpoint(body))
+        except (BadRequest, json.JSONDecodeError, UnicodeDecodeError) as e:
+            self._send(400, {"error": str(e)})
+        except Exception:
+            # Logged with its traceback like any server error; the client still gets an answer
+            self.server.handle_error(self.request, self.client_address)
+            self._send(500, {"error": "internal error"})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class PoolHTTPServer(HTTPServer):
+    """HTTPServer that serves each connection on a fixed thread pool instead of a thread per connection."""
+
+    request_queue_size = 128
+
+    def __init__(self, address, handler=Handler, workers=WORKERS, verbose=False):
+        super().__init__(address, handler)
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="hug-api")
+        self.verbose = verbose
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._serve, request, client_address)
+
+    def _serve(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hug.api", description="Serve triage and simulations as JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=WORKERS, help="thread pool size, i.e. concurrent connections")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    server = PoolHTTPServer((args.host, args.port), workers=args.workers, verbose=args.verbose)
+    print(f"hug.api listening on http://{args.host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Headless risk sweep over every stored user.
+
+Each user's simulation parameters are built exactly as on the Mood
+Simulation page: ``simulation.entry_params`` from their last log entry,
+overridden by the fit to their whole Mood history (``hug.calibrate``) once
+there is enough of it. The ensembles run across a process pool. Results go to a small CSV table:
+
+    python -m hug.batch --db hug.db --out risk_scores.csv
+    python -m hug.batch --csv-dir . --workers 8
+
+Each user's random stream is seeded from ``--seed`` and their user id, so
+a sweep is reproducible regardless of worker count or ordering.
+"""
+
+import argparse
+import csv
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .seeding import stream
+from .calibrate import Calibration
+from .simulation import COLLAPSE_THRESHOLD, N_PATHS, RISK_LEVEL, entry_params, simulate
+from .storage import CsvMoodStore, SqliteMoodStore
+
+PARAM_COLUMNS = ["Date", "Mood", "Irritability", "Impulsivity"]
+RESULT_FIELDS = ["user_id", "date", "mood", "sigma", "jump_mean", "risk", "at_risk", "median_end", "low_end"]
+
+
+def csv_users(directory="."):
+    # (user_id, path) pairs; the files are parsed in the workers
+    for path in sorted(glob.glob(os.path.join(directory, "mood_log_*.csv"))):
+        yield os.path.basename(path)[len("mood_log_"):-len(".csv")], path
+
+
+def score(user_id, entry, n_paths=N_PATHS, seed=0, threshold=COLLAPSE_THRESHOLD, calibration=None):
+    if isinstance(entry, str):
+        entries = CsvMoodStore(entry).entries()
+        calibration, _ = Calibration.from_series([e.get("Mood") or 0 for e in entries])
+        entry = entries[-1] if entries else None
+    if entry is None:
+        return None
+    entry = {col: entry.get(col) or 0 for col in PARAM_COLUMNS}
+    params = entry_params(entry)
+    calibrated = calibration.simulate_params(scale=10) if calibration else None
+    if calibrated:
+        params.update(calibrated)
+    rng = stream(user_id, seed=seed)
+    ens = simulate(params.pop("mood0"), params.pop("T"), n_paths, rng=rng, **params)
+    low, median = np.quantile(ens.mood[:, -1], (0.05, 0.5))
+    risk = ens.collapse_probability(threshold)
+    return {
+        "user_id": user_id,
+        "date": entry["Date"],
+        "mood": entry["Mood"],
+        "sigma": round(params["sigma"], 3),
+        "jump_mean": round(params["jump_mean"], 3),
+        "risk": round(risk, 4),
+        "at_risk": int(risk >= RISK_LEVEL),
+        "median_end": round(float(median), 2),
+        "low_end": round(float(low), 2),
+    }
+
+
+def _score_chunk(tasks, n_paths, seed, threshold):
+    return [score(user_id, entry, n_paths, seed, threshold, *calibration) for user_id, entry, *calibration in tasks]
+
+
+def sweep(tasks, workers=None, n_paths=N_PATHS, seed=0, threshold=COLLAPSE_THRESHOLD):
+    """Score ``(user_id, entry or CSV path[, Calibration])`` tasks across a process pool; yields result rows."""
+    tasks = list(tasks)
+    workers = workers or os.cpu_count() or 1
+    # A few chunks per worker: amortizes pickling without starving the pool at the end
+    size = max(1, len(tasks) // (workers * 4))
+    chunks = [tasks[i:i + size] for i in range(0, len(tasks), size)]
+    if workers == 1:
+        for chunk in chunks:
+            yield from filter(None, _score_chunk(chunk, n_paths, seed, threshold))
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        n = len(chunks)
+        for rows in pool.map(_score_chunk, chunks, [n_paths] * n, [seed] * n, [threshold] * n):
+            yield from filter(None, rows)
+
+
+def write_results(rows, out):
+    if out == "-":
+        writer = csv.DictWriter(sys.stdout, RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+        return
+    tmp = out + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp, out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hug.batch", description="Collapse-risk sweep over all users.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--db", help="SQLite store (default: hug.db, or $HUG_DB)")
+    source.add_argument("--csv-dir", help="directory of mood_log_<id>.csv files")
+    parser.add_argument("--out", default="risk_scores.csv", help="results CSV, or - for stdout")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--paths", type=int, default=N_PATHS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threshold", type=float, default=COLLAPSE_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.csv_dir:
+        tasks = list(csv_users(args.csv_dir))
+    else:
+        store = SqliteMoodStore(args.db or os.environ.get("HUG_DB", "hug.db"))
+        tasks = [(user_id, entry, store.calibration(user_id)) for user_id, entry in store.latest(PARAM_COLUMNS).items()]
+
+    started = time.perf_counter()
+    rows = list(sweep(tasks, args.workers, args.paths, args.seed, args.threshold))
+    write_results(rows, args.out)
+    flagged = sum(row["at_risk"] for row in rows)
+    print(f"{len(rows)} users scored, {flagged} at risk, {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Two-tier memoization for simulations and rendered charts.
+
+Tier 1 is an in-process LRU bounded by the byte size of what it holds.
+Tier 2 is an optional directory of pickles (``HUG_CACHE_DIR``) shared by
+every worker process on the box; files are written to a temp name and
+renamed into place, so readers never see a partial entry.
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+MEMORY_BYTES = 64 * 1024 * 1024
+DISK_BYTES = 1024 * 1024 * 1024
+
+
+def _sizeof(value):
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_sizeof(v) for v in value.values()) + sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_sizeof(v) for v in value) + sys.getsizeof(value)
+    return sys.getsizeof(value)
+
+
+def _normalize(value):
+    # numpy scalars repr differently from Python ones; make keys stable
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    return value
+
+
+class LRUCache:
+    def __init__(self, max_bytes=MEMORY_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key][0]
+
+    def put(self, key, value):
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self.bytes -= self._data.pop(key)[1]
+            self._data[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self.bytes -= evicted
+
+
+class DiskCache:
+    def __init__(self, directory, max_bytes=DISK_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(repr(key).encode()).hexdigest() + ".pkl")
+
+    def get(self, key, default=None):
+        try:
+            with open(self._path(key), "rb") as f:
+                stored_key, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return default
+        # Guard against hash collisions
+        return value if stored_key == key else default
+
+    def put(self, key, value):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.prune()
+
+    def prune(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                try:
+                    st = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+
+class TwoTierCache:
+    def __init__(self, memory=None, disk=None):
+        self.memory = memory or LRUCache()
+        self.disk = disk
+
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.memory.get(key, missing)
+        if value is not missing:
+            return value
+        if self.disk is not None:
+            value = self.disk.get(key, missing)
+            if value is not missing:
+                self.memory.put(key, value)
+                return value
+        value = compute()
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+        return value
+
+    def memoize(self, namespace):
+        """Cache ``fn(*args, **kwargs)`` under (namespace, args, kwargs)."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                key = (namespace, _normalize(args), _normalize(tuple(sorted(kwargs.items()))))
+                return self.get_or_compute(key, lambda: fn(*args, **kwargs))
+            return wrapper
+        return decorator
+
+
+cache = TwoTierCache(
+    disk=DiskCache(os.environ["HUG_CACHE_DIR"]) if os.environ.get("HUG_CACHE_DIR") else None,
+)
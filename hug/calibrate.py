@@ -0,0 +1,104 @@
+"""Jump-diffusion parameters fitted to a user's logged Mood series.
+
+Consecutive entries are read as one step of the discrete model the
+simulators use,
+
+    X[k+1] = X[k] + kappa * (level - X[k]) + sigma * Z + J,
+
+with a jump J ~ N(jump_mean, jump_std^2) arriving in a step with
+probability 1 - exp(-jump_rate). Each new transition is classed as a jump
+when its residual under the current fit is more than ``JUMP_Z`` sigmas out;
+jumps go into count / sum / sum-of-squares totals, every other transition
+into the regression sums of X[k+1] on X[k]. All of it is a fixed set of
+sums, so adding or removing an entry is O(1) and the fit is closed form.
+Earlier classifications are not revisited as the fit moves.
+"""
+
+import math
+
+import numpy as np
+
+STATS = ["n", "sx", "sy", "sxx", "sxy", "syy", "jumps", "jump_sum", "jump_sq"]
+# Transitions needed before fitting, and before classing anything as a jump
+MIN_TRANSITIONS = 5
+JUMP_Z = 3.0
+# Mood is logged in whole steps; keep sigma at least this many log units
+SIGMA_FLOOR = 0.5
+
+
+class Calibration:
+    def __init__(self, stats=None):
+        self.stats = np.zeros(len(STATS)) if stats is None else np.asarray(stats, dtype=float)
+
+    @classmethod
+    def from_series(cls, moods):
+        """Calibration over a whole series, and each transition's jump residual (NaN when none)."""
+        cal = cls()
+        jumps = [cal.add(x, y) for x, y in zip(moods[:-1], moods[1:])]
+        return cal, jumps
+
+    @property
+    def transitions(self):
+        return int(self.stats[0] + self.stats[6])
+
+    def _line(self):
+        # Least-squares intercept, slope and residual sd of X[k+1] on X[k]
+        n, sx, sy, sxx, sxy, syy = self.stats[:6]
+        vxx, vxy, vyy = sxx - sx * sx / n, sxy - sx * sy / n, syy - sy * sy / n
+        b = vxy / vxx if vxx > 1e-9 else 1.0
+        a = (sy - b * sx) / n
+        sigma = math.sqrt(max(vyy - b * vxy, 0.0) / max(n - 2, 1))
+        return a, b, max(sigma, SIGMA_FLOOR)
+
+    def add(self, x, y):
+        """Fold in the transition x -> y; returns its residual if it was classed as a jump, else NaN."""
+        if self.stats[0] >= MIN_TRANSITIONS:
+            a, b, sigma = self._line()
+            r = y - (a + b * x)
+            if abs(r) > JUMP_Z * sigma:
+                self.stats[6:] += (1, r, r * r)
+                return r
+        self.stats[:6] += (1, x, y, x * x, x * y, y * y)
+        return math.nan
+
+    def remove(self, x, y, jump):
+        """Undo ``add(x, y)``, given the residual it returned."""
+        if jump is not None and not math.isnan(jump):
+            self.stats[6:] -= (1, jump, jump * jump)
+        else:
+            self.stats[:6] -= (1, x, y, x * x, x * y, y * y)
+
+    def fit(self):
+        """Fitted parameters in log units, or None with fewer than MIN_TRANSITIONS transitions."""
+        n = self.stats[0]
+        if n < MIN_TRANSITIONS:
+            return None
+        a, b, sigma = map(float, self._line())
+        # The long-run mean a / (1 - b) uses the unclipped slope; only the returned kappa is clipped
+        kappa = min(max(1 - b, 0.01), 1.0)
+        level = a / (1 - b) if 1 - b >= 0.01 else float(self.stats[2] / n)
+        jumps, jump_sum, jump_sq = self.stats[6:].tolist()
+        share = jumps / self.transitions
+        return {
+            "kappa": kappa,
+            "level": level,
+            "sigma": sigma,
+            "jump_rate": -math.log1p(-min(share, 0.99)),
+            "jump_mean": jump_sum / jumps if jumps else 0.0,
+            "jump_std": max(math.sqrt(max(jump_sq / jumps - (jump_sum / jumps) ** 2, 0.0)), SIGMA_FLOOR) if jumps > 1 else sigma,
+            "transitions": self.transitions,
+        }
+
+    def simulate_params(self, scale=1.0, offset=0.0, clip=(0, 100)):
+        """The fit as ``simulate`` arguments, with mood mapped to ``offset + scale * Mood``; None if unfitted."""
+        fit = self.fit()
+        if fit is None:
+            return None
+        return {
+            "mu": fit["kappa"],
+            "baseline": float(np.clip(offset + scale * fit["level"], *clip)),
+            "sigma": scale * fit["sigma"],
+            "jump_rate": fit["jump_rate"],
+            "jump_mean": scale * fit["jump_mean"],
+            "jump_std": scale * fit["jump_std"],
+        }
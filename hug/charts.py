@@ -0,0 +1,98 @@
+"""Chart rendering for the HUG apps.
+
+Figures are drawn with the Agg canvas and never touch pyplot's global
+figure manager, so nothing accumulates in a long-lived server process.
+``render`` returns PNG bytes for ``st.image`` and caches them in
+``hug.cache.cache`` under a digest of the plotted data and parameters,
+so a rerun with unchanged data costs a hash, not a matplotlib draw.
+"""
+
+import hashlib
+import io
+
+import numpy as np
+
+from .cache import cache
+from .i18n import LANGUAGES, t
+from .trace import span
+
+
+def new_figure(**kwargs):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(**kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def figure_png(fig, dpi=100):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi)
+    return buf.getvalue()
+
+
+def _feed(h, part):
+    if isinstance(part, dict):
+        for k in sorted(part, key=repr):
+            h.update(repr(k).encode())
+            _feed(h, part[k])
+    elif isinstance(part, (list, tuple)):
+        h.update(b"(")
+        for item in part:
+            _feed(h, item)
+        h.update(b")")
+    elif hasattr(part, "to_numpy") and hasattr(part, "index"):
+        # pandas Series / DataFrame: labels matter for the plot too
+        h.update(repr(getattr(part, "columns", getattr(part, "name", None))).encode())
+        _feed(h, part.index.to_numpy())
+        _feed(h, part.to_numpy())
+    elif isinstance(part, np.ndarray):
+        arr = np.ascontiguousarray(part)
+        h.update(f"{arr.dtype}{arr.shape}".encode())
+        h.update(repr(arr.tolist()).encode() if arr.dtype == object else arr.tobytes())
+    else:
+        h.update(repr(part).encode())
+
+
+def digest(*parts):
+    h = hashlib.blake2b(digest_size=16)
+    _feed(h, parts)
+    return h.hexdigest()
+
+
+def render(draw, *data, figsize=None, **params):
+    """PNG bytes of ``draw(fig, *data, **params)``, cached by data and params."""
+    code = draw.__code__
+    key = ("chart", code.co_filename, draw.__qualname__, figsize, digest(data, params))
+
+    def build():
+        fig = new_figure(figsize=figsize)
+        draw(fig, *data, **params)
+        png = figure_png(fig)
+        fig.clear()
+        return png
+
+    with span(f"chart:{draw.__qualname__}"):
+        return cache.get_or_compute(key, build)
+
+
+def draw_bars(fig, df):
+    df.plot(kind="bar", ax=fig.subplots())
+
+
+def draw_trajectory(fig, sim, threshold=None, threshold_label=None, color="blue", xlabel=None, ylabel=None,
+                    title=None, sample_label=None, lang=LANGUAGES[0], ax=None):
+    # Median with a 5-95% band and one sample path, from Ensemble.summary(); unset labels come from the catalog
+    ax = ax or fig.subplots()
+    ax.fill_between(sim["time"], sim["low"], sim["high"], color=color, alpha=0.15, label=t("chart_band", lang))
+    ax.plot(sim["time"], sim["median"], color=color, label=t("chart_median", lang))
+    if sim.get("sample") is not None:  # precomputed tables carry bands only
+        ax.plot(sim["time"], sim["sample"], color=color, linewidth=0.8, linestyle=":", label=sample_label or t("sample_path", lang))
+    if threshold is not None:
+        ax.axhline(threshold, color="red", linestyle="--", label=threshold_label or t("chart_threshold", lang))
+    ax.set_xlabel(t("axis_time", lang) if xlabel is None else xlabel)
+    ax.set_ylabel(t("axis_mood", lang) if ylabel is None else ylabel)
+    if title:
+        ax.set_title(title)
+    ax.legend()
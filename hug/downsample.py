@@ -0,0 +1,49 @@
+"""Bounded chart payloads for long histories.
+
+Charts never get more than ``MAX_POINTS`` points per series. The source
+picks the finest resolution whose point count over the visible range is
+within ``OVERSAMPLE * MAX_POINTS`` (``SqliteMoodStore.trend`` goes
+entries -> days -> weeks -> months), and ``downsample`` thins that to
+``MAX_POINTS`` with Largest-Triangle-Three-Buckets, which keeps the peaks
+and troughs a plain stride or average would flatten.
+"""
+
+import numpy as np
+
+MAX_POINTS = 500
+OVERSAMPLE = 4
+LEVELS = ["entry", "day", "week", "month"]
+
+
+def lttb(y, n, x=None):
+    """Indices of ``n`` of the points (x, y) that best keep the line's shape."""
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size)
+    y = np.asarray(y, dtype=float)
+    x = np.arange(size, dtype=float) if x is None else np.asarray(x, dtype=float)
+    # First and last points are kept; n - 2 buckets split the rest
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    edges = np.append(edges, size)
+    picked = np.empty(n, dtype=np.int64)
+    picked[0], picked[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi, nxt = edges[i], edges[i + 1], edges[i + 2]
+        # The point in this bucket spanning the largest triangle with the last pick and the next bucket's mean
+        cx, cy = x[hi:nxt].mean(), y[hi:nxt].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def downsample(frame, n=MAX_POINTS):
+    """At most ``n`` rows of a time-indexed frame: the union of each column's LTTB picks."""
+    frame = frame.dropna()
+    if len(frame) <= n:
+        return frame
+    x = frame.index.values.astype("datetime64[s]").astype(np.int64) if frame.index.dtype.kind == "M" else None
+    share = max(3, n // max(1, frame.shape[1]))
+    keep = np.unique(np.concatenate([lttb(frame[col].to_numpy(), share, x) for col in frame.columns]))
+    return frame.iloc[keep]
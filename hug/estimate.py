@@ -0,0 +1,230 @@
+"""Variance-reduced collapse-probability estimates with confidence intervals.
+
+``collapse_probability`` draws paths in rounds until the confidence
+interval's half-width falls below ``tol``, combining:
+
+* antithetic variates: every Gaussian draw is also used negated; the pair
+  average is one sample.
+* control variates, fitted jointly by least squares. The same Gaussian
+  noise drives a jump-free, unclipped copy of the model with constant
+  volatility: a linear AR(1) chain with closed-form normal marginals, so
+  its indicators ``X_t < threshold`` at a few checkpoints have known
+  means. Jumps drive most collapses, though, so those controls are weak
+  on their own. With stochastic volatility there is a much stronger one:
+  the same path (same noise, same jumps) at constant volatility, whose
+  collapse probability ``hug.pde`` computes deterministically. It
+  typically cuts the variance 4-13x, at the cost of the solver's grid
+  error (about 0.002).
+* randomized QMC (``qmc=True``): the Gaussian increments come from
+  independently scrambled Sobol sequences through a Brownian bridge, and
+  the interval comes from the spread across the ``replicates`` sequences.
+  Jump draws stay pseudo-random.
+
+It always draws at least ``MIN_PATHS`` paths first, so a first batch in
+which no path (or every path) collapses can't end the run with a
+zero-width interval. When the samples don't vary at all the interval is
+the Wilson score interval instead, which stays sensible at p = 0 or 1.
+"""
+
+import math
+
+import numpy as np
+
+from .pde import _norm_cdf, solve
+from .qmc import Sobol, brownian_bridge, norm_ppf
+from .simulation import COLLAPSE_THRESHOLD, _jumps, evolve
+from .trace import traced
+
+N_CONTROLS = 6
+# Paths drawn before the stop rule may end a run
+MIN_PATHS = 4096
+# Stochastic-volatility arguments the constant-volatility control drops
+_SV_ARGS = ("kappa", "theta", "eta", "vol0", "vol_floor")
+
+
+def wilson(p, n, critical):
+    """Wilson score interval for a proportion ``p`` observed in ``n`` samples."""
+    if p > 0.5:
+        # Mirrored, so p = 1 gets exactly 1 as its upper bound
+        low, high = wilson(1 - p, n, critical)
+        return 1 - high, 1 - low
+    z2 = critical ** 2
+    centre = (p + z2 / (2 * n)) / (1 + z2 / n)
+    half = critical * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+    return (0.0 if p == 0 else max(0.0, centre - half)), centre + half
+
+
+class Estimate:
+    def __init__(self, value, stderr, n_paths, critical, n_samples=None):
+        self.value = value
+        self.stderr = stderr
+        self.n_paths = n_paths
+        self.critical = critical
+        # Independent samples behind value; gives a Wilson interval when they all agree
+        self.n_samples = n_samples
+
+    @property
+    def degenerate(self):
+        return self.stderr == 0 and bool(self.n_samples)
+
+    @property
+    def half_width(self):
+        if self.degenerate:
+            low, high = wilson(self.value, self.n_samples, self.critical)
+            return (high - low) / 2
+        return self.critical * self.stderr
+
+    @property
+    def relative_error(self):
+        return self.stderr / self.value if self.value else math.inf
+
+    @property
+    def ci(self):
+        if self.degenerate:
+            return wilson(self.value, self.n_samples, self.critical)
+        return max(0.0, self.value - self.half_width), min(1.0, self.value + self.half_width)
+
+    def __repr__(self):
+        low, high = self.ci
+        return f"Estimate({self.value:.4g}, ci=({low:.4g}, {high:.4g}), n_paths={self.n_paths})"
+
+
+def _t_critical(confidence, df):
+    # Student-t quantile via the Cornish-Fisher expansion around the normal one
+    z = float(norm_ppf(np.array([0.5 + confidence / 2]))[0])
+    if df is None:
+        return z
+    return z + (z ** 3 + z) / (4 * df) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+
+
+def ou_moments(mood0, T, mu=0.0, baseline=None, sigma=1.0, dt=1.0):
+    """Mean and variance at steps 0..T of the jump-free, unclipped Euler chain."""
+    a, c = (1 - mu * dt, mu * baseline * dt) if baseline is not None else (1.0, mu * dt)
+    t = np.arange(T + 1)
+    if abs(1 - a) < 1e-12:
+        return mood0 + c * t, sigma ** 2 * dt * t
+    at = a ** t
+    mean = at * mood0 + c * (1 - at) / (1 - a)
+    if abs(1 - a * a) < 1e-12:
+        return mean, sigma ** 2 * dt * t
+    return mean, sigma ** 2 * dt * (1 - at * at) / (1 - a * a)
+
+
+class _Sampler:
+    def __init__(self, mood0, T, threshold, antithetic, control, model):
+        self.mood0, self.T, self.threshold = mood0, T, threshold
+        self.antithetic, self.control = antithetic, control
+        defaults = {"jump_rate": 0.0, "jump_prob": None, "jump_mean": 0.0, "jump_std": 1.0, "jump_probs": None}
+        self.jump_args = {k: model.pop(k, v) for k, v in defaults.items()}
+        self.stoch_vol = model.pop("stoch_vol", False)
+        self.model = model
+        if control:
+            dt = model.get("dt", 1.0)
+            sigma = model.get("sigma", 1.0)
+            if model.get("mood_scaled_vol"):
+                sigma *= 2 - mood0 / 100
+            self.ctrl = (model.get("mu", 0.0), model.get("baseline"), sigma, dt)
+            mean, var = ou_moments(mood0, T, *self.ctrl)
+            self.checkpoints = np.unique(np.linspace(1, T, min(T, N_CONTROLS)).round().astype(int))
+            self.ctrl_mean = _norm_cdf((threshold - mean[self.checkpoints]) / np.sqrt(var[self.checkpoints]))
+            self.flat = None
+            if self.stoch_vol:
+                self.flat = {k: v for k, v in model.items() if k not in _SV_ARGS}
+                if model.get("theta") is not None:
+                    self.flat["sigma"] = model["theta"]
+                exact = solve(mood0, T, threshold=threshold, **self.flat, **self.jump_args).collapse_probability()
+                self.ctrl_mean = np.append(self.ctrl_mean, exact)
+
+    @property
+    def dims(self):
+        return self.T * (2 if self.stoch_vol else 1)
+
+    def run(self, z, rng):
+        """Samples (Y, C) from (n, dims) standard normals, before antithetic pairing."""
+        n = z.shape[0]
+        if self.antithetic:
+            z = np.concatenate([z, -z])
+        dW = brownian_bridge(z[:, :self.T])
+        dZ = brownian_bridge(z[:, self.T:]) if self.stoch_vol else None
+        J = _jumps(rng, self.T, n, self.model.get("dt", 1.0), **self.jump_args)
+        if self.antithetic:
+            J = np.concatenate([J, J], axis=1)
+        mood, _ = evolve(self.mood0, dW, dZ, J, **self.model)
+        Y = (mood.min(axis=0) < self.threshold).astype(float)
+
+        C = None
+        if self.control:
+            mu, baseline, sigma, dt = self.ctrl
+            X = np.full(Y.size, float(self.mood0))
+            C = np.empty((Y.size, self.checkpoints.size))
+            marks = dict(zip(self.checkpoints, range(self.checkpoints.size)))
+            for t in range(self.T):
+                drift = mu * (baseline - X) if baseline is not None else mu
+                X = X + drift * dt + sigma * math.sqrt(dt) * dW[t]
+                if t + 1 in marks:
+                    C[:, marks[t + 1]] = X < self.threshold
+            if self.flat is not None:
+                flat, _ = evolve(self.mood0, dW, None, J, **self.flat)
+                C = np.column_stack([C, flat.min(axis=0) < self.threshold])
+            C -= self.ctrl_mean
+
+        if self.antithetic:
+            Y = (Y[:n] + Y[n:]) / 2
+            C = None if C is None else (C[:n] + C[n:]) / 2
+        return Y, C
+
+
+def _adjusted(Y, C):
+    # Control-variate correction with the pooled least-squares coefficient
+    if C is None or Y.size <= C.shape[1] + 1:
+        return Y
+    beta, *_ = np.linalg.lstsq(C - C.mean(axis=0), Y - Y.mean(), rcond=None)
+    return Y - C @ beta
+
+
+@traced("estimate")
+def collapse_probability(mood0, T, *, threshold=COLLAPSE_THRESHOLD, tol=0.01, confidence=0.95,
+                         antithetic=True, control=True, qmc=False, replicates=8, batch=1024,
+                         max_paths=1 << 18, rng=None, **model):
+    """Estimate P(min mood < threshold) for the ``simulate`` model given in ``model``.
+
+    Stops once the ``confidence`` interval half-width is at most ``tol``
+    (absolute) or after ``max_paths`` paths, but not before ``MIN_PATHS``
+    paths. Returns an ``Estimate``.
+    """
+    rng = np.random.default_rng(rng)
+    sampler = _Sampler(mood0, T, threshold, antithetic, control, dict(model))
+    per_sample = 2 if antithetic else 1
+    min_paths = min(MIN_PATHS, max_paths)
+
+    if qmc:
+        streams = [Sobol(sampler.dims, rng) for _ in range(replicates)]
+        samples = [[] for _ in streams]
+        critical = _t_critical(confidence, replicates - 1)
+        n = max(1, batch // replicates // per_sample)
+        while True:
+            for stream, got in zip(streams, samples):
+                got.append(sampler.run(norm_ppf(stream.take(n)), rng))
+            Ys = [np.concatenate([y for y, _ in got]) for got in samples]
+            Cs = [None if not control else np.concatenate([c for _, c in got]) for got in samples]
+            adjusted = _adjusted(np.concatenate(Ys), None if not control else np.concatenate(Cs))
+            means = np.array([part.mean() for part in np.split(adjusted, replicates)])
+            stderr = means.std(ddof=1) / math.sqrt(replicates)
+            paths = adjusted.size * per_sample
+            estimate = Estimate(float(means.mean()), float(stderr), paths, critical, adjusted.size)
+            if paths >= min_paths and estimate.half_width <= tol or paths >= max_paths:
+                return estimate
+            n = adjusted.size // replicates  # double each replicate, keeping Sobol's 2^k balance
+
+    critical = _t_critical(confidence, None)
+    Ys, Cs = [], []
+    while True:
+        Y, C = sampler.run(rng.standard_normal((batch // per_sample, sampler.dims)), rng)
+        Ys.append(Y)
+        Cs.append(C)
+        adjusted = _adjusted(np.concatenate(Ys), None if not control else np.concatenate(Cs))
+        stderr = adjusted.std(ddof=1) / math.sqrt(adjusted.size)
+        paths = adjusted.size * per_sample
+        estimate = Estimate(float(adjusted.mean()), float(stderr), paths, critical, adjusted.size)
+        if paths >= min_paths and estimate.half_width <= tol or paths >= max_paths:
+            return estimate
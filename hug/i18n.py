@@ -0,0 +1,536 @@
+"""UI strings shared by the HUG apps, in English and Bahasa Indonesia.
+
+``MESSAGES`` is the one source, ``{key: {language: text}}``. At import it is
+compiled into ``CATALOG``, one flat ``{key: text}`` table per language, with
+multi-line markdown blocks dedented once there rather than on every rerun.
+A key missing a language, or whose ``{placeholders}`` differ between
+languages, fails the import, so every language stays complete. ``t`` is a
+single lookup into the compiled table, however many languages there are.
+
+    python -m hug.i18n
+
+also checks that every ``t("key", ...)`` in the apps names a catalog key.
+"""
+
+import inspect
+import re
+import sys
+from pathlib import Path
+from string import Formatter
+
+LANGUAGES = ["English", "Bahasa Indonesia"]
+
+MESSAGES = {
+    "crisis_btn": {
+        "English": "🆘 Crisis Mode",
+        "Bahasa Indonesia": "🆘 Mode Krisis",
+    },
+    "bully_btn": {
+        "English": "🚩 I'm being bullied",
+        "Bahasa Indonesia": "🚩 Saya sedang dibully",
+    },
+    "exit_btn": {
+        "English": "↩️ Exit Support Mode",
+        "Bahasa Indonesia": "↩️ Keluar dari Mode Dukungan",
+    },
+    "crisis_title": {
+        "English": "🆘 Crisis Mode Activated",
+        "Bahasa Indonesia": "🆘 Mode Krisis Aktif",
+    },
+    "crisis_intro": {
+        "English": "You're not alone. Let's take this one small step at a time.",
+        "Bahasa Indonesia": "Kamu tidak sendiri. Mari kita ambil langkah kecil bersama-sama.",
+    },
+    "toolkit_title": {
+        "English": "📦 Emergency Grounding Toolkit",
+        "Bahasa Indonesia": "📦 Alat Darurat untuk Menenangkan Diri",
+    },
+    "toolkit_body": {
+        "English": """
+- Take a breath: Inhale for 4 seconds, hold for 4, exhale for 6.
+- Name 3 things you see, 2 you hear, 1 you feel.
+- Grab a glass of water or walk to a window.
+        """,
+        "Bahasa Indonesia": """
+- Tarik napas: Tarik napas 4 detik, tahan 4 detik, hembuskan 6 detik.
+- Sebutkan 3 hal yang kamu lihat, 2 yang kamu dengar, 1 yang kamu rasakan.
+- Minum air putih atau lihat keluar jendela.
+        """,
+    },
+    "talk_title": {
+        "English": "💬 Talk to HUG",
+        "Bahasa Indonesia": "💬 Bicara dengan HUG",
+    },
+    "talk_prompt": {
+        "English": "What’s happening for you right now?",
+        "Bahasa Indonesia": "Apa yang sedang kamu rasakan saat ini?",
+    },
+    "send": {
+        "English": "Send",
+        "Bahasa Indonesia": "Kirim",
+    },
+    "you_said": {
+        "English": "🫂 You said: *{text}*",
+        "Bahasa Indonesia": "🫂 Kamu bilang: *{text}*",
+    },
+    "reply_crisis": {
+        "English": "💔 That sounds really heavy. Please consider calling a crisis line or reaching out to someone you trust. You don’t have to go through this alone.",
+        "Bahasa Indonesia": "💔 Itu terdengar sangat berat. Pertimbangkan untuk menghubungi layanan krisis atau seseorang yang kamu percaya. Kamu tidak harus menghadapinya sendiri.",
+    },
+    "reply_anxiety": {
+        "English": "🫁 Try a grounding technique: 5 deep breaths, or list 3 things you can see, hear, and touch.",
+        "Bahasa Indonesia": "🫁 Coba teknik menenangkan: 5 kali napas dalam, atau sebutkan 3 hal yang kamu lihat, dengar, dan rasakan.",
+    },
+    "reply_sadness": {
+        "English": "💙 It’s okay to feel what you’re feeling. You’re not alone, and this feeling won’t last forever.",
+        "Bahasa Indonesia": "💙 Tidak apa-apa merasakan apa yang kamu rasakan. Kamu tidak sendiri, dan perasaan ini tidak akan berlangsung selamanya.",
+    },
+    "reply_ok": {
+        "English": "✅ Thank you for sharing. Sometimes just expressing it helps a little.",
+        "Bahasa Indonesia": "✅ Terima kasih sudah berbagi. Terkadang hanya mengungkapkan saja sudah cukup membantu.",
+    },
+    "resources_title": {
+        "English": "📞 Helpful Resources",
+        "Bahasa Indonesia": "📞 Sumber Bantuan",
+    },
+    "resources_body": {
+        "English": """
+- **Befrienders Worldwide**: [https://www.befrienders.org](https://www.befrienders.org)
+- **Indonesia (Samaritans)**: Call 021-500-454
+- **UK (Samaritans)**: Call 116 123
+- **Text a friend** you trust and just say: "Hey, can we talk?"
+        """,
+        "Bahasa Indonesia": """
+- **Befrienders Indonesia**: [https://www.befrienders.or.id](https://www.befrienders.or.id)
+- **Indonesia (Samaritans)**: Hubungi 021-500-454
+- **UK (Samaritans)**: Hubungi 116 123
+- **Kirim pesan ke teman** yang kamu percaya dan katakan: "Hai, boleh kita ngobrol?"
+        """,
+    },
+    "bully_title": {
+        "English": "💬 Bullying Support Bot",
+        "Bahasa Indonesia": "💬 Bot Dukungan untuk Perundungan",
+    },
+    "bully_intro": {
+        "English": "That’s hard. Let’s talk it through – anonymously and safely.",
+        "Bahasa Indonesia": "Itu berat. Mari kita bicarakan secara anonim dan aman.",
+    },
+    "bully_prompt": {
+        "English": "What’s been going on?",
+        "Bahasa Indonesia": "Apa yang sedang terjadi padamu?",
+    },
+    "bully_thanks": {
+        "English": "🫂 Thank you for sharing. No one deserves that. You're not overreacting.",
+        "Bahasa Indonesia": "🫂 Terima kasih sudah berbagi. Tidak ada yang pantas diperlakukan seperti itu. Kamu tidak berlebihan.",
+    },
+    "bully_advice": {
+        "English": "You might try keeping a small log of what happens and when, and talk to someone you trust. I'm here for more support anytime.",
+        "Bahasa Indonesia": "Kamu bisa mencoba mencatat kejadian dan waktunya, lalu bicara dengan orang yang kamu percaya. Aku di sini kalau kamu butuh dukungan.",
+    },
+    "support_modes_title": {
+        "English": "## 🆘 Support Modes",
+        "Bahasa Indonesia": "## 🆘 Mode Dukungan",
+    },
+    # --- Journal paging and the Mood Report table ---
+    "page_newer": {
+        "English": "← Newer",
+        "Bahasa Indonesia": "← Lebih baru",
+    },
+    "page_older": {
+        "English": "Older →",
+        "Bahasa Indonesia": "Lebih lama →",
+    },
+    "table_from": {
+        "English": "From",
+        "Bahasa Indonesia": "Dari",
+    },
+    "table_to": {
+        "English": "To",
+        "Bahasa Indonesia": "Sampai",
+    },
+    "table_times": {
+        "English": "Time of day",
+        "Bahasa Indonesia": "Waktu dalam sehari",
+    },
+    "table_sort": {
+        "English": "Sort by",
+        "Bahasa Indonesia": "Urutkan menurut",
+    },
+    "table_descending": {
+        "English": "Descending",
+        "Bahasa Indonesia": "Menurun",
+    },
+    "table_page": {
+        "English": "Page",
+        "Bahasa Indonesia": "Halaman",
+    },
+    "table_count": {
+        "English": "{shown} of {total} entries",
+        "Bahasa Indonesia": "{shown} dari {total} entri",
+    },
+    "table_read_note": {
+        "English": "Read a full note",
+        "Bahasa Indonesia": "Baca catatan lengkap",
+    },
+    # --- Simulator pages ---
+    "app_title": {
+        "English": "HUG – Holding Us Great",
+        "Bahasa Indonesia": "HUG – Merangkul Kita Hebat",
+    },
+    "sim_subtitle": {
+        "English": "🔁 Personalized Mood Trajectory Simulator",
+        "Bahasa Indonesia": "🔁 Simulasi Trajektori Mood Pribadi",
+    },
+    "recover_slider": {
+        "English": "How fast do you recover after emotional setbacks?",
+        "Bahasa Indonesia": "Seberapa cepat kamu pulih setelah tekanan emosional?",
+    },
+    "recover_help": {
+        "English": "0 = I stay upset for a long time, 10 = I bounce back quickly",
+        "Bahasa Indonesia": "0 = Sangat sulit bangkit, 10 = Pulih sangat cepat",
+    },
+    "instability_slider": {
+        "English": "How often does your mood fluctuate unexpectedly?",
+        "Bahasa Indonesia": "Seberapa sering mood kamu berubah tiba-tiba?",
+    },
+    "impact_slider": {
+        "English": "How strongly do negative events affect you?",
+        "Bahasa Indonesia": "Seberapa besar dampak peristiwa negatif terhadapmu?",
+    },
+    "jumpiness_slider": {
+        "English": "How often do unexpected emotional events happen in your life?",
+        "Bahasa Indonesia": "Seberapa sering kamu mengalami kejutan emosional?",
+    },
+    "mood_now_slider": {
+        "English": "Your mood right now:",
+        "Bahasa Indonesia": "Mood kamu saat ini:",
+    },
+    "bullying_question": {
+        "English": "Have you experienced bullying or social stress recently?",
+        "Bahasa Indonesia": "Apakah kamu mengalami bullying atau tekanan sosial baru-baru ini?",
+    },
+    "bullying_no": {
+        "English": "No",
+        "Bahasa Indonesia": "Tidak",
+    },
+    "bullying_maybe": {
+        "English": "Maybe",
+        "Bahasa Indonesia": "Mungkin",
+    },
+    "bullying_yes": {
+        "English": "Yes",
+        "Bahasa Indonesia": "Ya",
+    },
+    "stoch_vol_checkbox": {
+        "English": "Use stochastic volatility?",
+        "Bahasa Indonesia": "Gunakan volatilitas stokastik?",
+    },
+    "simulate_btn": {
+        "English": "Run My Personalized Simulation",
+        "Bahasa Indonesia": "Jalankan Simulasi Mood Saya",
+    },
+    "axis_time": {
+        "English": "Time",
+        "Bahasa Indonesia": "Waktu",
+    },
+    "axis_mood": {
+        "English": "Mood Level",
+        "Bahasa Indonesia": "Tingkat Mood",
+    },
+    "sample_path": {
+        "English": "Sample path",
+        "Bahasa Indonesia": "Contoh lintasan",
+    },
+    "chart_band": {
+        "English": "5–95%",
+        "Bahasa Indonesia": "5–95%",
+    },
+    "chart_median": {
+        "English": "Median",
+        "Bahasa Indonesia": "Median",
+    },
+    "chart_threshold": {
+        "English": "Collapse Threshold",
+        "Bahasa Indonesia": "Ambang Kejatuhan",
+    },
+    "chart_tipping_point": {
+        "English": "Tipping Point",
+        "Bahasa Indonesia": "Titik Kritis",
+    },
+    "chart_mood_trajectory": {
+        "English": "Mood Trajectory",
+        "Bahasa Indonesia": "Trajektori Mood",
+    },
+    "chart_volatility": {
+        "English": "Volatility",
+        "Bahasa Indonesia": "Volatilitas",
+    },
+    "chart_volatility_title": {
+        "English": "Volatility Over Time",
+        "Bahasa Indonesia": "Volatilitas dari Waktu ke Waktu",
+    },
+    "vol_path_title": {
+        "English": "#### Stochastic Volatility Path",
+        "Bahasa Indonesia": "#### Lintasan Volatilitas Stokastik",
+    },
+    "collapse_risk": {
+        "English": "Collapse risk",
+        "Bahasa Indonesia": "Risiko kejatuhan",
+    },
+    "feedback_ok": {
+        "English": "✅ Your mood trajectory looks stable and adaptive.",
+        "Bahasa Indonesia": "✅ Mood kamu terlihat stabil dan adaptif.",
+    },
+    "feedback_risk": {
+        "English": "⚠️ Your simulation shows risk of approaching an emotional tipping point. This may be a good moment to reach out or slow down.",
+        "Bahasa Indonesia": "⚠️ Simulasi menunjukkan kamu mendekati titik kritis emosional. Mungkin ini saat yang baik untuk bicara atau melambat sejenak.",
+    },
+    "model_title": {
+        "English": "### 📊 Model Explanation",
+        "Bahasa Indonesia": "### 📊 Penjelasan Model",
+    },
+    "param_title": {
+        "English": "Parameter Descriptions",
+        "Bahasa Indonesia": "Deskripsi Parameter",
+    },
+    "param_body": {
+        "English": r"""
+            - $M_t$: Current mood
+            - $M^*$: Baseline mood (e.g. 60)
+            - $\mu$: Recovery rate
+            - $\sigma_t$: Emotional volatility (adaptive or stochastic)
+            - $dW_t$: Random emotional fluctuation (Brownian motion)
+            - $J_t$: Emotional shock (trauma/conflict)
+            - $dN_t$: Random occurrence of shocks (Poisson)
+            - $d\sigma_t$: Volatility dynamics
+            - $\kappa$: Speed of mean reversion
+            - $\theta$: Long-term average volatility
+            - $\eta$: Noise strength in volatility
+            - $dZ_t$: Random noise for volatility
+        """,
+        "Bahasa Indonesia": r"""
+            - $M_t$: Mood saat ini
+            - $M^*$: Mood ideal (misal: 60)
+            - $\mu$: Kecepatan pemulihan
+            - $\sigma_t$: Volatilitas emosi (adaptif atau stokastik)
+            - $dW_t$: Fluktuasi acak (proses Brown)
+            - $J_t$: Guncangan emosi (trauma/konflik)
+            - $dN_t$: Kejadian acak dari guncangan (Poisson)
+            - $d\sigma_t$: Dinamika volatilitas
+            - $\kappa$: Kecepatan kembali ke rata-rata
+            - $\theta$: Rata-rata jangka panjang dari volatilitas
+            - $\eta$: Kekuatan gangguan dalam volatilitas
+            - $dZ_t$: Kebisingan acak untuk volatilitas
+        """,
+    },
+    "personal_model_title": {
+        "English": "📐 Model Explanation (Jump-Diffusion)",
+        "Bahasa Indonesia": "📐 Penjelasan Model Emosional (Jump-Diffusion)",
+    },
+    "personal_model_body": {
+        "English": """
+            This model assumes your mood evolves over time with:
+            - **μ**: tendency to recover (drift)
+            - **σ**: natural instability (volatility)
+            - **J**: emotional shock (random jump)
+            - **dN**: Poisson trigger for surprise events
+
+            If mood drops below a threshold (e.g. 30), we flag emotional collapse risk.
+        """,
+        "Bahasa Indonesia": """
+            Model ini mengasumsikan bahwa mood kamu berubah seiring waktu:
+            - **μ**: kecenderungan untuk pulih (drift)
+            - **σ**: ketidakstabilan alami (volatilitas)
+            - **J**: lonjakan emosional (shock acak)
+            - **dN**: proses kejadian acak (trauma/intervensi)
+
+            Jika mood turun di bawah ambang (misalnya 30), dianggap berisiko jatuh emosi.
+        """,
+    },
+    "disclaimer": {
+        "English": "This is not a diagnostic tool.",
+        "Bahasa Indonesia": "Ini bukan alat diagnosis medis.",
+    },
+    # --- Demo page ---
+    "demo_subtitle": {
+        "English": "Mood & Crisis Trajectory Simulator",
+        "Bahasa Indonesia": "Simulasi Mood & Krisis Emosional",
+    },
+    "demo_mood_slider": {
+        "English": "How are you feeling right now?",
+        "Bahasa Indonesia": "Bagaimana perasaanmu sekarang?",
+    },
+    "demo_simulate_btn": {
+        "English": "Run Simulation",
+        "Bahasa Indonesia": "Jalankan Simulasi",
+    },
+    "demo_feedback_ok": {
+        "English": "Trajectory appears stable. Keep supporting yourself.",
+        "Bahasa Indonesia": "Trajektori terlihat stabil. Terus dukung dirimu.",
+    },
+    "demo_feedback_risk": {
+        "English": "Trajectory indicates emotional collapse risk. Reach out or seek help.",
+        "Bahasa Indonesia": "Trajektori menunjukkan risiko kejatuhan emosi. Hubungi seseorang atau cari bantuan.",
+    },
+    "demo_model_title": {
+        "English": "### 🧠 Mathematical Model (Jump-Diffusion)",
+        "Bahasa Indonesia": "### 🧠 Model Matematis (Jump-Diffusion)",
+    },
+    "demo_model_body": {
+        "English": r"""
+            - \( M_t \): mood over time
+            - \( \mu \): baseline emotional drift
+            - \( \sigma_t \): volatility of mood
+            - \( J_t \): emotional jump (positive or negative)
+            - If \( M_t < 30 \): flag as collapse trajectory
+        """,
+        "Bahasa Indonesia": r"""
+            - \( M_t \): mood dari waktu ke waktu
+            - \( \mu \): kecenderungan dasar emosi (drift)
+            - \( \sigma_t \): volatilitas mood
+            - \( J_t \): lonjakan emosi (positif atau negatif)
+            - Jika \( M_t < 30 \): ditandai sebagai trajektori kejatuhan
+        """,
+    },
+    "demo_disclaimer": {
+        "English": "HUG demo – not a diagnostic tool.",
+        "Bahasa Indonesia": "Demo HUG – bukan alat diagnosis.",
+    },
+    # --- About HUG (crisis page) ---
+    "about_title": {
+        "English": "## 💬 About HUG",
+        "Bahasa Indonesia": "## 💬 Tentang HUG",
+    },
+    "aims_title": {
+        "English": "🌍 What HUG Aims to Solve",
+        "Bahasa Indonesia": "🌍 Masalah yang Ingin Diatasi HUG",
+    },
+    "aims_body": {
+        "English": """
+            1. **Access** – Therapy is expensive, rare, or taboo.
+            2. **Stigma** – People fear speaking up until it’s too late.
+            3. **Delay** – Lack of early support leads to help only at crisis points.
+            4. **Overload** – Young professionals and students are silently burning out.
+            5. **Cultural Mismatch** – Mental health tools often miss local realities.
+        """,
+        "Bahasa Indonesia": """
+            1. **Akses** – Terapi mahal, langka, atau dianggap tabu.
+            2. **Stigma** – Orang takut bicara sampai semuanya terlambat.
+            3. **Keterlambatan** – Tanpa dukungan dini, bantuan baru datang saat krisis.
+            4. **Beban Berlebih** – Pekerja muda dan pelajar kelelahan secara diam-diam.
+            5. **Ketidaksesuaian Budaya** – Alat kesehatan mental sering tidak sesuai dengan realitas lokal.
+        """,
+    },
+    "audience_title": {
+        "English": "👥 Who HUG Is For",
+        "Bahasa Indonesia": "👥 Untuk Siapa HUG",
+    },
+    "audience_body": {
+        "English": """
+            - **Teenagers/Students** – Facing bullying, anxiety, or academic pressure.
+            - **Young Professionals** – Experiencing quiet burnout, low support.
+            - **Suicide-vulnerable groups** – Especially in academia.
+            - **Supporters** – Parents, teachers, and managers who want to help.
+        """,
+        "Bahasa Indonesia": """
+            - **Remaja/Pelajar** – Menghadapi perundungan, kecemasan, atau tekanan akademik.
+            - **Pekerja Muda** – Mengalami kelelahan diam-diam dengan sedikit dukungan.
+            - **Kelompok rentan bunuh diri** – Terutama di lingkungan akademik.
+            - **Pendukung** – Orang tua, guru, dan atasan yang ingin membantu.
+        """,
+    },
+    "features_title": {
+        "English": "🛠 Features (Early Version)",
+        "Bahasa Indonesia": "🛠 Fitur (Versi Awal)",
+    },
+    "features_body": {
+        "English": """
+            - **Emotional Check-in Bot** – Mood check & daily prompts.
+            - **Guided Journaling** – Adaptive mood pattern tracking.
+            - **Mood Volatility Analysis** – Quant-style emotional risk modeling.
+            - **Localized Psychoeducation** – Mental health insights in context.
+            - **Burnout Dashboard** – Visual overview of mood/stress levels.
+            - **Escalation Paths** – Help, therapist chat, or peer community.
+            - **Crisis Mode** – A supportive chatbot and immediate resources.
+        """,
+        "Bahasa Indonesia": """
+            - **Bot Check-in Emosi** – Cek mood & pertanyaan harian.
+            - **Jurnal Terpandu** – Pelacakan pola mood yang adaptif.
+            - **Analisis Volatilitas Mood** – Pemodelan risiko emosi ala kuantitatif.
+            - **Psikoedukasi Lokal** – Wawasan kesehatan mental sesuai konteks.
+            - **Dasbor Burnout** – Gambaran visual tingkat mood/stres.
+            - **Jalur Eskalasi** – Bantuan, chat dengan terapis, atau komunitas sebaya.
+            - **Mode Krisis** – Chatbot pendukung dan sumber bantuan segera.
+        """,
+    },
+}
+
+
+# Selectbox values stay the simulator's STRESS keys; these are their labels
+BULLYING_KEYS = {"No": "bullying_no", "Maybe": "bullying_maybe", "Yes": "bullying_yes"}
+
+
+class CatalogError(ValueError):
+    pass
+
+
+def _fields(text):
+    return {name for _, name, _, _ in Formatter().parse(text) if name is not None}
+
+
+def _render(text):
+    # Markdown blocks are written indented inside MESSAGES; dedent them here, once
+    return inspect.cleandoc(text) if "\n" in text else text
+
+
+def compile_catalog(messages, languages=LANGUAGES):
+    """``{language: {key: text}}`` from ``{key: {language: text}}``; raises ``CatalogError`` listing every gap."""
+    problems = []
+    catalog = {lang: {} for lang in languages}
+    for key, texts in messages.items():
+        missing = [lang for lang in languages if not texts.get(lang)]
+        if missing:
+            problems.append(f"{key}: no {', '.join(missing)} text")
+            continue
+        unknown = set(texts) - set(languages)
+        if unknown:
+            problems.append(f"{key}: unknown language {', '.join(sorted(unknown))}")
+        fields = {lang: _fields(texts[lang]) for lang in languages}
+        if any(f != fields[languages[0]] for f in fields.values()):
+            problems.append(f"{key}: placeholders differ between languages")
+        for lang in languages:
+            catalog[lang][key] = _render(texts[lang])
+    if problems:
+        raise CatalogError("incomplete message catalog:\n  " + "\n  ".join(problems))
+    return catalog
+
+
+CATALOG = compile_catalog(MESSAGES)
+
+
+def t(key, lang, **kwargs):
+    text = CATALOG[lang][key]
+    return text.format(**kwargs) if kwargs else text
+
+
+def check(root=Path(__file__).resolve().parent.parent):
+    """(unknown, unused) catalog keys over the ``.py`` files of the apps and the package."""
+    files = [path for path in [*root.glob("*.py"), *root.glob("hug/*.py")] if path.name != "i18n.py"]
+    used, literals = set(), set()
+    for path in files:
+        source = path.read_text(encoding="utf-8")
+        used |= set(re.findall(r"\bt\(\s*[\"'](\w+)[\"']", source))
+        literals |= set(re.findall(r"[\"'](\w+)[\"']", source))
+    # Keys reached through a table (REPLY_KEYS, BULLYING_KEYS) count as used if quoted anywhere
+    literals |= set(BULLYING_KEYS.values())
+    return sorted(used - set(MESSAGES)), sorted(set(MESSAGES) - literals - used)
+
+
+if __name__ == "__main__":
+    unknown, unused = check()
+    for key in unknown:
+        print(f"unknown key: {key}", file=sys.stderr)
+    for key in unused:
+        print(f"unused key: {key}", file=sys.stderr)
+    print(f"{len(MESSAGES)} keys x {len(LANGUAGES)} languages: {'ok' if not unknown else 'FAILED'}", file=sys.stderr)
+    sys.exit(1 if unknown else 0)
@@ -0,0 +1,69 @@
+"""Letters to Self and Reality Anchors, paged newest first.
+
+Both kinds of note share one interface, so the pages don't care where
+notes live:
+
+* ``Journal``: in-session, for the apps without a user store;
+* ``StoreJournal``: one user's notes in a ``SqliteMoodStore`` (the
+  ``journal`` table, next to the mood log).
+
+``page(kind, before)`` returns up to ``limit`` notes with ids below the
+cursor ``before``, newest first, plus the cursor for the next (older)
+page, or None when there is none. A page carries each note's short
+preview but, unless ``bodies=True``, not its text; ``body(id)`` fetches
+one note's text when it is actually shown.
+"""
+
+import bisect
+import collections
+import datetime
+
+KINDS = ("letter", "anchor")
+PAGE_SIZE = 10
+PREVIEW_CHARS = 80
+
+Note = collections.namedtuple("Note", "id created preview body")
+
+
+def preview(body):
+    line = (body or "").strip().split("\n", 1)[0]
+    return line if len(line) <= PREVIEW_CHARS else line[:PREVIEW_CHARS - 1] + "…"
+
+
+class Journal:
+    def __init__(self):
+        self._notes = []
+        self._ids = {kind: [] for kind in KINDS}
+
+    def add(self, kind, body, created=None):
+        self._notes.append((created or datetime.datetime.now(), body))
+        self._ids[kind].append(len(self._notes))
+        return len(self._notes)
+
+    def page(self, kind, before=None, limit=PAGE_SIZE, bodies=False):
+        ids = self._ids[kind]
+        end = len(ids) if before is None else bisect.bisect_left(ids, before)
+        picked = ids[max(0, end - limit):end][::-1]
+        notes = []
+        for note_id in picked:
+            created, body = self._notes[note_id - 1]
+            notes.append(Note(note_id, created, preview(body), body if bodies else None))
+        return notes, picked[-1] if end > limit else None
+
+    def body(self, note_id):
+        return self._notes[note_id - 1][1]
+
+
+class StoreJournal:
+    def __init__(self, store, user_id):
+        self.store = store
+        self.user_id = user_id
+
+    def add(self, kind, body, created=None):
+        return self.store.journal_add(self.user_id, kind, body, created)
+
+    def page(self, kind, before=None, limit=PAGE_SIZE, bodies=False):
+        return self.store.journal_page(self.user_id, kind, before, limit, bodies)
+
+    def body(self, note_id):
+        return self.store.journal_body(self.user_id, note_id)
@@ -0,0 +1,262 @@
+"""Columnar in-session mood log.
+
+Slider values live in one typed (column, row) NumPy block, dates in a
+datetime64 array and time of day as small integer codes, so appends are
+amortized O(1) and ``to_frame`` hands the numeric block to pandas without
+copying. Free-text notes are kept apart and, when the log was loaded from
+a store, only fetched when a row's notes are actually asked for.
+
+The Mood Report aggregates (rolling means, per-time-of-day means, per-day
+mood ranges) are maintained on every append/pop, so reading them costs
+O(window) rather than a pass over the whole history. So are the Mood
+series' jump-diffusion sufficient statistics (``hug.calibrate``), which the
+Mood Simulation page reads instead of refitting.
+"""
+
+import numpy as np
+
+from .calibrate import Calibration
+
+NUMERIC = ["Mood", "Energy", "Sleep", "Irritability", "Confidence", "Impulsivity"]
+TIMES = ["Morning", "Afternoon", "Night"]
+ROLLING = ["Mood", "Energy", "Sleep"]
+WINDOW = 3
+# Mood Report table: sortable columns, rows per page, Notes shown up to this many characters
+SORTABLE = ["Date"] + NUMERIC
+PAGE_ROWS = 20
+NOTE_CHARS = 60
+
+_ROLL_ROWS = [NUMERIC.index(col) for col in ROLLING]
+_MOOD = NUMERIC.index("Mood")
+
+
+def clip_note(text):
+    text = text or ""
+    return text if len(text) <= NOTE_CHARS else text[:NOTE_CHARS - 1] + "…"
+
+
+class _Rollups:
+    def __init__(self, capacity, window=WINDOW):
+        self.window = window
+        self.rolling = np.full((len(ROLLING), capacity), np.nan)
+        self.time_n = {}
+        self.time_sum = {}
+        self.days = {}
+        self.calibration = Calibration()
+        # Jump residual of the transition into row i, NaN when it was not a jump
+        self.jumps = np.full(capacity, np.nan)
+
+    def grow(self, capacity):
+        rolling = np.full((len(ROLLING), capacity), np.nan)
+        rolling[:, :self.rolling.shape[1]] = self.rolling
+        self.rolling = rolling
+        jumps = np.full(capacity, np.nan)
+        jumps[:self.jumps.size] = self.jumps
+        self.jumps = jumps
+
+    def add(self, log, i):
+        w = self.window
+        if i + 1 >= w:
+            self.rolling[:, i] = log._values[_ROLL_ROWS, i + 1 - w:i + 1].mean(axis=1)
+        mood = int(log._values[_MOOD, i])
+        code = int(log._times[i])
+        self.time_n[code] = self.time_n.get(code, 0) + 1
+        self.time_sum[code] = self.time_sum.get(code, 0) + mood
+        n, lo, hi = self.days.get(log._dates[i], (0, mood, mood))
+        self.days[log._dates[i]] = (n + 1, min(lo, mood), max(hi, mood))
+        if i:
+            self.jumps[i] = self.calibration.add(int(log._values[_MOOD, i - 1]), mood)
+
+    def remove(self, log, i):
+        # Row i has just been dropped; its values are still in the buffers
+        self.rolling[:, i] = np.nan
+        code = int(log._times[i])
+        self.time_n[code] -= 1
+        self.time_sum[code] -= int(log._values[_MOOD, i])
+        day = log._dates[i]
+        moods = log._values[_MOOD, :log._n][log._dates[:log._n] == day]
+        if moods.size:
+            self.days[day] = (moods.size, int(moods.min()), int(moods.max()))
+        else:
+            del self.days[day]
+        if i:
+            self.calibration.remove(int(log._values[_MOOD, i - 1]), int(log._values[_MOOD, i]), self.jumps[i])
+            self.jumps[i] = np.nan
+
+    def rebuild(self, log):
+        n, w = log._n, self.window
+        self.rolling[:] = np.nan
+        if n >= w:
+            c = np.cumsum(log._values[_ROLL_ROWS, :n], axis=1, dtype=float)
+            c = np.concatenate([np.zeros((len(ROLLING), 1)), c], axis=1)
+            self.rolling[:, w - 1:n] = (c[:, w:] - c[:, :-w]) / w
+        moods = log._values[_MOOD, :n].astype(np.int64)
+        counts = np.bincount(log._times[:n], minlength=len(log._time_labels))
+        sums = np.bincount(log._times[:n], weights=moods, minlength=len(log._time_labels))
+        self.time_n = {code: int(k) for code, k in enumerate(counts) if k}
+        self.time_sum = {code: int(sums[code]) for code in self.time_n}
+        days, inverse = np.unique(log._dates[:n], return_inverse=True)
+        lo = np.full(days.size, np.iinfo(np.int64).max)
+        hi = np.full(days.size, np.iinfo(np.int64).min)
+        np.minimum.at(lo, inverse, moods)
+        np.maximum.at(hi, inverse, moods)
+        per_day = np.bincount(inverse, minlength=days.size)
+        self.days = {d: (int(k), int(a), int(b)) for d, k, a, b in zip(days, per_day, lo, hi)}
+        self.calibration, jumps = Calibration.from_series(moods.tolist())
+        self.jumps[:] = np.nan
+        self.jumps[1:n] = jumps
+
+
+class MoodLog:
+    def __init__(self, capacity=64, notes_loader=None):
+        self._values = np.zeros((len(NUMERIC), capacity), dtype=np.int16)
+        self._dates = np.zeros(capacity, dtype="datetime64[D]")
+        self._times = np.zeros(capacity, dtype=np.int8)
+        self._time_labels = list(TIMES)
+        self._notes = []
+        self._notes_loader = notes_loader
+        self._n = 0
+        self._rollups = _Rollups(capacity)
+
+    @classmethod
+    def from_records(cls, records, notes_loader=None):
+        log = cls(max(64, len(records)), notes_loader)
+        for record in records:
+            log.append(record)
+        return log
+
+    @classmethod
+    def from_columns(cls, dates, times, values, notes_loader=None):
+        n = len(dates)
+        log = cls(max(64, n), notes_loader)
+        if n:
+            log._values[:, :n] = np.asarray(values).T
+            log._dates[:n] = np.asarray(dates, dtype="datetime64[D]")
+            log._times[:n] = [log._time_code(t) for t in times]
+        log._notes = [None] * n
+        log._n = n
+        log._rollups.rebuild(log)
+        return log
+
+    def __len__(self):
+        return self._n
+
+    def _grow(self):
+        capacity = 2 * self._values.shape[1]
+        values = np.zeros((len(NUMERIC), capacity), dtype=self._values.dtype)
+        values[:, :self._n] = self._values[:, :self._n]
+        self._values = values
+        self._dates = np.resize(self._dates, capacity)
+        self._times = np.resize(self._times, capacity)
+        self._rollups.grow(capacity)
+
+    def _time_code(self, label):
+        if label not in self._time_labels:
+            self._time_labels.append(label)
+        return self._time_labels.index(label)
+
+    def append(self, entry):
+        if self._n == self._values.shape[1]:
+            self._grow()
+        i = self._n
+        self._values[:, i] = [entry.get(col, 0) for col in NUMERIC]
+        self._dates[i] = np.datetime64(entry["Date"], "D")
+        self._times[i] = self._time_code(entry.get("Time", TIMES[0]))
+        # Without a loader the notes are kept; with one they are fetched lazily
+        self._notes.append(entry.get("Notes") if "Notes" in entry or self._notes_loader is None else None)
+        self._n += 1
+        self._rollups.add(self, i)
+
+    def pop(self):
+        if self._n:
+            self._n -= 1
+            self._notes.pop()
+            self._rollups.remove(self, self._n)
+
+    def column(self, name):
+        if name == "Date":
+            return self._dates[:self._n]
+        if name == "Time":
+            return np.asarray(self._time_labels, dtype=object)[self._times[:self._n]]
+        return self._values[NUMERIC.index(name), :self._n]
+
+    def notes(self, i):
+        i = range(self._n)[i]
+        if self._notes[i] is None and self._notes_loader is not None:
+            self._notes[i] = self._notes_loader(i) or ""
+        return self._notes[i] or ""
+
+    def __getitem__(self, i):
+        i = range(self._n)[i]
+        entry = {"Date": self._dates[i].item(), "Time": self._time_labels[self._times[i]]}
+        entry.update(zip(NUMERIC, self._values[:, i].tolist()))
+        entry["Notes"] = self.notes(i)
+        return entry
+
+    def last(self):
+        return self[-1] if self._n else None
+
+    def to_frame(self, notes=False, start=0):
+        import pandas as pd
+
+        n = self._n
+        df = pd.DataFrame(self._values[:, start:n].T, columns=NUMERIC, copy=False)
+        df.insert(0, "Time", pd.Categorical.from_codes(self._times[start:n], self._time_labels))
+        df.insert(0, "Date", self._dates[start:n])
+        if notes:
+            df["Notes"] = [self.notes(i) for i in range(start, n)]
+        df.index = pd.RangeIndex(start, n)
+        return df
+
+    def query(self, start=None, end=None, times=None, sort="Date", descending=True, offset=0, limit=PAGE_ROWS):
+        """One window of the rows matching the filters, in ``sort`` order: (frame, matching row count).
+
+        Only the window's rows become a frame, with Notes clipped to NOTE_CHARS; the index is the row position.
+        """
+        import pandas as pd
+
+        n = self._n
+        keep = np.ones(n, dtype=bool)
+        if start is not None:
+            keep &= self._dates[:n] >= np.datetime64(start, "D")
+        if end is not None:
+            keep &= self._dates[:n] <= np.datetime64(end, "D")
+        if times is not None:
+            keep &= np.isin(self._times[:n], [code for code, label in enumerate(self._time_labels) if label in times])
+        rows = np.flatnonzero(keep)
+        key = self._dates[rows] if sort == "Date" else self._values[NUMERIC.index(sort), rows]
+        order = np.argsort(key, kind="stable")
+        picked = rows[(order[::-1] if descending else order)[offset:offset + limit]]
+
+        df = pd.DataFrame(self._values[:, picked].T, columns=NUMERIC, index=pd.Index(picked, name="row"))
+        df.insert(0, "Time", np.asarray(self._time_labels, dtype=object)[self._times[picked]])
+        df.insert(0, "Date", self._dates[picked].astype(object))
+        df["Notes"] = [clip_note(self.notes(i)) for i in picked]
+        return df, rows.size
+
+    def tail(self, k, notes=False):
+        return self.to_frame(notes=notes, start=max(0, self._n - k))
+
+    def rolling(self, start=0):
+        import pandas as pd
+
+        n = self._n
+        return pd.DataFrame(
+            self._rollups.rolling[:, start:n].T, columns=ROLLING, copy=False,
+            index=pd.Index(self._dates[start:n], name="Date"),
+        )
+
+    def time_of_day_means(self):
+        import pandas as pd
+
+        r = self._rollups
+        labels = [label for code, label in enumerate(self._time_labels) if r.time_n.get(code)]
+        means = [r.time_sum[code] / r.time_n[code] for code in range(len(self._time_labels)) if r.time_n.get(code)]
+        return pd.Series(means, index=pd.Index(labels, name="Time"), name="Mood")
+
+    def calibration(self):
+        return self._rollups.calibration
+
+    def day_range(self, date):
+        day = self._rollups.days.get(np.datetime64(date, "D"))
+        return day[2] - day[1] if day else 0
@@ -0,0 +1,209 @@
+"""Deterministic Kolmogorov-forward solver for the mood jump-diffusion.
+
+Propagates the probability density of
+
+    M' = clip(M + a(M) dt + b(M) sqrt(dt) Z + J)
+
+on a uniform grid over the clip range, where ``a`` is ``mu * (baseline - M)``
+(or a constant ``mu``), ``b`` is ``sigma`` (or ``sigma * (2 - M / 100)``)
+and ``J`` is the sum of the step's normal jumps (Poisson ``jump_rate`` or
+Bernoulli ``jump_prob``, optionally with mixture means). This is the same
+step ``simulate`` samples, so the two agree up to grid error; with
+``substeps > 1`` each step is split further and the result approaches the
+continuous-time SDE.
+
+Each grid node's one-step law is a mixture of normals (diffusion plus
+k jumps), integrated exactly over the grid cells with the tails beyond the
+clip range landing on the end nodes. The resulting transition matrix
+discretizes both the diffusion and the jump integral; stepping it forward
+costs one small matrix product per step whatever the path count.
+
+Collapse is monitored like ``Ensemble.collapse_probability``: after every
+model step, surviving mass below the threshold (pro rata for the cell the
+threshold cuts through) is removed, and
+``P(hit before T) = 1 - surviving mass``.
+"""
+
+import math
+
+import numpy as np
+
+from .simulation import COLLAPSE_THRESHOLD, RISK_LEVEL
+from .trace import traced
+
+N_GRID = 201
+# Poisson jump counts beyond this per (sub)step are folded into the last term
+MAX_JUMPS = 4
+
+
+class Density:
+    """Time-marginal probability mass on ``grid`` (shape (T + 1, n_grid)) and survival mass."""
+
+    def __init__(self, grid, time, mass, survival):
+        self.grid = grid
+        self.time = time
+        self.mass = mass
+        self.survival = survival
+
+    @property
+    def density(self):
+        return self.mass / (self.grid[1] - self.grid[0])
+
+    def collapse_probability(self):
+        return float(1 - self.survival[-1])
+
+    def at_risk(self, level=RISK_LEVEL):
+        return self.collapse_probability() >= level
+
+    def mean(self):
+        return self.mass @ self.grid
+
+    def quantiles(self, q=(0.05, 0.5, 0.95)):
+        cdf = np.cumsum(self.mass, axis=1)
+        cdf /= cdf[:, -1:]
+        return np.array([[np.interp(p, row, self.grid) for row in cdf] for p in np.atleast_1d(q)])
+
+
+def _norm_cdf(x):
+    # Abramowitz & Stegun 7.1.26 (|error| < 1.5e-7); keeps this module NumPy-only
+    z = np.abs(x) / math.sqrt(2)
+    t = 1 / (1 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    half_tail = 0.5 * poly * np.exp(-z * z)
+    return np.where(x >= 0, 1 - half_tail, half_tail)
+
+
+def _jump_terms(jump_rate, jump_prob, jump_mean, jump_std, jump_probs, dt):
+    # [(probability, jump mean, jump variance)] for the step's total jump J
+    if jump_prob is not None:
+        counts = [(1 - jump_prob, 0), (jump_prob, 1)]
+    elif jump_rate > 0:
+        lam = jump_rate * dt
+        counts = [(math.exp(-lam) * lam ** k / math.factorial(k), k) for k in range(MAX_JUMPS + 1)]
+        counts[-1] = (counts[-1][0] + max(0.0, 1 - sum(p for p, _ in counts)), MAX_JUMPS)
+    else:
+        return [(1.0, 0.0, 0.0)]
+
+    means = np.atleast_1d(np.asarray(jump_mean, dtype=float))
+    weights = np.ones(1) if means.size == 1 else np.asarray(jump_probs, dtype=float)
+    terms = []
+    for p_k, k in counts:
+        # k jumps split over the mixture components: multinomial over component counts
+        splits = [()]
+        for _ in range(len(means) - 1):
+            splits = [s + (c,) for s in splits for c in range(k + 1 - sum(s))]
+        for split in splits:
+            split = split + (k - sum(split),)
+            p = p_k * math.factorial(k)
+            for c, w in zip(split, weights):
+                p *= w ** c / math.factorial(c)
+            terms.append((p, float(np.dot(split, means)), k * jump_std ** 2))
+    return terms
+
+
+def transition(grid, drift, vol, dt, terms):
+    """Row-stochastic one-step matrix: P[i, j] = P(M' in cell j | M = grid[i])."""
+    h = grid[1] - grid[0]
+    edges = grid[:-1] + h / 2  # inner cell boundaries
+    P = np.zeros((grid.size, grid.size))
+    for p, jump_mean, jump_var in terms:
+        loc = grid + drift * dt + jump_mean
+        scale = np.sqrt(vol ** 2 * dt + jump_var)
+        cdf = _norm_cdf((edges[None, :] - loc[:, None]) / np.maximum(scale, 1e-12)[:, None])
+        # Cells at both ends absorb the clipped tails
+        cells = np.diff(np.concatenate([np.zeros((grid.size, 1)), cdf, np.ones((grid.size, 1))], axis=1), axis=1)
+        P += p * cells
+    return P / P.sum(axis=1, keepdims=True)
+
+
+def _operator(mu, baseline, sigma, dt, mood_scaled_vol, jump_rate, jump_prob, jump_mean, jump_std,
+              jump_probs, clip, threshold, n_grid, substeps):
+    # Grid, one-step forward matrix (mass' = step @ mass) and per-node survival factor
+    grid = np.linspace(clip[0], clip[1], n_grid)
+    h = grid[1] - grid[0]
+    drift = mu * (baseline - grid) if baseline is not None else np.full(n_grid, float(mu))
+    vol = sigma * (2 - grid / 100) if mood_scaled_vol else np.full(n_grid, float(sigma))
+
+    tau = dt / substeps
+    if jump_prob is not None and substeps > 1:
+        jump_rate, jump_prob = -math.log1p(-min(jump_prob, 1 - 1e-12)) / dt, None
+    terms = _jump_terms(jump_rate, jump_prob, jump_mean, jump_std, jump_probs, tau)
+    step = np.linalg.matrix_power(transition(grid, drift, vol, tau, terms).T, substeps)
+    keep = 1 - np.clip((threshold - grid) / h + 0.5, 0, 1)
+    return grid, step, keep
+
+
+def _point_masses(starts, grid, clip):
+    # Each start as a point mass split between its two nearest nodes, one row per start
+    h = grid[1] - grid[0]
+    x = (np.clip(np.asarray(starts, dtype=float), clip[0], clip[1]) - clip[0]) / h
+    i = np.minimum(x.astype(int), grid.size - 2)
+    p = np.zeros((x.size, grid.size))
+    rows = np.arange(x.size)
+    p[rows, i], p[rows, i + 1] = i + 1 - x, x - i
+    return p
+
+
+def _row_quantiles(mass, grid, q):
+    # Linear interpolation of each row's CDF, like np.interp in Density.quantiles
+    cdf = np.cumsum(mass, axis=1)
+    cdf /= cdf[:, -1:]
+    out = np.empty((len(q), mass.shape[0]))
+    rows = np.arange(mass.shape[0])
+    for k, p in enumerate(q):
+        j = np.clip((cdf < p).sum(axis=1), 1, grid.size - 1)
+        lo, hi = cdf[rows, j - 1], cdf[rows, j]
+        frac = np.clip((p - lo) / np.where(hi > lo, hi - lo, 1), 0, 1)
+        out[k] = np.where(cdf[:, 0] >= p, grid[0], grid[j - 1] + frac * (grid[j] - grid[j - 1]))
+    return out
+
+
+@traced("pde")
+def solve(mood0, T, *, mu=0.0, baseline=None, sigma=1.0, dt=1.0, mood_scaled_vol=False,
+          jump_rate=0.0, jump_prob=None, jump_mean=0.0, jump_std=1.0, jump_probs=None,
+          clip=(0, 100), threshold=COLLAPSE_THRESHOLD, n_grid=N_GRID, substeps=1):
+    """Propagate the mood density for ``T`` steps of ``dt``; arguments mirror ``simulate``.
+
+    With ``substeps > 1`` a per-step ``jump_prob`` is converted to the
+    Poisson rate with the same chance of at least one jump per step.
+    """
+    grid, step, keep = _operator(mu, baseline, sigma, dt, mood_scaled_vol, jump_rate, jump_prob, jump_mean,
+                                 jump_std, jump_probs, clip, threshold, n_grid, substeps)
+    p = _point_masses([mood0], grid, clip)[0]
+
+    mass = np.empty((T + 1, n_grid))
+    survival = np.empty(T + 1)
+    state = np.column_stack([p, p])  # [full marginal, not yet collapsed]
+    state[:, 1] *= keep
+    mass[0], survival[0] = state[:, 0], state[:, 1].sum()
+    for t in range(1, T + 1):
+        state = step @ state
+        state[:, 1] *= keep
+        mass[t], survival[t] = state[:, 0], state[:, 1].sum()
+    return Density(grid, np.arange(T + 1) * dt, mass, np.clip(survival, 0, 1))
+
+
+@traced("pde")
+def solve_starts(starts, T, *, q=(0.05, 0.5, 0.95), mu=0.0, baseline=None, sigma=1.0, dt=1.0,
+                 mood_scaled_vol=False, jump_rate=0.0, jump_prob=None, jump_mean=0.0, jump_std=1.0,
+                 jump_probs=None, clip=(0, 100), threshold=COLLAPSE_THRESHOLD, n_grid=N_GRID, substeps=1):
+    """``solve`` from every mood in ``starts`` at once.
+
+    Returns the collapse probability per start, shape (n_starts,), and the
+    ``q`` quantile bands, shape (len(q), n_starts, T + 1). All starts share
+    one transition matrix, so this costs one (2 n_starts, n_grid) matrix
+    product per step.
+    """
+    grid, step, keep = _operator(mu, baseline, sigma, dt, mood_scaled_vol, jump_rate, jump_prob, jump_mean,
+                                 jump_std, jump_probs, clip, threshold, n_grid, substeps)
+    p = _point_masses(starts, grid, clip)
+    n = p.shape[0]
+    bands = np.empty((len(q), n, T + 1))
+    state = np.vstack([p, p * keep])  # rows: full marginals, then not-yet-collapsed mass
+    bands[:, :, 0] = _row_quantiles(state[:n], grid, q)
+    step_t = np.ascontiguousarray(step.T)
+    for t in range(1, T + 1):
+        state = state @ step_t
+        state[n:] *= keep
+        bands[:, :, t] = _row_quantiles(state[:n], grid, q)
+    return np.clip(1 - state[n:].sum(axis=1), 0, 1), bands
@@ -0,0 +1,171 @@
+"""Scrambled Sobol points and the transforms that turn them into Brownian increments.
+
+NumPy-only. Direction numbers come from primitive polynomials over GF(2),
+found by search, with fixed pseudo-random initial values, so the sequence
+is identical from run to run. ``Sobol`` applies Matousek's random linear
+matrix scramble plus a digital shift per instance; independent instances
+give the replicate estimates a randomized-QMC confidence interval needs.
+"""
+
+import functools
+import math
+
+import numpy as np
+
+BITS = 30
+_SEED = 20240601
+
+
+def _mulmod(a, b, p, degree):
+    # Product of two GF(2) polynomials (as bit masks) modulo p
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        b >>= 1
+        a <<= 1
+        if a >> degree & 1:
+            a ^= p
+    return result
+
+
+def _powmod(e, p, degree):
+    result, base = 1, 2  # the polynomial "x"
+    while e:
+        if e & 1:
+            result = _mulmod(result, base, p, degree)
+        base = _mulmod(base, base, p, degree)
+        e >>= 1
+    return result
+
+
+def _prime_factors(n):
+    factors, f = [], 2
+    while f * f <= n:
+        if n % f == 0:
+            factors.append(f)
+            while n % f == 0:
+                n //= f
+        f += 1
+    return factors + ([n] if n > 1 else [])
+
+
+@functools.lru_cache(maxsize=None)
+def primitive_polynomials(count):
+    """The first ``count`` primitive polynomials over GF(2) of degree >= 1, as bit masks."""
+    found, degree = [], 1
+    while len(found) < count:
+        order = (1 << degree) - 1
+        factors = _prime_factors(order)
+        for p in range((1 << degree) | 1, 1 << (degree + 1), 2):
+            if _powmod(order, p, degree) == 1 and all(_powmod(order // q, p, degree) != 1 for q in factors):
+                found.append(p)
+                if len(found) == count:
+                    break
+        degree += 1
+    return tuple(found)
+
+
+@functools.lru_cache(maxsize=None)
+def direction_numbers(d):
+    """(d, BITS) uint64 direction numbers, MSB-aligned."""
+    V = np.zeros((d, BITS), dtype=np.uint64)
+    V[0] = [1 << (BITS - 1 - k) for k in range(BITS)]
+    rng = np.random.default_rng(_SEED)
+    for j, p in enumerate(primitive_polynomials(d - 1), 1):
+        s = p.bit_length() - 1
+        m = [int(rng.integers(0, 1 << k)) * 2 + 1 for k in range(min(s, BITS))]  # odd, < 2^(k+1)
+        for k in range(s, BITS):
+            new = m[k - s] ^ (m[k - s] << s)
+            for i in range(1, s):
+                if p >> (s - i) & 1:
+                    new ^= m[k - i] << i
+            m.append(new)
+        V[j] = [m[k] << (BITS - 1 - k) for k in range(BITS)]
+    return V
+
+
+class Sobol:
+    """A scrambled Sobol sequence in ``d`` dimensions; ``take(n)`` returns the next n points in (0, 1)."""
+
+    def __init__(self, d, rng=None):
+        rng = np.random.default_rng(rng)
+        self.d = d
+        self.index = 0
+        self.V = direction_numbers(d)
+        # Lower-triangular scramble with unit diagonal: row k is the mask of input bits feeding output bit k
+        lower = np.tril(rng.integers(0, 2, (d, BITS, BITS), dtype=np.uint64), -1) | np.eye(BITS, dtype=np.uint64)
+        weights = np.uint64(1) << np.arange(BITS - 1, -1, -1, dtype=np.uint64)
+        self.rows = (lower * weights).sum(axis=2).astype(np.uint64)  # (d, BITS)
+        self.shift = rng.integers(0, 1 << BITS, d, dtype=np.uint64)
+
+    def take(self, n):
+        idx = np.arange(self.index, self.index + n, dtype=np.uint64)
+        self.index += n
+        x = np.zeros((n, self.d), dtype=np.uint64)
+        for k in range(max(1, int(idx[-1]).bit_length()) if n else 0):
+            bit = ((idx >> np.uint64(k)) & np.uint64(1)).astype(bool)
+            x[bit] ^= self.V[:, k]
+        y = np.zeros_like(x)
+        for k in range(BITS):
+            parity = np.bitwise_count(x & self.rows[:, k]) & 1
+            y |= parity.astype(np.uint64) << np.uint64(BITS - 1 - k)
+        y ^= self.shift
+        return (y.astype(float) + 0.5) / (1 << BITS)
+
+
+def norm_ppf(u):
+    """Inverse standard normal CDF (Acklam's rational approximation, relative error < 1.2e-9)."""
+    a = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+    b = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+    e = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00)
+
+    u = np.asarray(u, dtype=float)
+    out = np.empty_like(u)
+    low, high = u < 0.02425, u > 1 - 0.02425
+    mid = ~(low | high)
+
+    q = u[mid] - 0.5
+    r = q * q
+    out[mid] = (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q / \
+        (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1)
+    for mask, sign, tail in ((low, 1, u[low]), (high, -1, 1 - u[high])):
+        q = np.sqrt(-2 * np.log(tail))
+        out[mask] = sign * (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / \
+            ((((e[0] * q + e[1]) * q + e[2]) * q + e[3]) * q + 1)
+    return out
+
+
+@functools.lru_cache(maxsize=None)
+def _bridge_schedule(T):
+    # (point, left, right, left weight, right weight, std) in the order the normals are consumed
+    schedule, queue = [], [(0, T)]
+    while queue:
+        left, right = queue.pop(0)
+        if right - left < 2:
+            continue
+        mid = (left + right) // 2
+        span = right - left
+        schedule.append((mid, left, right, (right - mid) / span, (mid - left) / span,
+                         math.sqrt((mid - left) * (right - mid) / span)))
+        queue += [(left, mid), (mid, right)]
+    return tuple(schedule)
+
+
+def brownian_bridge(z):
+    """Map (n, T) standard normals to (T, n) unit-variance increments, coarse scales first.
+
+    The first column sets the endpoint W_T and later columns fill in
+    midpoints, so the low (best-distributed) Sobol dimensions drive the
+    path's large-scale shape.
+    """
+    n, T = z.shape
+    W = np.zeros((T + 1, n))
+    W[T] = math.sqrt(T) * z[:, 0]
+    for col, (mid, left, right, wl, wr, sd) in enumerate(_bridge_schedule(T), 1):
+        W[mid] = wl * W[left] + wr * W[right] + sd * z[:, col]
+    return np.diff(W, axis=0)
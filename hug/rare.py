@@ -0,0 +1,189 @@
+"""Rare-event estimates of the collapse probability.
+
+When crossing the threshold is rare (high recovery, few jumps), plain
+Monte Carlo sees almost no collapses. Two estimators keep the relative
+error bounded at a fixed path budget:
+
+* ``method="is"``: importance sampling. Jumps are drawn with a tilted
+  intensity (or per-step probability) and a shifted jump mean, and every
+  path carries its exact likelihood ratio back to the original model. The
+  tilt is fitted by the multi-level cross-entropy method on small pilot
+  runs, which push an intermediate level down towards the threshold. The
+  final run samples from a mixture of every fitted tilt plus a defensive
+  share of the untilted model, so no path's weight can blow up.
+* ``method="splitting"``: adaptive multilevel splitting. Particles are
+  simulated to the horizon; the next level is a quantile of their running
+  minima, the particles that reached it are cloned at their crossing
+  state (mood, volatility, time), and the probability is the product of
+  the stage survival fractions. This suits gradual, diffusion-driven
+  collapses; with fast recovery an intermediate level says little about
+  the next jump, and importance sampling is the better choice.
+
+Both return an ``hug.estimate.Estimate``.
+"""
+
+import math
+
+import numpy as np
+
+from .estimate import Estimate, _t_critical
+from .simulation import COLLAPSE_THRESHOLD, _jumps, arrivals, evolve, jump_sizes
+from .trace import traced
+
+# Plain Monte Carlo risks below this are worth a rare-event rerun
+RARE_BELOW = 0.01
+N_PATHS = 10_000
+PILOT_PATHS = 1_000
+MAX_PILOTS = 10
+# Fraction of pilot paths kept as the cross-entropy elite / splitting survivors
+ELITE = 0.1
+MAX_STAGES = 30
+# Share of importance-sampling paths drawn from the untilted model
+DEFENSIVE = 0.1
+
+_JUMP_ARGS = {"jump_rate": 0.0, "jump_prob": None, "jump_mean": 0.0, "jump_std": 1.0, "jump_probs": None}
+
+
+def _split_model(model):
+    model = dict(model)
+    jumps = {k: model.pop(k, v) for k, v in _JUMP_ARGS.items()}
+    stoch_vol = model.pop("stoch_vol", False)
+    return model, jumps, stoch_vol
+
+
+def tilted_jumps(rng, T, n, dt, jumps, rate, prob, shift):
+    """Jumps drawn with a per-path tilted rate (or probability) and mean shift.
+
+    ``rate``, ``prob`` and ``shift`` broadcast against the n paths. Returns
+    the (T, n) jump array, each path's jump count and the summed amount its
+    jumps exceeded their untilted means by: together with the tilt, the
+    count and excess are all the likelihood ratio needs.
+    """
+    if jumps["jump_prob"] is not None:
+        steps, paths = arrivals(rng, T, n, dt, jump_prob=prob)
+    else:
+        steps, paths = arrivals(rng, T, n, dt, jump_rate=rate * np.ones(n))
+    loc, sizes = jump_sizes(rng, steps.size, jumps["jump_mean"], jumps["jump_std"], jumps["jump_probs"])
+    sizes = sizes + np.broadcast_to(shift, n)[paths]
+    J = np.bincount(steps * n + paths, sizes, minlength=T * n).reshape(T, n)
+    count = np.bincount(paths, minlength=n)
+    excess = np.bincount(paths, weights=sizes - loc, minlength=n)
+    return J, count, excess
+
+
+def log_ratio(tilt, count, excess, T, dt, jumps):
+    """log(tilted / original) density of each path's jumps."""
+    rate, prob, shift = tilt
+    if jumps["jump_prob"] is not None:
+        p = jumps["jump_prob"]
+        log_q = 0.0 if prob == p else count * math.log(prob / p) + (T - count) * math.log((1 - prob) / (1 - p))
+    else:
+        lam = jumps["jump_rate"]
+        log_q = 0.0 if rate == lam else count * math.log(rate / lam) - T * dt * (rate - lam)
+    # Mean shift of normal jump totals: only their count and summed excess matter
+    var = jumps["jump_std"] ** 2
+    return log_q + shift * excess / var - shift ** 2 * count / (2 * var)
+
+
+def _run(rng, mood0, T, n, model, jumps, stoch_vol, tilts, shares):
+    # n paths split over the proposal mixture; weights use the whole mixture (balance heuristic)
+    dt = model.get("dt", 1.0)
+    sizes = np.floor(np.asarray(shares) * n).astype(int)
+    sizes[0] += n - sizes.sum()
+    rate, prob, shift = (np.repeat([t[i] if t[i] is not None else np.nan for t in tilts], sizes) for i in range(3))
+    dW = rng.standard_normal((T, n))
+    dZ = rng.standard_normal((T, n)) if stoch_vol else None
+    J, count, excess = tilted_jumps(rng, T, n, dt, jumps, rate, prob, shift)
+    mood, _ = evolve(mood0, dW, dZ, J, **model)
+    logs = np.array([log_ratio(t, count, excess, T, dt, jumps) for t in tilts])
+    top = logs.max(axis=0)
+    log_w = -(top + np.log(np.asarray(shares) @ np.exp(logs - top)))
+    return mood.min(axis=0), log_w, count, excess
+
+
+def _cross_entropy(rng, mood0, T, threshold, model, jumps, stoch_vol, pilot):
+    # Multi-level CE: refit the tilt on the elite pilots until the level reaches the threshold
+    dt = model.get("dt", 1.0)
+    tilts = [(jumps["jump_rate"], jumps["jump_prob"], 0.0)]
+    for _ in range(MAX_PILOTS):
+        low, log_w, count, excess = _run(rng, mood0, T, pilot, model, jumps, stoch_vol, tilts[-1:], [1.0])
+        level = max(threshold, np.quantile(low, ELITE))
+        elite = low < level if level == threshold else low <= level
+        w = np.exp(log_w[elite] - log_w[elite].max())
+        seen = (w * count[elite]).sum()
+        if seen == 0:
+            break
+        rate, prob, _ = tilts[-1]
+        if jumps["jump_prob"] is not None:
+            prob = float(np.clip(seen / (w.sum() * T), 1e-6, 0.95))
+        else:
+            rate = float(seen / (w.sum() * T * dt))
+        tilts.append((rate, prob, float((w * excess[elite]).sum() / seen)))
+        if level == threshold:
+            break
+    return tilts
+
+
+@traced("rare")
+def collapse_probability(mood0, T, *, threshold=COLLAPSE_THRESHOLD, method="is", n_paths=N_PATHS,
+                         confidence=0.95, rng=None, **model):
+    """Estimate a small P(min mood < threshold) for the ``simulate`` model given in ``model``.
+
+    ``n_paths`` is the budget of the final importance-sampling run, or the
+    particle count per splitting stage.
+    """
+    rng = np.random.default_rng(rng)
+    model, jumps, stoch_vol = _split_model(model)
+    if method == "splitting":
+        return _splitting(rng, mood0, T, threshold, n_paths, confidence, model, jumps, stoch_vol)
+    if method != "is":
+        raise ValueError(f"unknown method {method!r}")
+
+    tilts = [(jumps["jump_rate"], jumps["jump_prob"], 0.0)]
+    if jumps["jump_rate"] > 0 if jumps["jump_prob"] is None else 0 < jumps["jump_prob"] < 1:
+        tilts = _cross_entropy(rng, mood0, T, threshold, model, jumps, stoch_vol, min(PILOT_PATHS, n_paths))
+    # Every CE iterate is a mixture component, so early mild tilts cover what the final one starves;
+    # the untilted model keeps a DEFENSIVE share, which caps every weight at 1 / DEFENSIVE
+    fitted = len(tilts) - 1
+    shares = [1.0] if not fitted else [DEFENSIVE] + [(1 - DEFENSIVE) / fitted] * fitted
+    low, log_w, _, _ = _run(rng, mood0, T, n_paths, model, jumps, stoch_vol, tilts, shares)
+    Y = np.where(low < threshold, np.exp(log_w), 0.0)
+    return Estimate(float(Y.mean()), float(Y.std(ddof=1) / math.sqrt(n_paths)), n_paths, _t_critical(confidence, None))
+
+
+def _splitting(rng, mood0, T, threshold, n, confidence, model, jumps, stoch_vol):
+    dt = model.get("dt", 1.0)
+    sigma = model.get("sigma", 1.0)
+    start_mood = np.full(n, float(mood0))
+    start_vol = np.full(n, float(sigma if model.get("vol0") is None else model["vol0"]))
+    start_t = np.zeros(n, dtype=np.int64)
+    estimate, rel_var = 1.0, 0.0
+
+    for stage in range(MAX_STAGES):
+        # Row r of particle i is time start_t[i] + r; rows past the horizon are ignored
+        steps = T - int(start_t.min())
+        dW = rng.standard_normal((steps, n))
+        dZ = rng.standard_normal((steps, n)) if stoch_vol else None
+        J = _jumps(rng, steps, n, dt, **jumps)
+        mood, vol = evolve(start_mood, dW, dZ, J, **dict(model, vol0=start_vol))
+        mood[np.arange(steps + 1)[:, None] > (T - start_t)[None, :]] = np.inf
+        running = mood.min(axis=0)
+
+        level = max(threshold, np.quantile(running, ELITE))
+        final = level == threshold or stage == MAX_STAGES - 1
+        reached = running < threshold if final else running <= level
+        p = float(reached.mean())
+        estimate *= p
+        if p == 0:
+            break
+        rel_var += (1 - p) / (p * n)
+        if final:
+            break
+
+        # Clone the particles that reached the level at their first crossing
+        first = np.argmax(mood <= level, axis=0)
+        pick = rng.choice(np.nonzero(reached)[0], n)
+        start_mood = mood[first[pick], pick]
+        start_vol = vol[first[pick], pick]
+        start_t = start_t[pick] + first[pick]
+    return Estimate(estimate, estimate * math.sqrt(rel_var), n, _t_critical(confidence, None))
@@ -0,0 +1,42 @@
+"""Explicit, independent random streams.
+
+Nothing in ``hug`` draws from NumPy's global RNG; every simulation takes a
+``np.random.Generator``. Streams are derived through ``SeedSequence`` spawn
+keys, so a stream is a pure function of (seed, key), the same on any
+thread, process or worker count:
+
+* ``stream(*key)`` for batch tasks and table cells;
+* ``session_rng(name)`` for Streamlit pages: one entropy per browser
+  session (pinned with ``?seed=N``), one child stream per named draw, so a
+  rerun redraws the same noise and sessions never share generator state;
+* ``simulate`` gives each ``CHUNK_PATHS`` block of a large ensemble its own
+  spawned child stream, so threaded runs match serial ones bit for bit.
+"""
+
+import os
+import zlib
+
+import numpy as np
+
+SEED = int(os.environ.get("HUG_SEED", "0"))
+
+
+def _word(key):
+    return zlib.crc32(key.encode()) if isinstance(key, str) else int(key)
+
+
+def stream(*key, seed=SEED):
+    """The generator for spawn key ``key`` (ints or strings) under ``seed``."""
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed, spawn_key=tuple(map(_word, key)))))
+
+
+def session_rng(name):
+    """This browser session's stream for the draw called ``name``."""
+    import streamlit as st
+
+    entropy = st.session_state.get("_rng_entropy")
+    if entropy is None:
+        pinned = st.query_params.get("seed", "")
+        entropy = int(pinned) if pinned.isdigit() else np.random.SeedSequence().entropy
+        st.session_state["_rng_entropy"] = entropy
+    return stream(name, seed=entropy)
@@ -0,0 +1,62 @@
+"""What a simulator run or a support-chat message resolves to, outside any page.
+
+The Streamlit apps and the JSON API (``hug.api``) both call these, so they
+share one code path and one result cache. A simulator summary is a table
+lookup when ``python -m hug.table`` has built one, else a cached fixed-seed
+simulation with a refined risk.
+"""
+
+from .cache import cache
+from .i18n import t
+from .pde import solve
+from .rare import RARE_BELOW, collapse_probability
+from .simulation import COLLAPSE_THRESHOLD, crisis_params, personal_params, simulate
+from .table import T, load as load_table
+from .triage import ANXIETY, CRISIS, SADNESS, triage
+
+REPLY_KEYS = {CRISIS: "reply_crisis", ANXIETY: "reply_anxiety", SADNESS: "reply_sadness"}
+
+
+@cache.memoize("crisis_sim:rare")
+def run_crisis(mood0, T, **params):
+    # A fixed seed, not a session stream: the cache shares this result across sessions
+    ens = simulate(mood0, T, rng=42, **params)
+    sim = ens.summary(COLLAPSE_THRESHOLD)
+    if params.get("stoch_vol") and sim["risk"] < RARE_BELOW:
+        # Too few collapses in the ensemble to tell 0.5% from 0.005%: re-estimate with tilted jumps
+        sim["risk"] = collapse_probability(mood0, T, threshold=COLLAPSE_THRESHOLD, rng=42, **params).value
+    elif not params.get("stoch_vol"):
+        # Noise-free risk from the density solver (it has no volatility state, so only here)
+        sim["risk"] = solve(mood0, T, threshold=COLLAPSE_THRESHOLD, **params).collapse_probability()
+    return sim
+
+
+@cache.memoize("personal_sim:pde")
+def run_personal(mood0, T, **params):
+    ens = simulate(mood0, T, rng=42, **params)
+    sim = ens.summary(COLLAPSE_THRESHOLD)
+    # Noise-free risk from the density solver; the paths are only drawn
+    sim["risk"] = solve(mood0, T, threshold=COLLAPSE_THRESHOLD, **params).collapse_probability()
+    return sim
+
+
+def crisis_summary(recovery, instability, impact, jumpiness, bullying, mood0, stoch_vol=False):
+    """``Ensemble.summary`` of the crisis simulator for its sliders, bullying answer and starting mood."""
+    table = load_table("crisis")
+    if table:
+        return table.lookup(recovery, instability, impact, jumpiness, bullying, mood0, stoch_vol)
+    return run_crisis(mood0, T, **crisis_params(recovery, instability, impact, jumpiness, bullying, stoch_vol=stoch_vol))
+
+
+def personal_summary(recovery, instability, impact, jumpiness, bullying, mood0):
+    """``Ensemble.summary`` of the personal simulator."""
+    table = load_table("personal")
+    if table:
+        return table.lookup(recovery, instability, impact, jumpiness, bullying, mood0)
+    return run_personal(mood0, T, **personal_params(recovery, instability, impact, jumpiness, bullying))
+
+
+def support_reply(text, lang):
+    """(triage tier or None, the chat's reply in ``lang``) for a support-chat message."""
+    tier = triage(text)
+    return tier, t(REPLY_KEYS.get(tier, "reply_ok"), lang)
@@ -0,0 +1,241 @@
+"""Vectorized jump-diffusion engine shared by the HUG mood simulators.
+
+All paths of an ensemble are advanced together: every random draw for the
+whole horizon is made up front as a (T, n_paths) array and the time loop
+only does array arithmetic.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .trace import traced
+
+N_PATHS = 2000
+# Ensembles larger than this run in blocks, each on its own spawned stream
+CHUNK_PATHS = 4096
+BASELINE = 60
+COLLAPSE_THRESHOLD = 30
+# Share of paths that must cross the threshold before we flag risk
+RISK_LEVEL = 0.1
+# Extra shock rate / probability per step for the bullying question on the simulator pages
+STRESS = {"No": 0.0, "Maybe": 0.05, "Yes": 0.1}
+
+
+class Ensemble:
+    """Simulated mood / volatility paths, shape (n_paths, T + 1)."""
+
+    def __init__(self, mood, vol, dt=1.0):
+        self.mood = mood
+        self.vol = vol
+        self.dt = dt
+
+    @property
+    def n_paths(self):
+        return self.mood.shape[0]
+
+    @property
+    def time(self):
+        return np.arange(self.mood.shape[1]) * self.dt
+
+    def collapse_probability(self, threshold=COLLAPSE_THRESHOLD):
+        return float((self.mood.min(axis=1) < threshold).mean())
+
+    def at_risk(self, threshold=COLLAPSE_THRESHOLD, level=RISK_LEVEL):
+        return self.collapse_probability(threshold) >= level
+
+    def quantiles(self, q=(0.05, 0.5, 0.95)):
+        return np.quantile(self.mood, q, axis=0)
+
+    def summary(self, threshold=COLLAPSE_THRESHOLD):
+        # Everything the pages plot and report, small enough to cache
+        low, median, high = self.quantiles()
+        return {
+            "time": self.time, "low": low, "median": median, "high": high,
+            "sample": self.mood[0].copy(), "vol": np.median(self.vol, axis=0),
+            "risk": self.collapse_probability(threshold), "n_paths": self.n_paths,
+        }
+
+
+def arrivals(rng, T, n_paths, dt, jump_rate=0.0, jump_prob=None):
+    """(step, path) index arrays of every jump in ``T`` steps, one entry per jump.
+
+    Arrivals are walked gap by gap, exponential in time for a Poisson
+    ``jump_rate`` and geometric in steps for a per-step ``jump_prob``, so
+    the draws scale with the number of jumps rather than ``T * n_paths``.
+    Binned into steps this is the same law as per-step Poisson or
+    Bernoulli counts. Either argument may be an array with one value per
+    path.
+    """
+    poisson = jump_prob is None
+    value = np.broadcast_to(np.asarray(jump_rate if poisson else jump_prob, dtype=float), (n_paths,))
+    alive = np.nonzero(value > 0)[0]
+    value = value[alive]
+    clock = np.zeros(alive.size)  # time for a rate, steps taken for a probability
+    steps, paths = [np.zeros(0, dtype=np.int64)], [alive[:0]]
+    while alive.size:
+        if poisson:
+            clock += rng.exponential(1 / value)
+            step = (clock // dt).astype(np.int64)
+        else:
+            clock += rng.geometric(value)
+            step = clock.astype(np.int64) - 1
+        inside = step < T
+        steps.append(step[inside])
+        paths.append(alive[inside])
+        alive, clock, value = alive[inside], clock[inside], value[inside]
+    return np.concatenate(steps), np.concatenate(paths)
+
+
+def jump_sizes(rng, n, jump_mean, jump_std, jump_probs):
+    # One normal draw per jump; a list of means is a mixture picked with jump_probs
+    means = np.atleast_1d(np.asarray(jump_mean, dtype=float))
+    if means.size > 1:
+        pick = np.minimum(np.searchsorted(np.cumsum(jump_probs), rng.random(n), side="right"), means.size - 1)
+        loc = means[pick]
+    else:
+        loc = means[0]
+    return loc, rng.normal(loc, jump_std, n)
+
+
+def _jumps(rng, T, n_paths, dt, jump_rate, jump_prob, jump_mean, jump_std, jump_probs):
+    # (T, n_paths) jump totals per step, drawn only where jumps arrive
+    steps, paths = arrivals(rng, T, n_paths, dt, jump_rate, jump_prob)
+    _, sizes = jump_sizes(rng, steps.size, jump_mean, jump_std, jump_probs)
+    return np.bincount(steps * n_paths + paths, sizes, minlength=T * n_paths).reshape(T, n_paths)
+
+
+@traced("simulate")
+def simulate(mood0, T, n_paths=N_PATHS, *, mu=0.0, baseline=None, sigma=1.0, dt=1.0,
+             stoch_vol=False, kappa=1.0, theta=None, eta=0.3, vol0=None, vol_floor=0.1,
+             mood_scaled_vol=False, jump_rate=0.0, jump_prob=None, jump_mean=0.0,
+             jump_std=1.0, jump_probs=None, clip=(0, 100), rng=None, workers=1):
+    """Simulate ``n_paths`` mood trajectories of ``T`` steps.
+
+    Drift is ``mu * (baseline - M)`` when ``baseline`` is set (mean
+    reversion) and a constant ``mu`` otherwise. With ``stoch_vol`` the
+    volatility follows the Heston-like update
+    ``vol = max(vol + kappa * (theta - vol) dt + eta dZ, vol_floor)``;
+    ``mood_scaled_vol`` instead scales ``sigma`` up as mood falls. Jumps
+    arrive at ``jump_rate`` (Poisson) or with per-step ``jump_prob``
+    (Bernoulli); ``jump_mean`` may be a list of means drawn with
+    ``jump_probs``. ``rng`` is a seed or ``np.random.Generator``.
+
+    ``mood0`` and ``vol0`` may also hold one value per path. Above
+    ``CHUNK_PATHS`` paths, each block draws from a child stream spawned off
+    ``rng``; ``workers`` threads run the blocks, and the result does not
+    depend on how many.
+    """
+    rng = np.random.default_rng(rng)
+    model = dict(
+        mu=mu, baseline=baseline, sigma=sigma, dt=dt, kappa=kappa, theta=theta, eta=eta, vol_floor=vol_floor,
+        mood_scaled_vol=mood_scaled_vol, clip=clip,
+    )
+    jumps = (jump_rate, jump_prob, jump_mean, jump_std, jump_probs)
+    if n_paths <= CHUNK_PATHS:
+        mood, vol_path = _run(rng, mood0, vol0, T, n_paths, stoch_vol, jumps, model)
+        return Ensemble(mood.T, vol_path.T, dt)
+
+    mood0 = np.broadcast_to(np.asarray(mood0, dtype=float), (n_paths,))
+    vol0 = None if vol0 is None else np.broadcast_to(np.asarray(vol0, dtype=float), (n_paths,))
+    starts = range(0, n_paths, CHUNK_PATHS)
+    streams = rng.spawn(len(starts))
+
+    def block(start, stream):
+        end = min(start + CHUNK_PATHS, n_paths)
+        vols = None if vol0 is None else vol0[start:end]
+        return _run(stream, mood0[start:end], vols, T, end - start, stoch_vol, jumps, model)
+
+    if workers > 1:
+        with ThreadPoolExecutor(workers) as pool:
+            blocks = list(pool.map(block, starts, streams))
+    else:
+        blocks = list(map(block, starts, streams))
+    mood = np.concatenate([m for m, _ in blocks], axis=1)
+    vol_path = np.concatenate([v for _, v in blocks], axis=1)
+    return Ensemble(mood.T, vol_path.T, dt)
+
+
+def _run(rng, mood0, vol0, T, n_paths, stoch_vol, jumps, model):
+    dW = rng.standard_normal((T, n_paths))
+    dZ = rng.standard_normal((T, n_paths)) if stoch_vol else None
+    J = _jumps(rng, T, n_paths, model["dt"], *jumps)
+    return evolve(mood0, dW, dZ, J, vol0=vol0, **model)
+
+
+def evolve(mood0, dW, dZ, J, *, mu=0.0, baseline=None, sigma=1.0, dt=1.0, kappa=1.0, theta=None,
+           eta=0.3, vol0=None, vol_floor=0.1, mood_scaled_vol=False, clip=(0, 100)):
+    """Run the time loop of ``simulate`` on given (T, n_paths) noise; ``dZ`` is None without stochastic volatility.
+
+    Returns mood and volatility arrays of shape (T + 1, n_paths).
+    """
+    T, n_paths = dW.shape
+    stoch_vol = dZ is not None
+    theta = sigma if theta is None else theta
+    sq_dt = np.sqrt(dt)
+
+    mood = np.empty((T + 1, n_paths))
+    vol_path = np.empty((T + 1, n_paths))
+    M = np.full(n_paths, mood0, dtype=float)
+    vol = np.full(n_paths, sigma if vol0 is None else vol0, dtype=float)
+    mood[0] = M
+    vol_path[0] = vol
+
+    for t in range(T):
+        if stoch_vol:
+            vol = np.maximum(vol + kappa * (theta - vol) * dt + eta * sq_dt * dZ[t], vol_floor)
+        elif mood_scaled_vol:
+            vol = sigma * (2 - M / 100)
+
+        drift = mu * (baseline - M) if baseline is not None else mu
+        M = M + drift * dt + vol * sq_dt * dW[t] + J[t]
+        if clip is not None:
+            np.clip(M, clip[0], clip[1], out=M)
+
+        mood[t + 1] = M
+        vol_path[t + 1] = vol
+
+    return mood, vol_path
+
+
+def entry_params(entry, stoch_vol=True):
+    """``simulate`` arguments the Mood Simulation page derives from a user's last log entry."""
+    return {
+        "mood0": entry["Mood"] * 10,
+        "T": 50,
+        "mu": 0.1,
+        "baseline": BASELINE,
+        "sigma": 1 + (entry["Impulsivity"] + entry["Irritability"]) / 10,
+        "stoch_vol": stoch_vol,
+        "kappa": 0.3,
+        "eta": 0.2,
+        "jump_rate": 0.1,
+        "jump_mean": -5 if entry["Mood"] < 4 else 3,
+        "jump_std": 2,
+    }
+
+
+def crisis_params(recovery, instability, impact, jumpiness, bullying, stoch_vol=False):
+    """``simulate`` arguments the crisis simulator derives from its 0-10 sliders and bullying answer."""
+    params = {
+        "mu": recovery / 10,
+        "baseline": BASELINE,
+        "sigma": 1 + instability * 0.9,
+        "jump_rate": 0.01 + jumpiness / 100 + STRESS[bullying],
+        "jump_mean": -3 * impact,
+        "jump_std": 5,
+    }
+    if stoch_vol:
+        return {**params, "stoch_vol": True, "kappa": 1.5, "eta": 0.3}
+    return {**params, "mood_scaled_vol": True}
+
+
+def personal_params(recovery, instability, impact, jumpiness, bullying):
+    """``simulate`` arguments of the personal simulator: constant drift and Bernoulli shocks."""
+    return {
+        "mu": recovery / 10,
+        "sigma": 1 + instability * 0.9,
+        "jump_prob": 0.01 + jumpiness / 100 + STRESS[bullying],
+        "jump_mean": -3 * impact,
+        "jump_std": 5,
+    }
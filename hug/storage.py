@@ -0,0 +1,657 @@
+"""Storage backends for per-user mood logs.
+
+CsvMoodStore: append-only, crash-safe CSV files, one per user.
+
+``mood_log_<id>.csv`` keeps the same header as before, but it is only ever
+appended to: a new entry is one CSV record, and "delete last entry" is a
+tombstone record. When enough dead records pile up the file is compacted
+into a temp file and atomically renamed over the original. A torn record
+left by a crash mid-append is dropped (and truncated away) on load.
+
+SqliteMoodStore: one WAL-mode SQLite database for all users, indexed on
+(user_id, Date, Time) so pages can fetch just the rows they show.
+Mood Report rollups are kept up to date on every write: each row carries
+its 3-entry rolling means, and ``mood_daily`` / ``mood_time_of_day`` hold
+per-day and per-time-of-day sums, so the report reads a window of small
+rows instead of aggregating the whole history; ``trend`` charts long
+ranges from the daily rollups (grouped into weeks or months as needed),
+so a chart reads and sends a bounded number of points. ``mood_calibration`` holds
+each user's jump-diffusion sufficient statistics (``hug.calibrate``),
+updated per entry; users logged before it existed are backfilled once, on
+first use. Letters to Self and Reality Anchors live in ``journal``, paged
+by id cursor with the note text fetched only when shown (``hug.journal``).
+Existing CSVs are imported with ``python -m hug.storage import [DIR]``;
+``csv_imported`` records each imported user, so a log is imported once.
+"""
+
+import csv
+import datetime
+import glob
+import io
+import os
+import sqlite3
+import sys
+import threading
+
+import numpy as np
+
+from .calibrate import STATS, Calibration
+from .downsample import LEVELS, MAX_POINTS, OVERSAMPLE, downsample
+from .journal import PAGE_SIZE, Note, preview
+from .moodlog import NOTE_CHARS, NUMERIC, PAGE_ROWS, ROLLING, SORTABLE, TIMES, WINDOW, MoodLog
+
+FIELDS = ["Date", "Time", "Mood", "Energy", "Sleep", "Irritability", "Confidence", "Impulsivity", "Notes"]
+TOMBSTONE = "#deleted"
+# Compact once dead records outnumber this and half the live ones
+COMPACT_MIN_DEAD = 32
+
+
+def _encode(row):
+    buf = io.StringIO()
+    csv.writer(buf).writerow(row)
+    return buf.getvalue().encode("utf-8")
+
+
+def _number(value):
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def _parse(record):
+    entry = dict(record)
+    if entry.get("Date"):
+        entry["Date"] = datetime.date.fromisoformat(entry["Date"][:10])
+    for col in NUMERIC:
+        if entry.get(col) not in (None, ""):
+            entry[col] = _number(entry[col])
+        elif col in entry:
+            entry[col] = None  # a blank CSV field is a missing value, stored as NULL
+    if "Notes" in entry and entry["Notes"] is None:
+        entry["Notes"] = ""
+    return entry
+
+
+def _fsync_dir(path):
+    if os.name != "posix":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class CsvMoodStore:
+    def __init__(self, path):
+        self.path = path
+        self.header = list(FIELDS)
+        self.live = 0
+        self.dead = 0
+
+    def _scan(self):
+        # Replay the file and return (entries, end offset of the last intact record)
+        if not os.path.exists(self.path):
+            return [], 0
+        with open(self.path, "rb") as f:
+            data = f.read()
+
+        lines = data.splitlines(keepends=True)
+        pos = [0]
+
+        def feed():
+            for line in lines:
+                pos[0] += len(line)
+                yield line.decode("utf-8")
+
+        reader = csv.reader(feed(), strict=True)
+        entries, good_end, header = [], 0, None
+        dead = 0
+        try:
+            for row in reader:
+                if pos[0] == len(data) and not data.endswith(b"\n"):
+                    break  # torn final record
+                if header is None:
+                    header = row
+                elif row and row[0] == TOMBSTONE:
+                    dead += 1
+                    if entries:
+                        entries.pop()
+                        dead += 1
+                elif len(row) == len(header):
+                    entries.append(_parse(zip(header, row)))
+                good_end = pos[0]
+        except csv.Error:
+            pass  # unterminated quoted field from a torn write
+
+        self.header = header or list(FIELDS)
+        self.live = len(entries)
+        self.dead = dead
+        return entries, good_end
+
+    def load(self):
+        entries, good_end = self._scan()
+        if os.path.exists(self.path) and good_end < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(good_end)
+                os.fsync(f.fileno())
+        self.maybe_compact()
+        return entries
+
+    def entries(self):
+        # Read-only: unlike load(), never truncates or compacts the file
+        return self._scan()[0]
+
+    def last(self):
+        entries = self.entries()
+        return entries[-1] if entries else None
+
+    def _append(self, row):
+        new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        data = (_encode(self.header) if new else b"") + _encode(row)
+        with open(self.path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _row(self, entry):
+        return ["" if entry.get(col) is None else str(entry[col]) for col in self.header]
+
+    def append(self, entry):
+        self._append(self._row(entry))
+        self.live += 1
+
+    def delete_last(self):
+        if self.live == 0:
+            return
+        self._append([TOMBSTONE])
+        self.live -= 1
+        self.dead += 2
+        self.maybe_compact()
+
+    def maybe_compact(self):
+        if self.dead >= COMPACT_MIN_DEAD and self.dead > self.live // 2:
+            self.compact()
+
+    def compact(self):
+        entries, _ = self._scan()
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_encode(self.header))
+            for entry in entries:
+                f.write(_encode(self._row(entry)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        _fsync_dir(self.path)
+        self.live = len(entries)
+        self.dead = 0
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mood_log (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    Date TEXT NOT NULL,
+    Time TEXT,
+    Mood INTEGER,
+    Energy INTEGER,
+    Sleep INTEGER,
+    Irritability INTEGER,
+    Confidence INTEGER,
+    Impulsivity INTEGER,
+    Notes TEXT
+);
+CREATE INDEX IF NOT EXISTS mood_log_user_date ON mood_log (user_id, Date, Time);
+CREATE INDEX IF NOT EXISTS mood_log_user_id ON mood_log (user_id, id);
+"""
+
+# Schema migrations, applied in order and tracked with PRAGMA user_version
+MIGRATIONS = [
+    f"""
+    {"".join(f"ALTER TABLE mood_log ADD COLUMN {col}_roll REAL;" for col in ROLLING)}
+    CREATE TABLE IF NOT EXISTS mood_daily (
+        user_id TEXT NOT NULL,
+        Date TEXT NOT NULL,
+        n INTEGER NOT NULL,
+        {"".join(f"{col}_sum INTEGER NOT NULL, " for col in ROLLING)}
+        Mood_min INTEGER NOT NULL,
+        Mood_max INTEGER NOT NULL,
+        PRIMARY KEY (user_id, Date)
+    );
+    CREATE TABLE IF NOT EXISTS mood_time_of_day (
+        user_id TEXT NOT NULL,
+        Time TEXT NOT NULL,
+        n INTEGER NOT NULL,
+        Mood_sum INTEGER NOT NULL,
+        PRIMARY KEY (user_id, Time)
+    );
+    UPDATE mood_log SET {", ".join(f"{col}_roll = r.{col}" for col in ROLLING)}
+    FROM (
+        SELECT id, {", ".join(f"CASE WHEN COUNT(*) OVER w = {WINDOW} THEN AVG(IFNULL({col}, 0)) OVER w END AS {col}" for col in ROLLING)}
+        FROM mood_log WINDOW w AS (PARTITION BY user_id ORDER BY id ROWS {WINDOW - 1} PRECEDING)
+    ) AS r
+    WHERE mood_log.id = r.id;
+    INSERT INTO mood_daily
+    SELECT user_id, substr(Date, 1, 10), COUNT(*), {"".join(f"SUM(IFNULL({col}, 0)), " for col in ROLLING)}
+           MIN(IFNULL(Mood, 0)), MAX(IFNULL(Mood, 0))
+    FROM mood_log GROUP BY user_id, substr(Date, 1, 10);
+    INSERT INTO mood_time_of_day
+    SELECT user_id, Time, COUNT(*), SUM(IFNULL(Mood, 0)) FROM mood_log WHERE Time IS NOT NULL GROUP BY user_id, Time;
+    """,
+    f"""
+    ALTER TABLE mood_log ADD COLUMN Mood_jump REAL;
+    CREATE TABLE IF NOT EXISTS mood_calibration (
+        user_id TEXT PRIMARY KEY,
+        {", ".join(f"{stat} REAL NOT NULL" for stat in STATS)}
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS journal (
+        id INTEGER PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        created TEXT NOT NULL,
+        preview TEXT NOT NULL,
+        body TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS journal_user_kind ON journal (user_id, kind, id);
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS csv_imported (
+        user_id TEXT PRIMARY KEY,
+        source TEXT NOT NULL,
+        entries INTEGER NOT NULL,
+        imported TEXT NOT NULL
+    );
+    INSERT OR IGNORE INTO csv_imported SELECT DISTINCT user_id, '', 0, datetime('now') FROM mood_log;
+    """,
+]
+
+# Fold a user's rows matching {where} into the per-day / per-time-of-day rollups
+_DAILY_UPSERT = """
+INSERT INTO mood_daily
+SELECT user_id, substr(Date, 1, 10), COUNT(*), {sums}
+       MIN(IFNULL(Mood, 0)), MAX(IFNULL(Mood, 0))
+FROM mood_log WHERE user_id = ? AND {where} GROUP BY substr(Date, 1, 10)
+ON CONFLICT (user_id, Date) DO UPDATE SET
+    n = n + excluded.n, {adds}
+    Mood_min = MIN(Mood_min, excluded.Mood_min), Mood_max = MAX(Mood_max, excluded.Mood_max)
+"""
+_TIME_OF_DAY_UPSERT = """
+INSERT INTO mood_time_of_day
+SELECT user_id, Time, COUNT(*), SUM(IFNULL(Mood, 0))
+FROM mood_log WHERE user_id = ? AND {where} AND Time IS NOT NULL GROUP BY Time
+ON CONFLICT (user_id, Time) DO UPDATE SET n = n + excluded.n, Mood_sum = Mood_sum + excluded.Mood_sum
+"""
+
+
+def _statements(script):
+    # executescript() commits first, so scripts run inside a transaction go statement by statement
+    statement = ""
+    for part in script.split(";"):
+        statement += part + ";"
+        if sqlite3.complete_statement(statement):
+            if statement.strip(" \n;"):
+                yield statement
+            statement = ""
+
+
+def _upsert(template, where):
+    return template.format(
+        where=where,
+        sums="".join(f"SUM(IFNULL({col}, 0)), " for col in ROLLING),
+        adds="".join(f"{col}_sum = {col}_sum + excluded.{col}_sum, " for col in ROLLING),
+    )
+
+
+class SqliteMoodStore:
+    def __init__(self, path="hug.db"):
+        self.path = path
+        self._local = threading.local()
+        self._migrate()
+
+    def _migrate(self):
+        # Version check and migrations in one write-locked transaction, so two processes
+        # starting together can't both read the same user_version and both migrate
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for statement in _statements(SCHEMA):
+                    conn.execute(statement)
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                for script in MIGRATIONS[version:]:
+                    for statement in _statements(script):
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {max(version, len(MIGRATIONS))}")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def _conn(self):
+        # Streamlit serves sessions from several threads; give each its own connection
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _select(self, sql, params, columns=None):
+        cols = ", ".join(columns or FIELDS)
+        rows = self._conn().execute(sql.format(cols=cols), params).fetchall()
+        return [_parse(zip(row.keys(), row)) for row in rows]
+
+    def count(self, user_id):
+        return self._conn().execute("SELECT COUNT(*) FROM mood_log WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+    def load(self, user_id, columns=None):
+        return self._select("SELECT {cols} FROM mood_log WHERE user_id = ? ORDER BY id", (user_id,), columns)
+
+    def tail(self, user_id, n, columns=None):
+        rows = self._select("SELECT {cols} FROM mood_log WHERE user_id = ? ORDER BY id DESC LIMIT ?", (user_id, n), columns)
+        return rows[::-1]
+
+    def last(self, user_id, columns=None):
+        rows = self.tail(user_id, 1, columns)
+        return rows[0] if rows else None
+
+    def latest(self, columns=None):
+        # Every user's last entry in one indexed pass: {user_id: entry}
+        cols = ", ".join(columns or FIELDS)
+        rows = self._conn().execute(
+            f"SELECT user_id, {cols} FROM mood_log WHERE id IN (SELECT MAX(id) FROM mood_log GROUP BY user_id) ORDER BY user_id"
+        ).fetchall()
+        return {row["user_id"]: _parse((k, row[k]) for k in row.keys()[1:]) for row in rows}
+
+    def window(self, user_id, start, end=None, columns=None):
+        end = end or datetime.date.max
+        return self._select(
+            "SELECT {cols} FROM mood_log WHERE user_id = ? AND Date BETWEEN ? AND ? ORDER BY Date, id",
+            (user_id, str(start), str(end)), columns,
+        )
+
+    def columns(self, user_id, start=None, end=None):
+        # Numeric history straight into a MoodLog, skipping per-row dicts;
+        # notes are fetched by row id only when asked for
+        cur = self._conn().cursor()
+        cur.row_factory = None
+        rows = cur.execute(
+            f"SELECT id, Date, Time, {', '.join(f'IFNULL({c}, 0)' for c in NUMERIC)} FROM mood_log "
+            "WHERE user_id = ? AND Date BETWEEN ? AND ? ORDER BY Date, id",
+            (user_id, str(start or datetime.date.min), str(end or datetime.date.max)),
+        ).fetchall()
+        ids = [row[0] for row in rows]
+        return MoodLog.from_columns(
+            [row[1][:10] for row in rows], [row[2] for row in rows],
+            np.array([row[3:] for row in rows], dtype=np.int16).reshape(-1, len(NUMERIC)),
+            notes_loader=lambda i: self.note(ids[i]),
+        )
+
+    def query(self, user_id, start=None, end=None, times=None, sort="Date", descending=True, offset=0, limit=PAGE_ROWS):
+        """``MoodLog.query`` in SQL: only the window's rows are read, with Notes clipped; the index is the row id."""
+        import pandas as pd
+
+        if sort not in SORTABLE:
+            raise ValueError(f"can't sort by {sort!r}")
+        where = "user_id = ? AND Date BETWEEN ? AND ?"
+        params = [user_id, str(start or datetime.date.min), str(end or datetime.date.max)]
+        if times is not None:
+            where += f" AND Time IN ({', '.join('?' * len(times))})"
+            params += list(times)
+        direction = "DESC" if descending else "ASC"
+        total = self._conn().execute(f"SELECT COUNT(*) FROM mood_log WHERE {where}", params).fetchone()[0]
+        cur = self._conn().cursor()
+        cur.row_factory = None
+        rows = cur.execute(
+            f"SELECT id, substr(Date, 1, 10), Time, {', '.join(NUMERIC)}, "
+            f"CASE WHEN length(Notes) > {NOTE_CHARS} THEN substr(Notes, 1, {NOTE_CHARS - 1}) || '…' ELSE IFNULL(Notes, '') END "
+            f"FROM mood_log WHERE {where} ORDER BY {sort} {direction}, id {direction} LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        ).fetchall()
+        df = pd.DataFrame([row[1:] for row in rows], columns=["Date", "Time"] + NUMERIC + ["Notes"],
+                          index=pd.Index([row[0] for row in rows], name="row"))
+        df["Date"] = pd.to_datetime(df["Date"]).dt.date
+        return df, total
+
+    def rolling_frame(self, user_id, start=None, end=None):
+        import pandas as pd
+
+        rows = self._conn().execute(
+            f"SELECT substr(Date, 1, 10), {', '.join(f'{col}_roll' for col in ROLLING)} FROM mood_log "
+            "WHERE user_id = ? AND Date BETWEEN ? AND ? ORDER BY Date, id",
+            (user_id, str(start or datetime.date.min), str(end or datetime.date.max)),
+        ).fetchall()
+        return pd.DataFrame(
+            [tuple(row)[1:] for row in rows], columns=ROLLING, dtype=float,
+            index=pd.Index([row[0] for row in rows], name="Date"),
+        )
+
+    def trend(self, user_id, start=None, end=None, max_points=MAX_POINTS):
+        """Chart series of the ROLLING columns over a date range, at most ``max_points`` rows: (frame, level).
+
+        Per-entry rolling means when the range is short enough, else per-day,
+        per-week or per-month means from ``mood_daily``, whichever is the
+        finest within ``OVERSAMPLE * max_points`` points; then LTTB-thinned.
+        """
+        import pandas as pd
+
+        span = (user_id, str(start or datetime.date.min), str(end or datetime.date.max))
+        budget = OVERSAMPLE * max_points
+        level = LEVELS[0]
+        if self._conn().execute("SELECT COUNT(*) FROM mood_log WHERE user_id = ? AND Date BETWEEN ? AND ?", span).fetchone()[0] <= budget:
+            frame = self.rolling_frame(user_id, start, end)
+        else:
+            # Bucket keys: the day, its Monday, or the first of its month
+            buckets = {
+                "day": "Date",
+                "week": "date(Date, '-' || ((strftime('%w', Date) + 6) % 7) || ' days')",
+                "month": "substr(Date, 1, 7) || '-01'",
+            }
+            for level, bucket in buckets.items():
+                n = self._conn().execute(
+                    f"SELECT COUNT(DISTINCT {bucket}) FROM mood_daily WHERE user_id = ? AND Date BETWEEN ? AND ?", span
+                ).fetchone()[0]
+                if n <= budget:
+                    break
+            rows = self._conn().execute(
+                f"SELECT {bucket} AS bucket, {', '.join(f'1.0 * SUM({col}_sum) / SUM(n)' for col in ROLLING)} FROM mood_daily "
+                "WHERE user_id = ? AND Date BETWEEN ? AND ? GROUP BY bucket ORDER BY bucket",
+                span,
+            ).fetchall()
+            frame = pd.DataFrame([tuple(row)[1:] for row in rows], columns=ROLLING, dtype=float,
+                                 index=pd.Index([row[0] for row in rows], name="Date"))
+        frame.index = pd.to_datetime(frame.index)
+        return downsample(frame, max_points), level
+
+    def daily(self, user_id, start=None, end=None):
+        rows = self._conn().execute(
+            "SELECT * FROM mood_daily WHERE user_id = ? AND Date BETWEEN ? AND ? ORDER BY Date",
+            (user_id, str(start or datetime.date.min), str(end or datetime.date.max)),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def time_of_day_means(self, user_id):
+        import pandas as pd
+
+        rows = self._conn().execute("SELECT Time, 1.0 * Mood_sum / n FROM mood_time_of_day WHERE user_id = ? AND n > 0", (user_id,))
+        means = dict(rows.fetchall())
+        order = [time for time in TIMES if time in means] + sorted(set(means) - set(TIMES))
+        return pd.Series([means[time] for time in order], index=pd.Index(order, name="Time"), name="Mood", dtype=float)
+
+    def calibration(self, user_id):
+        with self._conn() as conn:
+            return self._calibration(conn, user_id)
+
+    def _calibration(self, conn, user_id):
+        row = conn.execute(f"SELECT {', '.join(STATS)} FROM mood_calibration WHERE user_id = ?", (user_id,)).fetchone()
+        if row is not None:
+            return Calibration(tuple(row))
+        # First use for this user: one pass over the history, then O(1) per entry
+        rows = conn.execute("SELECT id, IFNULL(Mood, 0) FROM mood_log WHERE user_id = ? ORDER BY id", (user_id,)).fetchall()
+        cal, jumps = Calibration.from_series([row[1] for row in rows])
+        conn.executemany(
+            "UPDATE mood_log SET Mood_jump = ? WHERE id = ?",
+            [(jump, row[0]) for row, jump in zip(rows[1:], jumps) if not np.isnan(jump)],
+        )
+        self._save_calibration(conn, user_id, cal)
+        return cal
+
+    def _save_calibration(self, conn, user_id, cal):
+        conn.execute(
+            f"INSERT OR REPLACE INTO mood_calibration (user_id, {', '.join(STATS)}) VALUES ({', '.join('?' * (len(STATS) + 1))})",
+            (user_id, *map(float, cal.stats)),
+        )
+
+    def journal_add(self, user_id, kind, body, created=None):
+        created = created or datetime.datetime.now()
+        with self._conn() as conn:
+            cur = conn.execute(
+                "INSERT INTO journal (user_id, kind, created, preview, body) VALUES (?, ?, ?, ?, ?)",
+                (user_id, kind, created.isoformat(timespec="seconds"), preview(body), body or ""),
+            )
+        return cur.lastrowid
+
+    def journal_page(self, user_id, kind, before=None, limit=PAGE_SIZE, bodies=False):
+        # One more row than asked for tells whether an older page exists
+        rows = self._conn().execute(
+            f"SELECT id, created, preview, {'body' if bodies else 'NULL'} FROM journal "
+            "WHERE user_id = ? AND kind = ? AND id < ? ORDER BY id DESC LIMIT ?",
+            (user_id, kind, sys.maxsize if before is None else before, limit + 1),
+        ).fetchall()
+        notes = [Note(row[0], datetime.datetime.fromisoformat(row[1]), row[2], row[3]) for row in rows[:limit]]
+        return notes, notes[-1].id if len(rows) > limit else None
+
+    def journal_body(self, user_id, note_id):
+        row = self._conn().execute("SELECT body FROM journal WHERE id = ? AND user_id = ?", (note_id, user_id)).fetchone()
+        return row[0] if row else None
+
+    def note(self, row_id):
+        row = self._conn().execute("SELECT Notes FROM mood_log WHERE id = ?", (row_id,)).fetchone()
+        return row[0] if row else None
+
+    def imported(self, user_id):
+        return self._conn().execute("SELECT 1 FROM csv_imported WHERE user_id = ?", (user_id,)).fetchone() is not None
+
+    def import_entries(self, user_id, entries, source=""):
+        """Store a user's legacy log once ever; returns the number of entries added (0 if already done).
+
+        The check, the insert and the imported mark are one write-locked
+        transaction, so two sessions importing at once add the log once.
+        Users with rows of their own are marked without importing.
+        """
+        with self._conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            done = conn.execute("SELECT 1 FROM csv_imported WHERE user_id = ?", (user_id,)).fetchone()
+            if done or conn.execute("SELECT 1 FROM mood_log WHERE user_id = ? LIMIT 1", (user_id,)).fetchone():
+                entries = []
+            elif entries:
+                self._extend(conn, user_id, entries)
+            conn.execute(
+                "INSERT OR IGNORE INTO csv_imported VALUES (?, ?, ?, ?)",
+                (user_id, source, len(entries), datetime.datetime.now().isoformat(timespec="seconds")),
+            )
+        return len(entries)
+
+    def append(self, user_id, entry):
+        self.extend(user_id, [entry])
+
+    def _rolling(self, conn, user_id, entries):
+        # Rolling means for the new rows, continuing from the user's last WINDOW - 1 entries
+        cols = ", ".join(f"IFNULL({col}, 0)" for col in ROLLING)
+        prev = conn.execute(f"SELECT {cols} FROM mood_log WHERE user_id = ? ORDER BY id DESC LIMIT ?", (user_id, WINDOW - 1)).fetchall()
+        values = np.array([tuple(row) for row in prev[::-1]] + [[float(e.get(col) or 0) for col in ROLLING] for e in entries], dtype=float)
+        values = values.reshape(-1, len(ROLLING))
+        out = np.full((len(entries), len(ROLLING)), np.nan)
+        if len(values) >= WINDOW:
+            c = np.vstack([np.zeros(len(ROLLING)), np.cumsum(values, axis=0)])
+            means = (c[WINDOW:] - c[:-WINDOW]) / WINDOW
+            out[len(out) - len(means):] = means
+        return [[None if np.isnan(v) else float(v) for v in row] for row in out]
+
+    def extend(self, user_id, entries):
+        if entries:
+            with self._conn() as conn:
+                self._extend(conn, user_id, entries)
+
+    def delete_last(self, user_id):
+        with self._conn() as conn:
+            self._delete_last(conn, user_id)
+
+    def apply(self, plans):
+        """Write {user_id: [("extend", entries) | ("delete", None), ...]} in one transaction (one commit)."""
+        with self._conn() as conn:
+            for user_id, ops in plans.items():
+                for op, entries in ops:
+                    if op == "extend":
+                        self._extend(conn, user_id, entries)
+                    else:
+                        self._delete_last(conn, user_id)
+
+    def _extend(self, conn, user_id, entries):
+        cols = FIELDS + [f"{col}_roll" for col in ROLLING] + ["Mood_jump"]
+        last = conn.execute("SELECT id, IFNULL(Mood, 0) FROM mood_log WHERE user_id = ? ORDER BY id DESC LIMIT 1", (user_id,)).fetchone()
+        last_id, prev = last if last else (0, None)
+        rolling = self._rolling(conn, user_id, entries)
+        cal = self._calibration(conn, user_id)
+        jumps = []
+        for e in entries:
+            mood = e.get("Mood") or 0
+            jump = cal.add(prev, mood) if prev is not None else np.nan
+            jumps.append(None if np.isnan(jump) else jump)
+            prev = mood
+        rows = [[user_id, str(e["Date"])] + [e.get(col) for col in FIELDS[1:]] + roll + [jump] for e, roll, jump in zip(entries, rolling, jumps)]
+        conn.executemany(f"INSERT INTO mood_log (user_id, {', '.join(cols)}) VALUES ({', '.join('?' * (len(cols) + 1))})", rows)
+        conn.execute(_upsert(_DAILY_UPSERT, "id > ?"), (user_id, last_id))
+        conn.execute(_upsert(_TIME_OF_DAY_UPSERT, "id > ?"), (user_id, last_id))
+        self._save_calibration(conn, user_id, cal)
+
+    def _delete_last(self, conn, user_id):
+        # Load (and for a pre-calibration user, backfill Mood_jump) before reading the rows below
+        cal = self._calibration(conn, user_id)
+        rows = conn.execute(
+            "SELECT id, substr(Date, 1, 10), Time, IFNULL(Mood, 0), Mood_jump FROM mood_log WHERE user_id = ? ORDER BY id DESC LIMIT 2", (user_id,),
+        ).fetchall()
+        if not rows:
+            return
+        row_id, day, time, mood, jump = rows[0]
+        if len(rows) > 1:
+            cal.remove(rows[1][3], mood, jump)
+            self._save_calibration(conn, user_id, cal)
+        conn.execute("DELETE FROM mood_log WHERE id = ?", (row_id,))
+        conn.execute("UPDATE mood_time_of_day SET n = n - 1, Mood_sum = Mood_sum - ? WHERE user_id = ? AND Time = ?", (mood, user_id, time))
+        # The day's min/max can't be decremented, so rebuild just that day
+        conn.execute("DELETE FROM mood_daily WHERE user_id = ? AND Date = ?", (user_id, day))
+        conn.execute(_upsert(_DAILY_UPSERT, "substr(Date, 1, 10) = ?"), (user_id, day))
+
+
+def import_csv(store, path, user_id):
+    # Once per user, ever: recorded in csv_imported, so deleting every entry doesn't bring the CSV back
+    if store.imported(user_id):
+        return 0
+    return store.import_entries(user_id, CsvMoodStore(path).entries(), source=path)
+
+
+def import_dir(store, directory="."):
+    imported = {}
+    for path in sorted(glob.glob(os.path.join(directory, "mood_log_*.csv"))):
+        user_id = os.path.basename(path)[len("mood_log_"):-len(".csv")]
+        imported[user_id] = import_csv(store, path, user_id)
+    return imported
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "import":
+        sys.exit("usage: python -m hug.storage import [DIR] [DB]")
+    directory = sys.argv[2] if len(sys.argv) > 2 else "."
+    db = sys.argv[3] if len(sys.argv) > 3 else "hug.db"
+    for user_id, n in import_dir(SqliteMoodStore(db), directory).items():
+        print(f"{user_id}: {n} entries")
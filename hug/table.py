@@ -0,0 +1,227 @@
+"""Precomputed collapse risk and quantile bands over the simulator sliders.
+
+The crisis and personal simulators take four 0-10 sliders, a starting
+mood 0-100, a bullying answer and (crisis only) the stochastic-volatility
+checkbox: a small discrete grid. The builder evaluates every grid point
+offline and writes ``.npy`` arrays the apps memory-map, so a slider change
+is an index into pages the OS page cache shares between worker processes:
+
+    python -m hug.table --out risk_table --workers 8
+
+Jumpiness and bullying only enter through the shock rate
+``0.01 + jumpiness / 100 + STRESS[bullying]``, so they share one axis of
+21 shock levels. Per model, with ``P`` stochastic-volatility planes:
+
+    {model}-{build}/risk.npy   float32 (P, 11, 11, 11, 21, 101)
+    {model}-{build}/bands.npy  uint8   (P, 11, 11, 11, 21, 101, 3, T + 1), half-mood units
+    {model}-{build}/vol.npy    float32 (P, 11, T + 1), median volatility by instability
+    {model}.json               build metadata naming the current build
+
+A rebuild never touches the files apps have mapped: it fills a fresh
+build directory, then swaps in the metadata with ``os.replace``. ``load``
+notices the new metadata file and maps the new build; older builds are
+removed (already-mapped files stay readable until unmapped).
+
+Constant-volatility planes come from ``pde.solve_starts`` (all starting
+moods in one pass); stochastic-volatility planes are Monte Carlo with
+``--paths`` paths per starting mood.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .pde import solve_starts
+from .seeding import stream
+from .simulation import COLLAPSE_THRESHOLD, N_PATHS, STRESS, crisis_params, personal_params, simulate
+
+TABLE_DIR = os.environ.get("HUG_TABLE_DIR", "risk_table")
+VERSION = 2
+T = 50
+QUANTILES = (0.05, 0.5, 0.95)
+SLIDERS = 11
+SHOCKS = 21
+MOODS = 101
+BAND_SCALE = 2
+MC_PATHS = 500
+
+
+def _personal(recovery, instability, impact, jumpiness, bullying, stoch_vol=False):
+    return personal_params(recovery, instability, impact, jumpiness, bullying)
+
+
+# model -> (slider mapping, stochastic-volatility planes)
+MODELS = {"crisis": (crisis_params, (False, True)), "personal": (_personal, (False,))}
+
+_tables = {}
+
+
+def shock_index(jumpiness, bullying):
+    return jumpiness + round(STRESS[bullying] * 100)
+
+
+def _paths(build_dir):
+    return {name: os.path.join(build_dir, f"{name}.npy") for name in ("risk", "bands", "vol")}
+
+
+class RiskTable:
+    """Read-only view of a built table; ``lookup`` returns an ``Ensemble.summary``-shaped dict."""
+
+    def __init__(self, directory, model):
+        with open(os.path.join(directory, f"{model}.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.planes = MODELS[model][1]
+        build_dir = os.path.join(directory, f"{model}-{self.meta['build']}")
+        arrays = {name: np.load(path, mmap_mode="r") for name, path in _paths(build_dir).items()}
+        self.risk, self.bands, self.vol = arrays["risk"], arrays["bands"], arrays["vol"]
+        self.time = np.arange(self.meta["T"] + 1, dtype=float)
+
+    def lookup(self, recovery, instability, impact, jumpiness, bullying, mood0, stoch_vol=False):
+        plane = self.planes.index(stoch_vol)
+        i = (plane, recovery, instability, impact, shock_index(jumpiness, bullying), mood0)
+        low, median, high = self.bands[i] / BAND_SCALE
+        return {
+            "time": self.time, "low": low, "median": median, "high": high, "sample": None,
+            "vol": np.array(self.vol[plane, instability]), "risk": float(self.risk[i]),
+            "n_paths": self.meta["paths"] if stoch_vol else None,
+        }
+
+
+def load(model, directory=TABLE_DIR):
+    """The current built table for ``model``, or None when it is missing, partial or built for other settings.
+
+    Costs one ``stat`` of the metadata file per call; a new build (a new file) is mapped on first use.
+    """
+    key = (model, directory)
+    try:
+        st = os.stat(os.path.join(directory, f"{model}.json"))
+    except OSError:
+        _tables.pop(key, None)
+        return None
+    stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _tables.get(key)
+    if cached is None or cached[0] != stamp:
+        try:
+            table = RiskTable(directory, model)
+            meta = table.meta
+            if (meta["version"], meta["T"], meta["threshold"]) != (VERSION, T, COLLAPSE_THRESHOLD):
+                table = None
+        except (OSError, ValueError, KeyError, TypeError, json.JSONDecodeError):
+            table = None
+        cached = _tables[key] = (stamp, table)
+    return cached[1]
+
+
+def _evaluate(params, stoch_vol, rng, paths):
+    # Risk (MOODS,) and bands (MOODS, 3, T + 1) for every starting mood
+    if not stoch_vol:
+        risk, bands = solve_starts(np.arange(MOODS), T, q=QUANTILES, threshold=COLLAPSE_THRESHOLD, **params)
+    else:
+        ens = simulate(np.repeat(np.arange(MOODS, dtype=float), paths), T, MOODS * paths, rng=rng, **params)
+        mood = ens.mood.reshape(MOODS, paths, T + 1)
+        risk = (mood.min(axis=2) < COLLAPSE_THRESHOLD).mean(axis=1)
+        bands = np.quantile(mood, QUANTILES, axis=1)
+    return risk, np.moveaxis(bands, 0, 1)
+
+
+def _fill(build_dir, model, plane, combos, paths, seed):
+    # Workers write disjoint rows of the new build's arrays in place
+    arrays = _paths(build_dir)
+    risk = np.load(arrays["risk"], mmap_mode="r+")
+    bands = np.load(arrays["bands"], mmap_mode="r+")
+    mapping, planes = MODELS[model]
+    for recovery, instability, impact, shock in combos:
+        params = mapping(recovery, instability, impact, shock, "No", stoch_vol=planes[plane])
+        rng = stream(plane, recovery, instability, impact, shock, seed=seed)
+        r, b = _evaluate(params, planes[plane], rng, paths)
+        i = (plane, recovery, instability, impact, shock)
+        risk[i] = r
+        bands[i] = np.clip(np.rint(b * BAND_SCALE), 0, 255)
+    risk.flush()
+    bands.flush()
+    return len(combos)
+
+
+def build(model, directory=TABLE_DIR, workers=None, paths=MC_PATHS, seed=0):
+    """Evaluate every grid point of ``model`` into a new build under ``directory``, then make it current."""
+    mapping, planes = MODELS[model]
+    build = str(time.time_ns())
+    build_dir = os.path.join(directory, f"{model}-{build}")
+    os.makedirs(build_dir)
+
+    arrays = _paths(build_dir)
+    shape = (len(planes), SLIDERS, SLIDERS, SLIDERS, SHOCKS, MOODS)
+    np.lib.format.open_memmap(arrays["risk"], "w+", np.float32, shape).flush()
+    np.lib.format.open_memmap(arrays["bands"], "w+", np.uint8, shape + (len(QUANTILES), T + 1)).flush()
+    vol = np.zeros((len(planes), SLIDERS, T + 1), dtype=np.float32)
+    for plane, stoch_vol in enumerate(planes):
+        for instability in range(SLIDERS):
+            params = mapping(0, instability, 0, 0, "No", stoch_vol=stoch_vol)
+            ens = simulate(60, T, N_PATHS, rng=stream("vol", plane, instability, seed=seed), **params)
+            vol[plane, instability] = np.median(ens.vol, axis=0)
+    np.save(arrays["vol"], vol)
+
+    combos = list(itertools.product(range(SLIDERS), range(SLIDERS), range(SLIDERS), range(SHOCKS)))
+    workers = workers or os.cpu_count() or 1
+    size = max(1, len(combos) // (workers * 4))
+    chunks = [(plane, combos[i:i + size]) for plane in range(len(planes)) for i in range(0, len(combos), size)]
+    if workers == 1:
+        for plane, chunk in chunks:
+            _fill(build_dir, model, plane, chunk, paths, seed)
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            n = len(chunks)
+            list(pool.map(_fill, [build_dir] * n, [model] * n, *zip(*chunks), [paths] * n, [seed] * n))
+
+    meta = {"version": VERSION, "model": model, "build": build, "T": T, "threshold": COLLAPSE_THRESHOLD,
+            "quantiles": QUANTILES, "paths": paths, "seed": seed}
+    _publish(directory, model, meta)
+
+
+def _publish(directory, model, meta):
+    # Swap in the metadata naming a complete build, then drop the builds it replaces
+    meta_path = os.path.join(directory, f"{model}.json")
+    tmp = meta_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, meta_path)
+
+    # Processes still mapping an older build keep its pages; new loads read the metadata above.
+    # Builds are named by start time, so a newer one still being filled is left alone.
+    for name in os.listdir(directory):
+        build = name[len(model) + 1:]
+        if name.startswith(f"{model}-") and build.isdigit() and int(build) < int(meta["build"]):
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+        elif name.startswith(f"{model}_") and name.endswith(".npy"):
+            os.remove(os.path.join(directory, name))  # version 1 arrays, written in place
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m hug.table", description="Build the slider risk lookup tables.")
+    parser.add_argument("--out", default=TABLE_DIR, help="output directory (default: risk_table, or $HUG_TABLE_DIR)")
+    parser.add_argument("--models", nargs="*", default=list(MODELS), help=f"any of {', '.join(MODELS)}")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--paths", type=int, default=MC_PATHS, help="Monte Carlo paths per starting mood")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    unknown = set(args.models) - set(MODELS)
+    if unknown:
+        parser.error(f"unknown models: {', '.join(sorted(unknown))}")
+
+    for model in args.models:
+        started = time.perf_counter()
+        build(model, args.out, args.workers, args.paths, args.seed)
+        print(f"{model}: built in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
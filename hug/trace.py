@@ -0,0 +1,121 @@
+"""Opt-in timing spans for Streamlit reruns.
+
+Apps call ``start()`` once at the top of the script; shared code wraps its
+hot sections in ``with span("name"):``. Tracing is on for a session when
+the page is opened with ``?debug=1`` (which also shows a sidebar panel
+with the previous rerun's spans) or when ``HUG_TRACE`` names a JSONL file
+to append one record per span to. Otherwise ``span`` hands back a shared
+no-op context manager, so instrumented code pays one attribute lookup.
+
+Each record carries the session id, rerun number, span name and nesting
+depth, wall time, and the net change in allocated memory blocks
+(``sys.getallocatedblocks``) over the span.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+TRACE_FILE = os.environ.get("HUG_TRACE")
+
+_NULL = contextlib.nullcontext()
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+class _Rerun:
+    def __init__(self, session_id, number, path):
+        self.session_id = session_id
+        self.number = number
+        self.path = path
+        self.started = time.perf_counter()
+        self.depth = 0
+        self.spans = []
+
+
+class _Span:
+    __slots__ = ("rerun", "name", "depth", "start", "blocks")
+
+    def __init__(self, rerun, name):
+        self.rerun = rerun
+        self.name = name
+
+    def __enter__(self):
+        self.depth = self.rerun.depth
+        self.rerun.depth += 1
+        self.blocks = sys.getallocatedblocks()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        rerun = self.rerun
+        rerun.depth -= 1
+        record = {
+            "ts": time.time(),
+            "session": rerun.session_id,
+            "rerun": rerun.number,
+            "span": self.name,
+            "depth": self.depth,
+            "offset_ms": round((self.start - rerun.started) * 1e3, 3),
+            "wall_ms": round((end - self.start) * 1e3, 3),
+            "alloc_blocks": sys.getallocatedblocks() - self.blocks,
+        }
+        rerun.spans.append(record)
+        if rerun.path:
+            line = json.dumps(record) + "\n"
+            with _write_lock, open(rerun.path, "a", encoding="utf-8") as f:
+                f.write(line)
+        return False
+
+
+def span(name):
+    rerun = getattr(_local, "rerun", None)
+    return _NULL if rerun is None else _Span(rerun, name)
+
+
+def start(panel=None, path=TRACE_FILE):
+    """Begin tracing this rerun if enabled, and show the previous rerun's spans in the sidebar."""
+    import streamlit as st
+
+    if panel is None:
+        panel = st.query_params.get("debug") == "1"
+    if not (panel or path):
+        _local.rerun = None
+        return
+
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    previous = st.session_state.get("_trace_spans")
+    rerun = _Rerun(ctx.session_id if ctx else None, st.session_state.get("_trace_rerun", 0) + 1, path)
+    # The list fills in as this rerun runs; the next rerun's panel shows it
+    st.session_state["_trace_spans"] = rerun.spans
+    st.session_state["_trace_rerun"] = rerun.number
+    _local.rerun = rerun
+
+    if panel and previous:
+        with st.sidebar.expander("⏱ Last rerun timings"):
+            lines = [
+                f"{'&nbsp;' * 4 * s['depth']}`{s['span']}` {s['wall_ms']:.1f} ms · {s['alloc_blocks']:+d} blocks"
+                for s in sorted(previous, key=lambda s: (s["offset_ms"], s["depth"]))
+            ]
+            st.markdown("  \n".join(lines))
+
+
+def traced(name):
+    """Decorator form of ``span`` for whole functions."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            rerun = getattr(_local, "rerun", None)
+            if rerun is None:
+                return fn(*args, **kwargs)
+            with _Span(rerun, name):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
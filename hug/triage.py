@@ -0,0 +1,68 @@
+"""Keyword triage for the crisis and bullying chats.
+
+All severity tiers, in English and Bahasa Indonesia, are compiled once at
+import into a single alternation regex with one named group per tier. The
+input is normalized once and scanned once; the highest tier seen wins.
+"""
+
+import re
+import unicodedata
+
+CRISIS = "crisis"
+ANXIETY = "anxiety"
+SADNESS = "sadness"
+
+# Highest severity first
+KEYWORDS = {
+    CRISIS: {
+        "English": ["hopeless", "give up", "suicidal", "suicide", "kill", "end it", "want to die"],
+        "Bahasa Indonesia": [
+            "putus asa", "menyerah", "bunuh diri", "ingin mati", "mau mati", "pengen mati",
+            "mengakhiri hidup", "akhiri hidup", "akhiri semuanya", "tidak ada harapan",
+            "gak ada harapan", "nggak ada harapan", "bunuh",
+        ],
+    },
+    ANXIETY: {
+        "English": ["anxious", "anxiety", "nervous", "panic"],
+        "Bahasa Indonesia": ["cemas", "gugup", "panik", "gelisah", "khawatir", "takut"],
+    },
+    SADNESS: {
+        "English": ["sad", "cry", "alone", "lonely", "hurt"],
+        "Bahasa Indonesia": ["sedih", "menangis", "nangis", "sendirian", "kesepian", "sakit hati", "terluka"],
+    },
+}
+
+SEVERITY = {tier: rank for rank, tier in enumerate(reversed(list(KEYWORDS)), start=1)}
+
+
+def _pattern(words):
+    # Longest first so "bunuh diri" is preferred over "bunuh"; normalize() collapses whitespace
+    words = sorted(set(words), key=len, reverse=True)
+    return "|".join(re.escape(w).replace(r"\ ", " ") for w in words)
+
+
+# Left word boundary only: "kill" must not fire on "skills", but "hurting" still counts
+_MATCHER = re.compile(
+    r"\b(?:" + "|".join(
+        f"(?P<{tier}>{_pattern(w for words in langs.values() for w in words)})"
+        for tier, langs in KEYWORDS.items()
+    ) + ")"
+)
+_TOP = max(SEVERITY.values())
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(text.split())
+
+
+def triage(text):
+    """Return the most severe tier mentioned in ``text``, or None."""
+    best, best_rank = None, 0
+    for match in _MATCHER.finditer(normalize(text)):
+        rank = SEVERITY[match.lastgroup]
+        if rank > best_rank:
+            best, best_rank = match.lastgroup, rank
+            if rank == _TOP:
+                break
+    return best
@@ -0,0 +1,150 @@
+"""Streamlit views shared by the HUG apps: the crisis and bullying support modes, journal paging and the Mood Report table."""
+
+import streamlit as st
+
+from .i18n import LANGUAGES, t
+from .journal import PAGE_SIZE
+from .moodlog import NOTE_CHARS, PAGE_ROWS, SORTABLE, TIMES
+from .trace import span
+from .triage import ANXIETY, CRISIS, SADNESS, triage
+
+REPLIES = {CRISIS: (st.warning, "reply_crisis"), ANXIETY: (st.info, "reply_anxiety"), SADNESS: (st.info, "reply_sadness")}
+
+
+def support_mode_buttons(lang, sidebar=True):
+    if "crisis_mode" not in st.session_state:
+        st.session_state.crisis_mode = False
+    if "bully_mode" not in st.session_state:
+        st.session_state.bully_mode = False
+
+    if sidebar:
+        st.sidebar.markdown(t("support_modes_title", lang))
+        slots = [st.sidebar] * 3
+    else:
+        slots = st.columns([1, 1, 2])
+
+    if slots[0].button(t("crisis_btn", lang)):
+        st.session_state.crisis_mode = True
+        st.session_state.bully_mode = False
+    if slots[1].button(t("bully_btn", lang)):
+        st.session_state.crisis_mode = False
+        st.session_state.bully_mode = True
+    if slots[2].button(t("exit_btn", lang)):
+        st.session_state.crisis_mode = False
+        st.session_state.bully_mode = False
+
+
+def crisis_view(lang, heading=st.title):
+    heading(t("crisis_title", lang))
+    st.markdown(t("crisis_intro", lang))
+
+    with st.expander(t("toolkit_title", lang)):
+        st.markdown(t("toolkit_body", lang))
+
+    with st.expander(t("talk_title", lang)):
+        with st.form(key="crisis_chat"):
+            user_input = st.text_area(t("talk_prompt", lang))
+            submitted = st.form_submit_button(t("send", lang))
+
+        if submitted and user_input:
+            st.markdown(t("you_said", lang, text=user_input))
+            show, key = REPLIES.get(triage(user_input), (st.success, "reply_ok"))
+            show(t(key, lang))
+
+    with st.expander(t("resources_title", lang)):
+        st.markdown(t("resources_body", lang))
+
+
+def bully_view(lang, heading=st.title):
+    heading(t("bully_title", lang))
+    st.markdown(t("bully_intro", lang))
+
+    with st.form(key="bully_chat"):
+        bullying_input = st.text_area(t("bully_prompt", lang))
+        bully_submit = st.form_submit_button(t("send", lang))
+
+    if bully_submit and bullying_input:
+        st.markdown(t("you_said", lang, text=bullying_input))
+        st.markdown(t("bully_thanks", lang))
+        st.markdown(t("bully_advice", lang))
+        if triage(bullying_input) == CRISIS:
+            st.warning(t("reply_crisis", lang))
+
+
+def support_modes(lang, sidebar=True, heading=st.title):
+    """Render the support-mode buttons and, if a mode is active, its view; then stop the script."""
+    with span("support_modes"):
+        support_mode_buttons(lang, sidebar)
+        if st.session_state.crisis_mode:
+            crisis_view(lang, heading)
+            st.stop()
+        if st.session_state.bully_mode:
+            bully_view(lang, heading)
+            st.stop()
+
+
+def reset_pages(kind):
+    st.session_state[f"_{kind}_pages"] = [None]
+
+
+def paged_notes(journal, kind, render, page_size=PAGE_SIZE, bodies=False, lang=LANGUAGES[0]):
+    """Render one newest-first page of ``kind`` notes with ``render(note)``, with Newer/Older buttons.
+
+    The session keeps the stack of cursors walked so far, so only the shown
+    page is ever queried and sent to the browser.
+    """
+    pages = st.session_state.setdefault(f"_{kind}_pages", [None])
+    notes, older = journal.page(kind, before=pages[-1], limit=page_size, bodies=bodies)
+    for note in notes:
+        render(note)
+    if len(pages) == 1 and older is None:
+        return notes
+    newer_col, older_col = st.columns(2)
+    if newer_col.button(t("page_newer", lang), key=f"_{kind}_newer", disabled=len(pages) == 1):
+        pages.pop()
+        st.rerun()
+    if older_col.button(t("page_older", lang), key=f"_{kind}_older", disabled=older is None):
+        pages.append(older)
+        st.rerun()
+    return notes
+
+
+def mood_table(query, note, key="report", page_rows=PAGE_ROWS, lang=LANGUAGES[0]):
+    """Filterable, sortable Mood Report table that fetches and shows one page of rows at a time.
+
+    ``query(start, end, times, sort, descending, offset, limit)`` returns a
+    page frame (Notes clipped) and the matching row count, as
+    ``MoodLog.query`` and ``SqliteMoodStore.query`` do; ``note(index)``
+    returns one row's full Notes.
+    """
+    import math
+
+    start_col, end_col, time_col, sort_col = st.columns([1, 1, 2, 1])
+    start = start_col.date_input(t("table_from", lang), value=None, key=f"{key}_start")
+    end = end_col.date_input(t("table_to", lang), value=None, key=f"{key}_end")
+    times = time_col.multiselect(t("table_times", lang), TIMES, default=TIMES, key=f"{key}_times")
+    sort = sort_col.selectbox(t("table_sort", lang), SORTABLE, key=f"{key}_sort")
+    descending = sort_col.toggle(t("table_descending", lang), value=True, key=f"{key}_desc")
+
+    if set(times) == set(TIMES):
+        times = None  # every time of day, including labels from imported logs
+
+    page = st.session_state.get(f"{key}_page", 1)
+    df, total = query(start, end, times, sort, descending, (page - 1) * page_rows, page_rows)
+    pages = max(1, math.ceil(total / page_rows))
+    if page > pages:
+        # Filters shrank the result; jump to its last page
+        page = st.session_state[f"{key}_page"] = pages
+        df, total = query(start, end, times, sort, descending, (page - 1) * page_rows, page_rows)
+    st.dataframe(df, hide_index=True)
+    page_col, count_col = st.columns([1, 3])
+    page_col.number_input(t("table_page", lang), 1, pages, key=f"{key}_page")
+    count_col.caption(t("table_count", lang, shown=len(df), total=total))
+
+    clipped = [i for i, text in zip(df.index, df["Notes"]) if len(text) >= NOTE_CHARS]
+    if clipped:
+        labels = {i: f"{df.at[i, 'Date']} {df.at[i, 'Time']}: {df.at[i, 'Notes']}" for i in clipped}
+        picked = st.selectbox(t("table_read_note", lang), [None] + clipped, format_func=lambda i: "—" if i is None else labels[i], key=f"{key}_note")
+        if picked is not None:
+            st.write(note(picked))
+    return df
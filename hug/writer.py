@@ -0,0 +1,136 @@
+"""Write-behind persistence for ``SqliteMoodStore``.
+
+``WriteBehind(store).append(user_id, entry)`` only enqueues the write, so
+a Submit rerun returns without waiting on the (shared, slow) disk. One
+background thread per process drains the bounded queue:
+
+* whatever has queued up is taken as one batch (up to ``BATCH`` ops);
+* per user, consecutive appends coalesce into one ``extend``, and a
+  delete of a still-queued append cancels it instead of writing it;
+* the whole batch is written with ``store.apply``: one transaction, so
+  one commit however many users it covers. If it fails, each user's
+  writes are retried in their own transaction so one bad write doesn't
+  lose the others'.
+
+The store runs WAL with ``synchronous=NORMAL``, so a commit is not itself
+fsynced; the WAL is synced at checkpoints. A power cut can lose the last
+few commits, but never corrupts the database.
+
+When the queue is full, ``append`` blocks until there is room, which
+slows writers down instead of dropping data. ``wait(user_id)`` blocks
+until that user's queued writes are stored; pages call it before reading
+the store back. ``depth`` is the number of queued writes. ``close`` (also
+registered with ``atexit``) drains the queue before the process exits.
+"""
+
+import atexit
+import collections
+import threading
+
+QUEUE_SIZE = 256
+BATCH = 64
+
+
+def coalesce(ops):
+    """Per-user write plans for ``store.apply`` from queued (user_id, (op, entry)) items, in order."""
+    plans = {}
+    for user_id, (op, entry) in ops:
+        plan = plans.setdefault(user_id, [])
+        pending = plan and plan[-1][0] == "extend"
+        if op == "append":
+            if pending:
+                plan[-1][1].append(entry)
+            else:
+                plan.append(("extend", [entry]))
+        elif pending:
+            plan[-1][1].pop()
+            if not plan[-1][1]:
+                plan.pop()
+        else:
+            plan.append(("delete", None))
+    return plans
+
+
+class WriteBehind:
+    def __init__(self, store, maxsize=QUEUE_SIZE):
+        self.store = store
+        self._maxsize = maxsize
+        # Queue, counters and the closed flag all live under one lock, so close() can't slip between check and enqueue
+        self._queue = collections.deque()
+        self._pending = collections.Counter()
+        self._errors = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="hug-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def depth(self):
+        with self._cond:
+            return self._pending.total()
+
+    def append(self, user_id, entry):
+        self._put(user_id, ("append", entry))
+
+    def delete_last(self, user_id):
+        self._put(user_id, ("delete", None))
+
+    def _put(self, user_id, op):
+        with self._cond:
+            self._cond.wait_for(lambda: self._closed or len(self._queue) < self._maxsize)
+            if self._closed:
+                raise RuntimeError("write-behind queue is closed")
+            self._pending[user_id] += 1
+            self._queue.append((user_id, op))
+            self._cond.notify_all()
+
+    def wait(self, user_id=None, timeout=None):
+        """Block until ``user_id``'s (or everyone's) queued writes are stored; re-raise one that failed.
+
+        Returns False if ``timeout`` ran out first.
+        """
+        with self._cond:
+            done = self._cond.wait_for(lambda: not (self._pending[user_id] if user_id is not None else self._pending.total()), timeout)
+            error = self._errors.pop(user_id, None) if user_id is not None else None
+        if error is not None:
+            raise error
+        return done
+
+    def close(self, timeout=None):
+        """Write everything still queued, then stop the thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                ops = [self._queue.popleft() for _ in range(min(BATCH, len(self._queue)))]
+                stop = self._closed and not self._queue
+                self._cond.notify_all()  # room for appends blocked on a full queue
+            if ops:
+                self._write(ops)
+            if stop:
+                return
+
+    def _write(self, ops):
+        plans = coalesce(ops)
+        errors = {}
+        try:
+            self.store.apply(plans)
+        except Exception:
+            for user_id, plan in plans.items():
+                try:
+                    self.store.apply({user_id: plan})
+                except Exception as e:
+                    errors[user_id] = e
+        with self._cond:
+            self._errors.update(errors)
+            self._pending.subtract(user_id for user_id, _ in ops)
+            self._pending += collections.Counter()  # drop users with nothing left
+            self._cond.notify_all()
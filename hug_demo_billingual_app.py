@@ -1,51 +1,27 @@
 import streamlit as st
-import numpy as np
-import matplotlib.pyplot as plt
+
+from hug.charts import draw_trajectory, render
+from hug.i18n import BULLYING_KEYS, LANGUAGES, t
+from hug.seeding import session_rng
+from hug.simulation import RISK_LEVEL, simulate
+from hug.trace import start as start_trace
+
+start_trace()
 
 # Language toggle
-lang = st.radio("Choose Language / Pilih Bahasa", ["English", "Bahasa Indonesia"])
-
-# Text dictionary
-TEXT = {
-    "title": {
-        "English": "HUG – Holding Us Great",
-        "Bahasa Indonesia": "HUG – Merangkul Kita Hebat"
-    },
-    "subtitle": {
-        "English": "Mood & Crisis Trajectory Simulator",
-        "Bahasa Indonesia": "Simulasi Mood & Krisis Emosional"
-    },
-    "mood_slider": {
-        "English": "How are you feeling right now?",
-        "Bahasa Indonesia": "Bagaimana perasaanmu sekarang?"
-    },
-    "bullying_check": {
-        "English": "Have you experienced bullying or social stress recently?",
-        "Bahasa Indonesia": "Apakah kamu mengalami bullying atau stres sosial baru-baru ini?"
-    },
-    "simulate_button": {
-        "English": "Run Simulation",
-        "Bahasa Indonesia": "Jalankan Simulasi"
-    },
-    "outcome_ok": {
-        "English": "Trajectory appears stable. Keep supporting yourself.",
-        "Bahasa Indonesia": "Trajektori terlihat stabil. Terus dukung dirimu."
-    },
-    "outcome_risk": {
-        "English": "Trajectory indicates emotional collapse risk. Reach out or seek help.",
-        "Bahasa Indonesia": "Trajektori menunjukkan risiko kejatuhan emosi. Hubungi seseorang atau cari bantuan."
-    }
-}
+lang = st.radio("Choose Language / Pilih Bahasa", LANGUAGES)
 
 # App title
-st.title(TEXT["title"][lang])
-st.subheader(TEXT["subtitle"][lang])
+st.title(t("app_title", lang))
+st.subheader(t("demo_subtitle", lang))
 
 # Mood input
-mood0 = st.slider(TEXT["mood_slider"][lang], 0, 100, 50)
+mood0 = st.slider(t("demo_mood_slider", lang), 0, 100, 50)
 
 # Bullying check
-bullying_input = st.selectbox(TEXT["bullying_check"][lang], ["No", "Maybe", "Yes"])
+bullying_input = st.selectbox(
+    t("bullying_question", lang), list(BULLYING_KEYS), format_func=lambda choice: t(BULLYING_KEYS[choice], lang)
+)
 stress_modifier = {"No": 0.05, "Maybe": 0.1, "Yes": 0.2}[bullying_input]
 
 # Simulation parameters
@@ -58,62 +34,46 @@ eta = 1.0
 sigma_J = 5
 p_jump = 0.05 + stress_modifier  # more realistic jump frequency
 
+
+
+def draw_mood_and_volatility(fig, sim, threshold, lang):
+    ax1, ax2 = fig.subplots(2, 1, sharex=True)
+    draw_trajectory(fig, sim, threshold=threshold, xlabel="", title=t("chart_mood_trajectory", lang), lang=lang, ax=ax1)
+
+    ax2.plot(sim["time"], sim["vol"], label=t("chart_volatility", lang), color="purple", linewidth=2)
+    ax2.set_xlabel(t("axis_time", lang))
+    ax2.set_ylabel(t("chart_volatility", lang))
+    ax2.set_title(t("chart_volatility_title", lang))
+    ax2.legend()
+
+
 # Simulation
-if st.button(TEXT["simulate_button"][lang]):
-    mood = [mood0]
-    vol = [theta]
+if st.button(t("demo_simulate_btn", lang)):
     dt = 1
     collapse_threshold = 30
-    np.random.seed(42)
-
-    for t in range(T):
-        d_sigma = kappa * (theta - vol[-1]) * dt + eta * np.random.normal()
-        sigma_t = max(0.1, vol[-1] + d_sigma)
-        dW = np.random.normal() * np.sqrt(dt)
-
-        # Jump: sometimes negative, sometimes positive
-        if np.random.rand() < p_jump:
-            jump_direction = np.random.choice([-15, 10], p=[0.7, 0.3])
-            jump = np.random.normal(jump_direction, sigma_J)
-        else:
-            jump = 0
-
-        dM = mu * dt + sigma_t * dW + jump
-        M_t = max(0, min(100, mood[-1] + dM))
-        vol.append(sigma_t)
-        mood.append(M_t)
-   
-    # Plotting
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 6), sharex=True)
-    ax1.plot(mood, label="Mood", color="blue", linewidth=2)
-    ax1.axhline(collapse_threshold, color='red', linestyle='--', label="Collapse Threshold")
-    ax1.set_ylabel("Mood Level")
-    ax1.set_title("Mood Trajectory")
-    ax1.legend()
-
-    ax2.plot(vol, label="Volatility", color="purple", linewidth=2)
-    ax2.set_xlabel("Time")
-    ax2.set_ylabel("Volatility")
-    ax2.set_title("Volatility Over Time")
-    ax2.legend()
+    # Jump: sometimes negative, sometimes positive
+    ens = simulate(
+        mood0, T, mu=mu, sigma=theta, dt=dt,
+        stoch_vol=True, kappa=kappa, theta=theta, eta=eta,
+        jump_prob=p_jump, jump_mean=[-15, 10], jump_probs=[0.7, 0.3], jump_std=sigma_J,
+        rng=session_rng("simulation"),
+    )
+    sim = ens.summary(collapse_threshold)
+    risk = sim["risk"]
 
-    st.pyplot(fig)
+    # Plotting
+    st.image(render(draw_mood_and_volatility, sim, figsize=(10, 6), threshold=collapse_threshold, lang=lang))
 
-    if any([m < collapse_threshold for m in mood]):
-        st.error(TEXT["outcome_risk"][lang])
+    st.metric(t("collapse_risk", lang), f"{risk:.0%}")
+    if risk >= RISK_LEVEL:
+        st.error(t("demo_feedback_risk", lang))
     else:
-        st.success(TEXT["outcome_ok"][lang])
+        st.success(t("demo_feedback_ok", lang))
 
-    st.markdown("### 🧠 Mathematical Model (Jump-Diffusion)")
+    st.markdown(t("demo_model_title", lang))
     st.latex(r'dM_t = \mu\,dt + \sigma_t\,dW_t + J_t\,dN_t')
     st.latex(r'd\sigma_t = \kappa(\theta - \sigma_t)\,dt + \eta\,dB_t')
 
-    st.markdown("""
-    - \( M_t \): mood over time  
-    - \( \mu \): baseline emotional drift  
-    - \( \sigma_t \): volatility of mood  
-    - \( J_t \): emotional jump (positive or negative)  
-    - If \( M_t < 30 \): flag as collapse trajectory
-    """)
+    st.markdown(t("demo_model_body", lang))
 
-    st.caption("HUG demo – not a diagnostic tool. / demo HUG – bukan alat diagnosis.")
+    st.caption(t("demo_disclaimer", lang))
@@ -1,20 +1,24 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import datetime
-import matplotlib.pyplot as plt
+
+from hug.charts import draw_bars, draw_trajectory, render
+from hug.journal import Journal
+from hug.moodlog import MoodLog
+from hug.seeding import session_rng
+from hug.simulation import simulate
+from hug.trace import start as start_trace
+from hug.ui import mood_table, paged_notes, reset_pages
 
 st.set_page_config(page_title="Moodrift", layout="wide")
+start_trace()
 
 # Initialize session state
 if "log" not in st.session_state:
-    st.session_state.log = []
-
-if "letters" not in st.session_state:
-    st.session_state.letters = []
+    st.session_state.log = MoodLog()
 
-if "anchors" not in st.session_state:
-    st.session_state.anchors = []
+if "journal" not in st.session_state:
+    st.session_state.journal = Journal()
 
 # Sidebar navigation
 page = st.sidebar.radio("Moodrift Navigation", ["Log Mood", "Mood Report", "Letter to Self", "Reality Anchors", "Mood Simulation"])
@@ -55,25 +59,22 @@ elif page == "Mood Report":
     if not st.session_state.log:
         st.info("No data logged yet.")
     else:
-        df = pd.DataFrame(st.session_state.log)
-        st.dataframe(df)
+        log = st.session_state.log
+        mood_table(log.query, log.notes)
 
-        mood_range = df["Mood"].max() - df["Mood"].min()
+        mood_range = log.day_range(datetime.date.today())
         if mood_range >= 6:
             st.error("⚠️ Mood volatility detected today.")
 
         st.markdown("#### Mood Over Time")
-        mood_series = df.groupby("Time")["Mood"].mean()
+        mood_series = log.time_of_day_means()
         st.line_chart(mood_series)
 
         st.markdown("#### Confidence / Impulsivity / Irritability")
-        fig, ax = plt.subplots()
-        df_plot = df[["Confidence", "Impulsivity", "Irritability"]].tail(7)
-        df_plot.plot(kind="bar", ax=ax)
-        st.pyplot(fig)
+        st.image(render(draw_bars, log.tail(7)[["Confidence", "Impulsivity", "Irritability"]]))
 
         # Flag high-risk mood patterns
-        if df.tail(3)[["Confidence", "Impulsivity"]].mean().sum() > 6:
+        if log.tail(3)[["Confidence", "Impulsivity"]].mean().sum() > 6:
             st.warning("⚠️ Elevated confidence + impulsivity. Consider reviewing your Reality Anchors.")
 
 # ---------- 3. LETTER TO SELF ----------
@@ -83,13 +84,18 @@ elif page == "Letter to Self":
         letter = st.text_area("Write a message to your future self:")
         send_it = st.form_submit_button("Save Letter")
     if send_it:
-        st.session_state.letters.append((datetime.datetime.now(), letter))
+        st.session_state.journal.add("letter", letter)
+        reset_pages("letter")
         st.success("Letter saved.")
 
+    def show_letter(note):
+        # Only an opened letter's text is sent to the browser
+        with st.expander(f"Letter from {note.created.strftime('%Y-%m-%d %H:%M:%S')}", key=f"letter_{note.id}", on_change="rerun") as box:
+            if box.open:
+                st.write(st.session_state.journal.body(note.id))
+
     st.markdown("#### Previously Saved Letters")
-    for i, (t, txt) in enumerate(st.session_state.letters[::-1]):
-        with st.expander(f"Letter from {t.strftime('%Y-%m-%d %H:%M:%S')}"):
-            st.write(txt)
+    paged_notes(st.session_state.journal, "letter", show_letter)
 
 # ---------- 4. REALITY ANCHORS ----------
 elif page == "Reality Anchors":
@@ -98,13 +104,13 @@ elif page == "Reality Anchors":
         anchors = st.text_area("Write 2–3 reality check truths (e.g., 'I usually sleep 7 hours').")
         anchor_submit = st.form_submit_button("Save Anchors")
     if anchor_submit:
-        st.session_state.anchors.append((datetime.datetime.now(), anchors))
+        st.session_state.journal.add("anchor", anchors)
+        reset_pages("anchor")
         st.success("Anchor saved.")
 
-    if st.session_state.anchors:
+    if st.session_state.journal.page("anchor", limit=1)[0]:
         st.markdown("#### Your Anchors")
-        for t, a in st.session_state.anchors[::-1]:
-            st.markdown(f"**{t.date()}**: {a}")
+        paged_notes(st.session_state.journal, "anchor", lambda note: st.markdown(f"**{note.created.date()}**: {note.body}"), bodies=True)
 
 # ---------- 5. MOOD SIMULATION (JUMP DIFFUSION) ----------
 elif page == "Mood Simulation":
@@ -115,7 +121,7 @@ elif page == "Mood Simulation":
     if not st.session_state.log:
         st.info("No data available. Log mood first.")
     else:
-        last_entry = st.session_state.log[-1]
+        last_entry = st.session_state.log.last()
         mu = last_entry["Mood"] * 0.02
         sigma = max(0.1, abs(last_entry["Irritability"] + last_entry["Impulsivity"]) * 0.05)
         lambda_jump = 0.3
@@ -126,19 +132,11 @@ elif page == "Mood Simulation":
         T = 10
         dt = 0.01
         N = int(T / dt)
-        time = np.linspace(0, T, N)
-        mood_path = np.zeros(N)
-
-        for t in range(1, N):
-            dW = np.random.normal(0, np.sqrt(dt))
-            dN = np.random.poisson(lambda_jump * dt)
-            J = np.random.normal(jump_mean, jump_std) if dN > 0 else 0
-            mood_path[t] = mood_path[t - 1] + mu * dt + sigma * dW + J
+        ens = simulate(
+            0, N - 1, mu=mu, sigma=sigma, dt=dt,
+            jump_prob=-np.expm1(-lambda_jump * dt), jump_mean=jump_mean, jump_std=jump_std,
+            clip=None, rng=session_rng("simulation"),
+        )
 
         st.markdown("#### Simulated Mood Trajectory (Next 10 Units of Time)")
-        fig, ax = plt.subplots()
-        ax.plot(time, mood_path, color='purple')
-        ax.set_title("Jump Diffusion Mood Simulation")
-        ax.set_xlabel("Time")
-        ax.set_ylabel("Mood Level")
-        st.pyplot(fig)
+        st.image(render(draw_trajectory, ens.summary(), color="purple", title="Jump Diffusion Mood Simulation"))
@@ -0,0 +1,80 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from hug import api
+
+
+@pytest.fixture(scope="module")
+def server():
+    srv = api.PoolHTTPServer(("127.0.0.1", 0), workers=2)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def request(server, method, path, body=b"", headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    conn.putrequest(method, path)
+    for name, value in (headers or {"Content-Length": str(len(body))}).items():
+        conn.putheader(name, value)
+    conn.endheaders(body)
+    response = conn.getresponse()
+    try:
+        return response.status, json.loads(response.read())
+    finally:
+        conn.close()
+
+
+def post(server, path, payload):
+    return request(server, "POST", path, json.dumps(payload).encode())
+
+
+def test_health_and_triage(server):
+    assert request(server, "GET", "/health", headers={}) == (200, {"ok": True})
+    status, body = post(server, "/triage", {"text": "I want to die", "lang": "Bahasa Indonesia"})
+    assert status == 200 and body["tier"] == "crisis" and body["reply"]
+
+
+@pytest.mark.parametrize("path, payload", [
+    ("/triage", {"text": 1}),
+    ("/triage", {"text": "hi", "lang": "Klingon"}),
+    ("/simulate/crisis", {"bullying": "sometimes"}),
+    ("/simulate/crisis", {"recovery": 11}),
+    ("/simulate/crisis", {"stoch_vol": "yes"}),
+    ("/simulate/personal", {"mood0": True}),
+    ("/triage", ["not", "an", "object"]),
+])
+def test_invalid_bodies_are_400(server, path, payload):
+    status, body = post(server, path, payload)
+    assert status == 400 and body["error"]
+
+
+def test_malformed_json_is_400(server):
+    assert request(server, "POST", "/triage", b"{nope")[0] == 400
+
+
+def test_unknown_paths_are_404(server):
+    assert post(server, "/nope", {})[0] == 404
+    assert request(server, "GET", "/nope", headers={})[0] == 404
+
+
+@pytest.mark.parametrize("length", ["abc", "-1", "1.5", "²"])
+def test_bad_content_length_is_400(server, length):
+    assert request(server, "POST", "/triage", headers={"Content-Length": length})[0] == 400
+
+
+def test_oversized_body_is_413(server):
+    assert request(server, "POST", "/triage", headers={"Content-Length": str(api.MAX_BODY + 1)})[0] == 413
+
+
+def test_endpoint_failure_is_500(server, monkeypatch):
+    def broken(body):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(api.ROUTES, "/triage", broken)
+    assert post(server, "/triage", {"text": "hi"}) == (500, {"error": "internal error"})
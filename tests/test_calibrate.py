@@ -0,0 +1,23 @@
+import numpy as np
+
+from hug.calibrate import Calibration
+
+
+def test_anti_persistent_series_keeps_its_mean_as_baseline():
+    # Alternating around 5: the slope of X[k+1] on X[k] is negative
+    moods = [4, 6, 3, 7, 4, 6, 5, 5, 3, 7, 4, 6, 4, 6, 5, 5, 4, 6, 3, 7]
+    cal, _ = Calibration.from_series(moods)
+    fit = cal.fit()
+    assert fit["kappa"] == 1.0
+    assert abs(fit["level"] - np.mean(moods)) < 0.5
+    assert abs(cal.simulate_params(scale=10)["baseline"] - 10 * np.mean(moods)) < 5
+
+
+def test_persistent_series_fits_its_level():
+    rng = np.random.default_rng(0)
+    moods = [6.0]
+    for _ in range(400):
+        moods.append(moods[-1] + 0.2 * (4 - moods[-1]) + rng.normal(0, 0.3))
+    fit = Calibration.from_series(moods)[0].fit()
+    assert abs(fit["kappa"] - 0.2) < 0.1
+    assert abs(fit["level"] - 4) < 0.3
@@ -0,0 +1,23 @@
+import pytest
+
+from hug.estimate import MIN_PATHS, collapse_probability, wilson
+
+
+@pytest.mark.parametrize("qmc", [False, True])
+@pytest.mark.parametrize("mood0, p", [(90, 0.0), (5, 1.0)])
+def test_certain_outcomes_still_get_an_interval(mood0, p, qmc):
+    # Nothing (or everything) collapses: the first batch alone has a zero standard error
+    risk = collapse_probability(mood0, 10, threshold=10, sigma=0.1, qmc=qmc, rng=1)
+    assert risk.value == p
+    assert risk.n_paths >= MIN_PATHS
+    low, high = risk.ci
+    assert 0.0 <= low <= p <= high <= 1.0
+    assert high - low > 0
+    assert risk.half_width <= 0.01
+
+
+def test_wilson_interval_at_the_edges():
+    low, high = wilson(0.0, 100, 1.96)
+    assert low == 0.0 and 0.03 < high < 0.04
+    low, high = wilson(1.0, 100, 1.96)
+    assert 0.96 < low < 0.97 and high == 1.0
@@ -0,0 +1,26 @@
+import numpy as np
+
+from hug.calibrate import Calibration
+from hug.moodlog import ROLLING, WINDOW, MoodLog
+
+from .test_storage import entries
+
+
+def test_incremental_rollups_match_a_rebuild_after_appends_and_pops():
+    rng = np.random.default_rng(2)
+    log = MoodLog(capacity=4)
+    for e in entries(rng.integers(0, 11, size=120).tolist()):
+        log.append(e)
+        if rng.random() < 0.3:
+            log.pop()
+    rebuilt = MoodLog.from_records([log[i] for i in range(len(log))])
+
+    np.testing.assert_allclose(log.rolling().to_numpy(), rebuilt.rolling().to_numpy())
+    assert log.time_of_day_means().to_dict() == rebuilt.time_of_day_means().to_dict()
+    moods = log.column("Mood").tolist()
+    expected, _ = Calibration.from_series(moods)
+    np.testing.assert_allclose(log.calibration().stats, expected.stats)
+    np.testing.assert_allclose(rebuilt.calibration().stats, expected.stats)
+
+    frame = log.to_frame()
+    np.testing.assert_allclose(log.rolling().to_numpy(), frame[ROLLING].rolling(WINDOW).mean().to_numpy())
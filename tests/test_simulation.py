@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from hug.batch import sweep
+from hug.simulation import CHUNK_PATHS, simulate
+
+from .test_storage import entries
+
+PARAMS = dict(mu=0.1, baseline=60, sigma=3, stoch_vol=True, kappa=0.3, eta=0.2, jump_rate=0.1, jump_mean=-5, jump_std=2)
+
+
+@pytest.mark.parametrize("workers", [2, 3, 8])
+def test_simulate_is_identical_across_worker_counts(workers):
+    n_paths = 3 * CHUNK_PATHS + 17
+    serial = simulate(50, 20, n_paths, rng=7, **PARAMS)
+    threaded = simulate(50, 20, n_paths, rng=7, workers=workers, **PARAMS)
+    np.testing.assert_array_equal(serial.mood, threaded.mood)
+    np.testing.assert_array_equal(serial.vol, threaded.vol)
+
+
+def test_simulate_is_reproducible_from_its_seed():
+    a = simulate(50, 20, 100, rng=3, **PARAMS)
+    b = simulate(50, 20, 100, rng=3, **PARAMS)
+    np.testing.assert_array_equal(a.mood, b.mood)
+
+
+def test_sweep_is_identical_across_worker_counts():
+    tasks = [(f"user{i}", entries([i % 11])[0]) for i in range(12)]
+    serial = sorted(sweep(tasks, workers=1, n_paths=200), key=lambda row: row["user_id"])
+    pooled = sorted(sweep(tasks, workers=3, n_paths=200), key=lambda row: row["user_id"])
+    assert serial == pooled
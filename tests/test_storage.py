@@ -0,0 +1,164 @@
+import datetime
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hug.calibrate import Calibration
+from hug.moodlog import ROLLING, TIMES, WINDOW
+from hug.storage import MIGRATIONS, SCHEMA, STATS, CsvMoodStore, SqliteMoodStore, import_csv
+
+# Ends on a drop far outside the fitted noise, so the last transition is classed as a jump
+MOODS = [5, 6, 5, 5, 6, 5, 6, 5, 5, 6, 9, 6, 5, 6, 5, 1]
+
+
+def entries(moods, start=datetime.date(2024, 1, 1)):
+    return [
+        {"Date": start + datetime.timedelta(days=i // len(TIMES)), "Time": TIMES[i % len(TIMES)], "Mood": mood,
+         "Energy": (i * 3) % 11, "Sleep": (i * 7) % 11, "Notes": f"entry {i}"}
+        for i, mood in enumerate(moods)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SqliteMoodStore(str(tmp_path / "hug.db"))
+
+
+def saved_stats(store, user_id):
+    row = store._conn().execute(f"SELECT {', '.join(STATS)} FROM mood_calibration WHERE user_id = ?", (user_id,)).fetchone()
+    return np.array(tuple(row))
+
+
+def test_delete_after_legacy_import_matches_from_series(store):
+    assert not np.isnan(Calibration.from_series(MOODS)[1][-1])
+    store.extend("u", entries(MOODS))
+    # Rows written before the calibration migration: no stats row, no Mood_jump
+    with store._conn() as conn:
+        conn.execute("DELETE FROM mood_calibration")
+        conn.execute("UPDATE mood_log SET Mood_jump = NULL")
+
+    store.delete_last("u")
+
+    expected, _ = Calibration.from_series(MOODS[:-1])
+    np.testing.assert_allclose(saved_stats(store, "u"), expected.stats)
+
+
+def test_concurrent_opens_migrate_once(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.execute("INSERT INTO mood_log (user_id, Date, Time, Mood) VALUES ('u', '2024-01-01', 'Morning', 5)")
+    conn.commit()
+    conn.close()
+
+    errors = []
+
+    def open_store():
+        try:
+            SqliteMoodStore(path)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=open_store) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+    # The backfill ran once: one entry, counted once
+    assert conn.execute("SELECT n, Mood_sum FROM mood_daily").fetchall() == [(1, 5)]
+
+
+def random_history(store, user_id, seed=0, steps=40):
+    # Appends one at a time and in batches, interleaved with deletes, spread over a few days
+    rng = np.random.default_rng(seed)
+    pending = entries(rng.integers(0, 11, size=4 * steps).tolist())
+    for _ in range(steps):
+        if rng.random() < 0.25:
+            store.delete_last(user_id)
+        else:
+            size = int(rng.integers(1, 5))
+            store.extend(user_id, pending[:size])
+            pending = pending[size:]
+
+
+def test_rollups_match_a_recount_after_appends_and_deletes(store):
+    random_history(store, "u")
+    df = pd.DataFrame(store.load("u"))
+    for col in ROLLING:
+        df[col] = df[col].fillna(0)
+    assert len(df) > WINDOW
+
+    days = df.assign(Date=df["Date"].astype(str).str[:10]).groupby("Date")
+    expected = pd.DataFrame({
+        "n": days.size(),
+        **{f"{col}_sum": days[col].sum() for col in ROLLING},
+        "Mood_min": days["Mood"].min(),
+        "Mood_max": days["Mood"].max(),
+    })
+    daily = pd.DataFrame(store.daily("u")).set_index("Date")[expected.columns]
+    pd.testing.assert_frame_equal(daily, expected, check_dtype=False, check_names=False)
+
+    means = store.time_of_day_means("u")
+    pd.testing.assert_series_equal(means, df.groupby("Time")["Mood"].mean().reindex(means.index), check_names=False)
+
+    rolling = store.rolling_frame("u")
+    expected = df[ROLLING].rolling(WINDOW).mean()
+    np.testing.assert_allclose(rolling.to_numpy(), expected.to_numpy())
+
+
+def test_calibration_matches_from_series_after_appends_and_deletes(store):
+    random_history(store, "u", seed=1)
+    moods = [e["Mood"] for e in store.load("u", columns=["Mood"])]
+    expected, _ = Calibration.from_series(moods)
+    assert store.calibration("u").transitions == len(moods) - 1
+    np.testing.assert_allclose(saved_stats(store, "u"), expected.stats)
+
+
+def legacy_csv(tmp_path, moods):
+    path = str(tmp_path / "mood_log_u.csv")
+    csv_store = CsvMoodStore(path)
+    for e in entries(moods):
+        csv_store.append(e)
+    return path
+
+
+def test_deleted_history_is_not_imported_again(store, tmp_path):
+    path = legacy_csv(tmp_path, [5, 6, 7])
+    assert import_csv(store, path, "u") == 3
+    for _ in range(3):
+        store.delete_last("u")
+    # A new session (or process) opening the same user
+    assert import_csv(SqliteMoodStore(store.path), path, "u") == 0
+    assert store.count("u") == 0
+
+
+def test_concurrent_imports_add_the_log_once(store, tmp_path):
+    path = legacy_csv(tmp_path, [5, 6, 7])
+    counts = []
+    threads = [threading.Thread(target=lambda: counts.append(import_csv(store, path, "u"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(counts) == [0] * 7 + [3]
+    assert store.count("u") == 3
+
+
+def test_users_with_their_own_rows_are_left_alone(store, tmp_path):
+    store.extend("u", entries([1]))
+    assert import_csv(store, legacy_csv(tmp_path, [5, 6, 7]), "u") == 0
+    assert store.count("u") == 1
+
+
+def test_blank_csv_fields_import_as_null(store, tmp_path):
+    path = tmp_path / "mood_log_u.csv"
+    path.write_text("Date,Time,Mood,Energy,Sleep,Confidence,Notes\n2024-01-01,Morning,5,4,3,,hi\n")
+    assert import_csv(store, str(path), "u") == 1
+    assert store.last("u", columns=["Mood", "Confidence", "Impulsivity"]) == {"Mood": 5, "Confidence": None, "Impulsivity": None}
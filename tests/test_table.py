@@ -0,0 +1,57 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from hug import table
+
+
+def fake_build(directory, model, risk, build):
+    # A complete build with every risk the same, published the way build() does
+    build_dir = os.path.join(directory, f"{model}-{build}")
+    os.makedirs(build_dir)
+    planes = len(table.MODELS[model][1])
+    shape = (planes, table.SLIDERS, table.SLIDERS, table.SLIDERS, table.SHOCKS, 3)
+    arrays = table._paths(build_dir)
+    np.save(arrays["risk"], np.full(shape, risk, dtype=np.float32))
+    np.save(arrays["bands"], np.zeros(shape + (3, table.T + 1), dtype=np.uint8))
+    np.save(arrays["vol"], np.zeros((planes, table.SLIDERS, table.T + 1), dtype=np.float32))
+    meta = {"version": table.VERSION, "model": model, "build": str(build), "T": table.T,
+            "threshold": table.COLLAPSE_THRESHOLD, "quantiles": table.QUANTILES, "paths": 10, "seed": 0}
+    table._publish(directory, model, meta)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    table._tables.clear()
+    yield
+    table._tables.clear()
+
+
+def test_rebuild_is_picked_up_without_disturbing_the_old_table(tmp_path):
+    directory = str(tmp_path)
+    fake_build(directory, "personal", 0.25, build=1)
+    old = table.load("personal", directory)
+    assert old.lookup(5, 5, 5, 3, "No", 2)["risk"] == 0.25
+
+    fake_build(directory, "personal", 0.75, build=2)
+    new = table.load("personal", directory)
+    assert new.lookup(5, 5, 5, 3, "No", 2)["risk"] == 0.75
+    # The old mapping still reads its own build, not zeros or a crash
+    assert old.lookup(5, 5, 5, 3, "No", 2)["risk"] == 0.25
+    assert sorted(os.listdir(directory)) == ["personal-2", "personal.json"]
+
+
+@pytest.mark.parametrize("meta", ['{"version": 2, "T"', '{"version": 2}', '["not", "a", "dict"]'])
+def test_partial_metadata_falls_back(tmp_path, meta):
+    (tmp_path / "crisis.json").write_text(meta)
+    assert table.load("crisis", str(tmp_path)) is None
+
+
+def test_missing_or_stale_tables_fall_back(tmp_path):
+    assert table.load("crisis", str(tmp_path)) is None
+    fake_build(str(tmp_path), "crisis", 0.5, build=1)
+    meta = json.loads((tmp_path / "crisis.json").read_text())
+    (tmp_path / "crisis.json").write_text(json.dumps({**meta, "version": 1}))
+    assert table.load("crisis", str(tmp_path)) is None
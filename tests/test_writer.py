@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+from hug.storage import SqliteMoodStore
+from hug.writer import WriteBehind, coalesce
+
+from .test_storage import entries
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SqliteMoodStore(str(tmp_path / "hug.db"))
+
+
+def test_coalesce_merges_appends_and_cancels_queued_ones():
+    ops = [("a", ("append", 1)), ("b", ("delete", None)), ("a", ("append", 2)), ("a", ("delete", None)), ("a", ("append", 3))]
+    assert coalesce(ops) == {"a": [("extend", [1, 3])], "b": [("delete", None)]}
+
+
+def test_writes_land_in_order(store):
+    writer = WriteBehind(store, maxsize=4)
+    moods = list(range(10)) * 3
+    for e in entries(moods):
+        writer.append("u", e)
+    writer.delete_last("u")
+    writer.append("u", entries([7])[0])
+    assert writer.wait("u", timeout=10)
+    assert [e["Mood"] for e in store.load("u", columns=["Mood"])] == moods[:-1] + [7]
+    assert writer.depth == 0
+    writer.close()
+
+
+def test_close_drains_then_rejects(store):
+    writer = WriteBehind(store)
+    for e in entries([5] * 20):
+        writer.append("u", e)
+    writer.close(timeout=10)
+    assert store.count("u") == 20
+    with pytest.raises(RuntimeError):
+        writer.append("u", entries([5])[0])
+    assert writer.wait("u", timeout=1)
+
+
+def test_close_racing_appends_never_strands_a_write(store):
+    writer = WriteBehind(store, maxsize=8)
+    accepted = []
+
+    def append():
+        for e in entries([5] * 50):
+            try:
+                writer.append("u", e)
+            except RuntimeError:
+                return
+            accepted.append(e)
+
+    threads = [threading.Thread(target=append) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    writer.close(timeout=10)
+    for thread in threads:
+        thread.join(10)
+    # Every append that was accepted got written; none is left pending forever
+    assert writer.wait("u", timeout=1)
+    assert store.count("u") == len(accepted)
+
+
+def test_failed_write_is_raised_to_its_user_only(store):
+    writer = WriteBehind(store)
+    writer.append("bad", {"Mood": 5})  # no Date: the insert fails
+    writer.append("good", entries([5])[0])
+    with pytest.raises(KeyError):
+        writer.wait("bad", timeout=10)
+    assert writer.wait("good", timeout=10)
+    assert store.count("good") == 1
+    writer.close()